@@ -0,0 +1,196 @@
+"""
+Mede o desempenho do processamento e da execução sobre programas sintéticos.
+
+Para cada cenário (perfil do gerador e tamanho), o programa é gravado em um arquivo
+temporário e são medidos separadamente:
+
+    processamento  ProcessadorSemantico.processar_codigo_arquivo
+    execução       AnalisadorSemantico.executar_instrucoes
+
+Os tempos são o melhor de várias repetições; o pico de memória de cada fase é
+medido em uma rodada à parte com tracemalloc, para não distorcer os tempos.
+
+Os resultados podem ser salvos como base (--salvar-base) e comparados com ela
+(--comparar); um cenário mais lento que a base além do limite é uma regressão e
+faz o script terminar com código 1.
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.desempenho [--escala X] [--salvar-base] [--comparar] [--limite 0.15]
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks import gerador
+from main import AnalisadorSemantico, ProcessadorSemantico
+from rastreamento import Rastreador
+from saida import SaidaTexto
+
+CENARIOS = (
+    ("aninhamento", 30_000),
+    ("largo", 200_000),
+    ("sombreamento", 30_000),
+    ("prints", 200_000),
+    ("atribuicoes", 200_000),
+    ("misto", 200_000),
+    ("misto", 2_000_000),
+)
+
+BASE_PADRAO = os.path.join(os.path.dirname(__file__), "base.json")
+
+def _nome_cenario(perfil, tamanho):
+    return f"{perfil}-{tamanho}"
+
+def _processar(arquivo):
+    return ProcessadorSemantico(Rastreador()).processar_codigo_arquivo(arquivo)
+
+def _executar(instrucoes, destino):
+    saida = SaidaTexto("bonito", destino, 1 << 16)
+    AnalisadorSemantico(Rastreador(), saida).executar_instrucoes(instrucoes)
+    saida.descarregar()
+
+def _cronometrar(funcao, *argumentos):
+    gc.collect()
+    inicio = time.perf_counter()
+    resultado = funcao(*argumentos)
+    return time.perf_counter() - inicio, resultado
+
+def medir_cenario(perfil, tamanho, repeticoes=3):
+    """
+    Mede um cenário.
+
+    Args:
+        perfil (str): O perfil do gerador.
+        tamanho (int): O número aproximado de instruções.
+        repeticoes (int, optional): Quantas vezes cada fase é cronometrada.
+
+    Returns:
+        dict: instrucoes, tempo_processamento, tempo_execucao (segundos, melhor rodada),
+            pico_processamento, pico_execucao (bytes) e instrucoes_por_segundo (das duas fases juntas).
+    """
+    with tempfile.TemporaryDirectory() as diretorio:
+        arquivo = os.path.join(diretorio, "programa.cic")
+        gerador.gravar(perfil, tamanho, arquivo)
+        with open(os.devnull, 'w', encoding='utf-8') as descarte:
+            tempos_processamento, tempos_execucao = [], []
+            for _ in range(repeticoes):
+                tempo, instrucoes = _cronometrar(_processar, arquivo)
+                tempos_processamento.append(tempo)
+                tempo, _ = _cronometrar(_executar, instrucoes, descarte)
+                tempos_execucao.append(tempo)
+
+            del instrucoes
+            gc.collect()
+            tracemalloc.start()
+            instrucoes = _processar(arquivo)
+            _, pico_processamento = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            _executar(instrucoes, descarte)
+            _, pico_execucao = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+    tempo_processamento, tempo_execucao = min(tempos_processamento), min(tempos_execucao)
+    return {
+        "instrucoes": len(instrucoes),
+        "tempo_processamento": tempo_processamento,
+        "tempo_execucao": tempo_execucao,
+        "pico_processamento": pico_processamento,
+        "pico_execucao": pico_execucao - base,
+        "instrucoes_por_segundo": len(instrucoes) / (tempo_processamento + tempo_execucao),
+    }
+
+def comparar(resultados, base, limite):
+    """
+    Compara os resultados com a base e identifica regressões de tempo.
+
+    Args:
+        resultados (dict): Os resultados por cenário.
+        base (dict): Os resultados de referência por cenário.
+        limite (float): A piora relativa tolerada (0.15 = 15% mais lento).
+
+    Returns:
+        list[str]: A descrição de cada regressão encontrada.
+    """
+    regressoes = []
+    for nome, resultado in resultados.items():
+        referencia = base.get(nome)
+        if not referencia:
+            continue
+        for fase in ("tempo_processamento", "tempo_execucao"):
+            variacao = resultado[fase] / referencia[fase] - 1
+            if variacao > limite:
+                regressoes.append(f"{nome}: {fase} {variacao:+.1%} (base {referencia[fase]:.3f} s, agora {resultado[fase]:.3f} s)")
+    return regressoes
+
+def imprimir_tabela(resultados, base=None):
+    """
+    Imprime os resultados em forma de tabela, com a variação em relação à base quando houver.
+
+    Args:
+        resultados (dict): Os resultados por cenário.
+        base (dict, optional): Os resultados de referência por cenário.
+    """
+    print(f"{'cenário':<22} {'instr':>9} {'proc (s)':>9} {'exec (s)':>9} {'pico proc':>10} {'pico exec':>10} {'instr/s':>10} {'Δ proc':>8} {'Δ exec':>8}")
+    for nome, resultado in resultados.items():
+        referencia = (base or {}).get(nome)
+        variacoes = ["", ""]
+        if referencia:
+            variacoes = [f"{resultado[fase] / referencia[fase] - 1:+.1%}" for fase in ("tempo_processamento", "tempo_execucao")]
+        print(
+            f"{nome:<22} {resultado['instrucoes']:>9} {resultado['tempo_processamento']:>9.3f} {resultado['tempo_execucao']:>9.3f} "
+            f"{resultado['pico_processamento'] / 2**20:>8.1f}MB {resultado['pico_execucao'] / 2**20:>8.1f}MB "
+            f"{resultado['instrucoes_por_segundo']:>10,.0f} {variacoes[0]:>8} {variacoes[1]:>8}"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede o processamento e a execução de programas sintéticos.")
+    parser.add_argument("--escala", type=float, default=1.0, help="Multiplica o tamanho de todos os cenários.")
+    parser.add_argument("--perfil", action="append", choices=gerador.PERFIS, help="Mede apenas os cenários deste perfil (pode ser repetido).")
+    parser.add_argument("--repeticoes", type=int, default=3, help="Rodadas cronometradas por fase (vale a melhor).")
+    parser.add_argument("--base", default=BASE_PADRAO, help="Arquivo JSON com os resultados de referência.")
+    parser.add_argument("--salvar-base", action="store_true", help="Grava os resultados como nova base.")
+    parser.add_argument("--comparar", action="store_true", help="Compara com a base e termina com código 1 se houver regressão.")
+    parser.add_argument("--limite", type=float, default=0.15, help="Piora relativa tolerada na comparação (padrão: 0.15).")
+    parser.add_argument("--json", metavar="ARQUIVO", help="Grava também os resultados em ARQUIVO.")
+    args = parser.parse_args()
+
+    resultados = {}
+    for perfil, tamanho in CENARIOS:
+        if args.perfil and perfil not in args.perfil:
+            continue
+        tamanho = max(1, int(tamanho * args.escala))
+        resultados[_nome_cenario(perfil, tamanho)] = medir_cenario(perfil, tamanho, args.repeticoes)
+
+    base = None
+    if args.comparar or os.path.exists(args.base) and not args.salvar_base:
+        try:
+            with open(args.base, encoding='utf-8') as arquivo:
+                base = json.load(arquivo)
+        except FileNotFoundError:
+            print(f"ERRO: Base '{args.base}' não encontrada; use --salvar-base para criá-la.")
+            sys.exit(1)
+    imprimir_tabela(resultados, base)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as arquivo:
+            json.dump(resultados, arquivo, indent=2)
+    if args.salvar_base:
+        with open(args.base, 'w', encoding='utf-8') as arquivo:
+            json.dump(resultados, arquivo, indent=2)
+        print(f"Base salva em {args.base}")
+    if args.comparar:
+        regressoes = comparar(resultados, base, args.limite)
+        for regressao in regressoes:
+            print(f"REGRESSÃO: {regressao}")
+        if regressoes:
+            sys.exit(1)
+        print(f"Sem regressões acima de {args.limite:.0%}.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Mede a execução de um programa grande com AnalisadorSemantico e com
+execucao_paralela.AnalisadorParalelo em 2, 4, ... processos, até o número de CPUs.
+
+O programa é do perfil misto, cujos blocos de nível mais externo ficam dentro de um bloco
+principal e quase nunca atribuem às variáveis dele; para cada forma é informado o tempo da
+execução (processamento à parte), quantos blocos foram executados em outros processos e o
+ganho sobre a execução sequencial. Em uma máquina com uma só CPU não há ganho a medir, e o
+resultado mostra apenas o custo de enviar os blocos e intercalar as suas saídas.
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.execucao_paralela [-n INSTRUCOES] [-r REPETICOES] [-j MAXIMO] [-m MINIMO]
+"""
+import argparse
+import gc
+import os
+import time
+
+from benchmarks import gerador
+from execucao_paralela import TAMANHO_MINIMO_BLOCO, AnalisadorParalelo
+from main import AnalisadorSemantico, ProcessadorSemantico
+from programa_compacto import ProgramaCompacto
+from rastreamento import Rastreador
+from saida import ColetorSaida
+
+def _medir(criar_analisador, programa, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        analisador = criar_analisador()
+        gc.collect()
+        inicio = time.perf_counter()
+        analisador.executar_programa(programa)
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), analisador
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede a execução sequencial e com blocos em paralelo de um programa grande.")
+    parser.add_argument("-n", "--instrucoes", type=int, default=1_000_000, help="Número aproximado de instruções do programa.")
+    parser.add_argument("-r", "--repeticoes", type=int, default=3, help="Repetições de cada medida (vale a menor).")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1, help="Maior número de processos medido (padrão: número de CPUs).")
+    parser.add_argument("-m", "--minimo", type=int, default=TAMANHO_MINIMO_BLOCO, help=f"Menor bloco enviado a outro processo (padrão: {TAMANHO_MINIMO_BLOCO} instruções).")
+    args = parser.parse_args()
+
+    programa = ProgramaCompacto.de_instrucoes(ProcessadorSemantico(Rastreador()).gerar_instrucoes(gerador.gerar("misto", args.instrucoes)))
+    print(f"misto: {len(programa)} instruções")
+    print(f"{'forma':<14} {'tempo (s)':>10} {'blocos':>7} {'ganho':>7}")
+    sequencial, _ = _medir(lambda: AnalisadorSemantico(Rastreador(), ColetorSaida()), programa, args.repeticoes)
+    print(f"{'sequencial':<14} {sequencial:>10.3f} {0:>7} {1:>6.2f}x")
+    # Com um só processo tudo é executado aqui; em uma máquina com uma CPU, -j 2 mostra o custo do pool
+    maximo = max(args.workers, 2)
+    for workers in sorted({2 ** expoente for expoente in range(1, maximo.bit_length())} | {maximo}):
+        tempo, analisador = _medir(lambda: AnalisadorParalelo(Rastreador(), ColetorSaida(), workers, args.minimo), programa, args.repeticoes)
+        print(f"{f'paralelo -j {workers}':<14} {tempo:>10.3f} {analisador.blocos_enviados:>7} {sequencial / tempo:>6.2f}x")
+
+if __name__ == "__main__":
+    main()
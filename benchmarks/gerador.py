@@ -0,0 +1,170 @@
+"""
+Gerador de programas .cic sintéticos para medir desempenho.
+
+Cada perfil gera um programa sem erros semânticos com aproximadamente `tamanho`
+instruções, exercitando um aspecto diferente do processador:
+
+    aninhamento   blocos aninhados muito profundos, com PRINTs de variáveis externas
+    largo         um único escopo com muitas variáveis
+    sombreamento  a mesma variável redeclarada em cada nível de uma cadeia de blocos
+    prints        poucas variáveis e muitos PRINTs
+    atribuicoes   poucas variáveis e muitas atribuições e cópias
+    misto         mistura aleatória (reprodutível) de blocos, declarações, atribuições e PRINTs
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.gerador PERFIL -n TAMANHO [-o ARQUIVO] [--semente N]
+"""
+import argparse
+import random
+import sys
+
+def _aninhamento(tamanho, aleatorio):
+    profundidade = max(1, tamanho // 3)
+    yield "BLOCO _b0_"
+    yield "NUMERO v0 = 0"
+    for i in range(1, profundidade):
+        yield f"{'  ' * i}BLOCO _b{i}_"
+        yield f"{'  ' * i}NUMERO v{i} = {i}"
+        yield f"{'  ' * i}PRINT v0"
+    for i in range(profundidade - 1, -1, -1):
+        yield f"{'  ' * i}FIM _b{i}_"
+
+def _largo(tamanho, aleatorio):
+    quantidade = max(1, tamanho * 4 // 5)
+    yield "BLOCO _largo_"
+    for i in range(quantidade):
+        yield f"  NUMERO v{i} = {i}" if i % 2 else f'  CADEIA v{i} = "t{i}"'
+    for _ in range(tamanho - quantidade):
+        yield f"  PRINT v{aleatorio.randrange(quantidade)}"
+    yield "FIM _largo_"
+
+def _sombreamento(tamanho, aleatorio):
+    profundidade = max(1, tamanho // 3)
+    yield "BLOCO _s0_"
+    yield "NUMERO x = 0"
+    for i in range(1, profundidade):
+        yield f"{'  ' * i}BLOCO _s{i}_"
+        yield f"{'  ' * i}NUMERO x = {i}"
+        yield f"{'  ' * i}PRINT x"
+    for i in range(profundidade - 1, -1, -1):
+        yield f"{'  ' * i}FIM _s{i}_"
+
+def _prints(tamanho, aleatorio):
+    yield "BLOCO _prints_"
+    yield '  NUMERO a = 1, b = 2.5'
+    yield '  CADEIA c = "texto"'
+    nomes = ("a", "b", "c")
+    for _ in range(tamanho):
+        yield f"  PRINT {aleatorio.choice(nomes)}"
+    yield "FIM _prints_"
+
+def _atribuicoes(tamanho, aleatorio):
+    yield "BLOCO _atrib_"
+    yield "  NUMERO n0 = 0, n1 = 1, n2 = 2, n3 = 3"
+    yield '  CADEIA s0 = "a", s1 = "b"'
+    for i in range(tamanho):
+        escolha = i % 4
+        if escolha == 0:
+            yield f"  n{i % 4} = {i}"
+        elif escolha == 1:
+            yield f"  n{i % 4} = n{(i + 1) % 4}"
+        elif escolha == 2:
+            yield f'  s{i % 2} = "v{i}"'
+        else:
+            yield f"  s{i % 2} = s{(i + 1) % 2}"
+    yield "  PRINT n0"
+    yield "FIM _atrib_"
+
+def _misto(tamanho, aleatorio):
+    # Cada bloco declara suas próprias variáveis; atribuições e cópias respeitam os tipos
+    escopos = [([], [])]
+    blocos = 0
+    yield "BLOCO _principal_"
+    for _ in range(tamanho):
+        numeros, cadeias = escopos[-1]
+        recuo = "  " * len(escopos)
+        sorteio = aleatorio.random()
+        if sorteio < 0.06 and len(escopos) < 40:
+            blocos += 1
+            escopos.append(([], []))
+            yield f"{recuo}BLOCO _m{blocos}_"
+        elif sorteio < 0.12 and len(escopos) > 1:
+            escopos.pop()
+            yield f"{'  ' * len(escopos)}FIM _m_"
+        elif sorteio < 0.35 or not (numeros or cadeias):
+            nome = f"v{aleatorio.randrange(1_000_000)}"
+            if nome in numeros or nome in cadeias:
+                continue
+            if aleatorio.random() < 0.5:
+                numeros.append(nome)
+                yield f"{recuo}NUMERO {nome} = {aleatorio.randint(-999, 999)}"
+            else:
+                cadeias.append(nome)
+                yield f'{recuo}CADEIA {nome} = "s{aleatorio.randrange(100)}"'
+        elif sorteio < 0.65:
+            if numeros and (not cadeias or aleatorio.random() < 0.5):
+                destino, origem = aleatorio.choice(numeros), aleatorio.choice(numeros)
+                literal = str(round(aleatorio.uniform(-9, 9), 2))
+            else:
+                destino, origem = aleatorio.choice(cadeias), aleatorio.choice(cadeias)
+                literal = '"x"'
+            yield f"{recuo}{destino} = {origem if aleatorio.random() < 0.3 else literal}"
+        else:
+            yield f"{recuo}PRINT {aleatorio.choice(numeros + cadeias)}"
+    while len(escopos) > 1:
+        escopos.pop()
+        yield f"{'  ' * len(escopos)}FIM _m_"
+    yield "FIM _principal_"
+
+PERFIS = {
+    "aninhamento": _aninhamento,
+    "largo": _largo,
+    "sombreamento": _sombreamento,
+    "prints": _prints,
+    "atribuicoes": _atribuicoes,
+    "misto": _misto,
+}
+
+def gerar(perfil, tamanho, semente=0):
+    """
+    Gera as linhas de um programa sintético.
+
+    Args:
+        perfil (str): Um dos PERFIS.
+        tamanho (int): O número aproximado de instruções.
+        semente (int, optional): A semente do gerador aleatório, para programas reprodutíveis.
+
+    Yields:
+        str: As linhas do programa, sem quebra de linha.
+    """
+    yield from PERFIS[perfil](tamanho, random.Random(semente))
+
+def gravar(perfil, tamanho, arquivo, semente=0):
+    """
+    Grava um programa sintético em um arquivo.
+
+    Args:
+        perfil (str): Um dos PERFIS.
+        tamanho (int): O número aproximado de instruções.
+        arquivo (str): O caminho do arquivo .cic.
+        semente (int, optional): A semente do gerador aleatório.
+    """
+    with open(arquivo, 'w', encoding='utf-8') as destino:
+        for linha in gerar(perfil, tamanho, semente):
+            destino.write(linha + "\n")
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera programas .cic sintéticos.")
+    parser.add_argument("perfil", choices=PERFIS, help="O tipo de programa gerado.")
+    parser.add_argument("-n", "--tamanho", type=int, default=10_000, help="Número aproximado de instruções.")
+    parser.add_argument("-o", "--output", help="Arquivo de saída (padrão: saída padrão).")
+    parser.add_argument("--semente", type=int, default=0, help="Semente do gerador aleatório.")
+    args = parser.parse_args()
+    if args.output:
+        gravar(args.perfil, args.tamanho, args.output, args.semente)
+    else:
+        for linha in gerar(args.perfil, args.tamanho, args.semente):
+            sys.stdout.write(linha + "\n")
+
+if __name__ == "__main__":
+    main()
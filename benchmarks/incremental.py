@@ -0,0 +1,108 @@
+"""
+Mede a latência da reanálise incremental (incremental.SessaoIncremental) após uma edição.
+
+Para cada perfil do gerador são informados o tempo de processar e executar o programa do
+zero, o da primeira execução da sessão (que guarda as fotos do estado) e, para cada tipo de
+edição de uma linha em posições sorteadas, a mediana da latência e a média de linhas
+reexecutadas:
+
+    reescrever    a linha é substituída por ela mesma
+    inserir       um PRINT de uma variável é inserido
+    alterar       o número de uma declaração ou atribuição é trocado por outro
+
+Cada edição é desfeita (fora da medida) antes da seguinte.
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.incremental [-n QUANTIDADE] [-e EDICOES]
+"""
+import argparse
+import gc
+import random
+import re
+import statistics
+import time
+
+from benchmarks import gerador
+from incremental import SessaoIncremental
+from main import AnalisadorSemantico, ProcessadorSemantico
+from programa_compacto import ProgramaCompacto
+from rastreamento import Rastreador
+from saida import ColetorSaida
+
+PERFIS = ("aninhamento", "largo", "sombreamento", "prints", "atribuicoes", "misto")
+TIPOS_EDICAO = ("reescrever", "inserir", "alterar")
+
+_NUMERO = re.compile(r"(=\s*)(-?\d+(?:\.\d+)?)\s*$")
+_NOME = re.compile(r"(?:NUMERO|CADEIA)?\s*(\w+)\s*=")
+
+def _executar_do_zero(linhas):
+    programa = ProgramaCompacto.de_instrucoes(ProcessadorSemantico(Rastreador()).gerar_instrucoes(linhas))
+    AnalisadorSemantico(Rastreador(), ColetorSaida()).executar_programa(programa)
+
+def _edicao(tipo, linhas, indice):
+    """Retorna (inicio, fim, novas linhas) da edição e as linhas que a desfazem."""
+    linha = linhas[indice]
+    if tipo == "reescrever":
+        return (indice, indice + 1, [linha]), [linha]
+    if tipo == "inserir":
+        nome = _NOME.search(linha)
+        return (indice, indice, [f"PRINT {nome.group(1) if nome else 'x'}"]), []
+    numero = _NUMERO.search(linha)
+    alterada = linha[:numero.start(2)] + str(int(float(numero.group(2))) + 1) + linha[numero.end(2):]
+    return (indice, indice + 1, [alterada]), [linha]
+
+def medir(linhas, edicoes, semente=0):
+    """
+    Mede a primeira execução de uma sessão e a latência de edições de uma linha.
+
+    Args:
+        linhas (list[str]): O programa.
+        edicoes (int): Quantas edições de cada tipo são medidas.
+        semente (int, optional): A semente do sorteio das posições editadas.
+
+    Returns:
+        dict: do_zero e inicial (segundos) e, para cada tipo de edição, (mediana em
+            segundos, média de linhas reexecutadas).
+    """
+    gc.collect()
+    inicio = time.perf_counter()
+    _executar_do_zero(linhas)
+    resultado = {"do_zero": time.perf_counter() - inicio}
+    gc.collect()
+    inicio = time.perf_counter()
+    sessao = SessaoIncremental(Rastreador(), linhas)
+    resultado["inicial"] = time.perf_counter() - inicio
+
+    aleatorio = random.Random(semente)
+    # Só as linhas que terminam em um número podem ser alteradas
+    com_numero = [indice for indice, linha in enumerate(linhas) if _NUMERO.search(linha)]
+    for tipo in TIPOS_EDICAO:
+        tempos, executadas = [], []
+        for _ in range(edicoes):
+            indice = aleatorio.choice(com_numero) if tipo == "alterar" else aleatorio.randrange(len(linhas))
+            (primeira, ultima, novas), originais = _edicao(tipo, linhas, indice)
+            inicio = time.perf_counter()
+            sessao.editar(primeira, ultima, novas)
+            tempos.append(time.perf_counter() - inicio)
+            executadas.append(sessao.estatisticas["linhas_executadas"])
+            sessao.editar(primeira, primeira + len(novas), originais)
+        resultado[tipo] = (statistics.median(tempos), statistics.mean(executadas))
+    return resultado
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede a latência da reanálise incremental após uma edição.")
+    parser.add_argument("-n", "--quantidade", type=int, default=200_000, help="Número aproximado de instruções por perfil.")
+    parser.add_argument("-e", "--edicoes", type=int, default=20, help="Edições medidas de cada tipo.")
+    args = parser.parse_args()
+
+    cabecalho = "".join(f" {tipo + ' ms':>14} {'linhas':>8}" for tipo in TIPOS_EDICAO)
+    print(f"{'perfil':<14} {'linhas':>7} {'do zero':>8} {'inicial':>8}{cabecalho}")
+    for perfil in PERFIS:
+        # O recuo não muda a execução, e nos perfis aninhados o texto com ele cresce com o quadrado da profundidade
+        linhas = [linha.lstrip() for linha in gerador.gerar(perfil, args.quantidade)]
+        resultado = medir(linhas, args.edicoes)
+        colunas = "".join(f" {resultado[tipo][0] * 1000:>14.2f} {resultado[tipo][1]:>8.0f}" for tipo in TIPOS_EDICAO)
+        print(f"{perfil:<14} {len(linhas):>7} {resultado['do_zero']:>8.2f} {resultado['inicial']:>8.2f}{colunas}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Mede o efeito da passagem de inferência de tipos (inferencia.inferir_tipos) na execução.
+
+Para cada perfil do gerador, o programa compacto é executado com e sem a passagem, e são
+informados o tempo da passagem, o tempo da execução em cada caso, o total (passagem +
+execução) e quantas conversões de literais e verificações de tipo foram removidas. Os
+tempos são o melhor de várias repetições intercaladas.
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.inferencia [-n QUANTIDADE] [-r REPETICOES]
+"""
+import argparse
+import gc
+import os
+import time
+
+from benchmarks import gerador
+from inferencia import inferir_tipos
+from main import AnalisadorSemantico, ProcessadorSemantico
+from programa_compacto import ProgramaCompacto
+from rastreamento import Rastreador
+from saida import SaidaTexto
+
+PERFIS = ("aninhamento", "largo", "sombreamento", "prints", "atribuicoes", "misto")
+
+def _executar(programa, destino):
+    saida = SaidaTexto("bonito", destino, 1 << 16)
+    AnalisadorSemantico(Rastreador(), saida).executar_programa(programa)
+    saida.descarregar()
+
+def _cronometrar(funcao, *argumentos):
+    gc.collect()
+    inicio = time.perf_counter()
+    resultado = funcao(*argumentos)
+    return resultado, time.perf_counter() - inicio
+
+def medir(programa, repeticoes, destino):
+    """
+    Mede a execução de um programa com e sem a passagem de inferência.
+
+    Args:
+        programa (ProgramaCompacto): O programa a ser executado.
+        repeticoes (int): Quantas vezes cada medida é repetida.
+        destino: O arquivo que recebe a saída dos PRINTs.
+
+    Returns:
+        dict: sem_inferencia, passagem e com_inferencia (segundos), e as estatísticas da passagem.
+    """
+    tempos = {"sem_inferencia": [], "passagem": [], "com_inferencia": []}
+    for _ in range(repeticoes):
+        tempos["sem_inferencia"].append(_cronometrar(_executar, programa, destino)[1])
+        inferido, tempo = _cronometrar(inferir_tipos, programa)
+        tempos["passagem"].append(tempo)
+        tempos["com_inferencia"].append(_cronometrar(_executar, inferido, destino)[1])
+    resultado = {nome: min(valores) for nome, valores in tempos.items()}
+    resultado.update(inferido.estatisticas())
+    return resultado
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede o efeito da inferência de tipos na execução.")
+    parser.add_argument("-n", "--quantidade", type=int, default=200_000, help="Número aproximado de instruções por perfil.")
+    parser.add_argument("-r", "--repeticoes", type=int, default=3, help="Repetições de cada medida (vale a menor).")
+    args = parser.parse_args()
+
+    processador = ProcessadorSemantico(Rastreador())
+    print(f"{'perfil':<14} {'sem (s)':>8} {'passagem':>9} {'com (s)':>8} {'total':>7} {'razão':>6} {'conversões':>11} {'verificações':>17}")
+    with open(os.devnull, 'w') as destino:
+        for perfil in PERFIS:
+            programa = ProgramaCompacto.de_instrucoes(processador.gerar_instrucoes(gerador.gerar(perfil, args.quantidade)))
+            resultado = medir(programa, args.repeticoes, destino)
+            total = resultado["passagem"] + resultado["com_inferencia"]
+            verificacoes = f"{resultado['verificacoes_removidas']}/{resultado['verificacoes']}"
+            print(
+                f"{perfil:<14} {resultado['sem_inferencia']:>8.3f} {resultado['passagem']:>9.3f} "
+                f"{resultado['com_inferencia']:>8.3f} {total:>7.3f} {total / resultado['sem_inferencia']:>6.2f} "
+                f"{resultado['conversoes_removidas']:>11} {verificacoes:>17}"
+            )
+
+if __name__ == "__main__":
+    main()
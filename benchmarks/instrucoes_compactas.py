@@ -0,0 +1,74 @@
+"""
+Compara a representação de instruções em dicionários com a ProgramaCompacto.
+
+Mede a memória por instrução (via tracemalloc) e o tempo de despacho por
+instrução de AnalisadorSemantico.executar_instrucoes contra
+AnalisadorSemantico.executar_programa.
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.instrucoes_compactas [-n QUANTIDADE]
+"""
+import argparse
+import contextlib
+import io
+import logging
+import time
+import tracemalloc
+
+from benchmarks import gerador
+from main import AnalisadorSemantico, ProcessadorSemantico
+from programa_compacto import ProgramaCompacto
+
+def medir_memoria(construir):
+    """
+    Mede a memória alocada por uma função de construção.
+
+    Args:
+        construir (Callable): Função que constrói e retorna a estrutura medida.
+
+    Returns:
+        tuple: (estrutura construída, bytes alocados)
+    """
+    tracemalloc.start()
+    estrutura = construir()
+    atual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return estrutura, atual
+
+def medir_despacho(executar):
+    """
+    Mede o tempo de execução de uma função, descartando a saída dos PRINTs.
+
+    Args:
+        executar (Callable): A função a ser medida.
+
+    Returns:
+        float: O tempo decorrido em segundos.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        inicio = time.perf_counter()
+        executar()
+        return time.perf_counter() - inicio
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara instruções em dicionário com a representação compacta.")
+    parser.add_argument("-n", "--quantidade", type=int, default=600_000, help="Número aproximado de instruções.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    processador = ProcessadorSemantico()
+    linhas = list(gerador.gerar("misto", args.quantidade))
+    instrucoes, memoria_dict = medir_memoria(lambda: list(processador.gerar_instrucoes(linhas)))
+    programa, memoria_compacta = medir_memoria(lambda: ProgramaCompacto.de_instrucoes(processador.gerar_instrucoes(linhas)))
+    total = len(instrucoes)
+
+    tempo_dict = medir_despacho(lambda: AnalisadorSemantico().executar_instrucoes(instrucoes))
+    tempo_compacto = medir_despacho(lambda: AnalisadorSemantico().executar_programa(programa))
+
+    print(f"Instruções: {total}")
+    print(f"{'Representação':<14} {'bytes/instr':>12} {'ns/instr':>10}")
+    print(f"{'dict':<14} {memoria_dict / total:>12.1f} {tempo_dict / total * 1e9:>10.0f}")
+    print(f"{'compacta':<14} {memoria_compacta / total:>12.1f} {tempo_compacto / total * 1e9:>10.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Mede o pico de memória e o tempo da execução de um programa grande com AnalisadorSemantico
+e com memoria_limitada.AnalisadorMemoriaLimitada em alguns orçamentos.
+
+O pico é medido com tracemalloc, em uma execução à parte da medida do tempo, e inclui só o
+que é alocado durante a execução (o programa compacto já está em memória). Para cada
+orçamento também são informados o pico de símbolos em tabelas em memória e a taxa de acertos
+do cache dos símbolos despejados. O perfil largo, um só escopo com muitas variáveis, é o pior
+caso: a tabela do escopo atual é despejada e cada declaração passa pelo banco.
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.memoria_limitada [-n INSTRUCOES] [-r REPETICOES] [-p PERFIL] [-o ORCAMENTO ...]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from benchmarks import gerador
+from main import AnalisadorSemantico, ProcessadorSemantico
+from memoria_limitada import AnalisadorMemoriaLimitada
+from programa_compacto import ProgramaCompacto
+from rastreamento import Rastreador
+from saida import ColetorSaida
+
+def _executar(criar_analisador, programa):
+    analisador = criar_analisador()
+    analisador.executar_programa(programa)
+    return analisador
+
+def _medir_tempo(criar_analisador, programa, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        gc.collect()
+        inicio = time.perf_counter()
+        analisador = _executar(criar_analisador, programa)
+        tempos.append(time.perf_counter() - inicio)
+        if isinstance(analisador, AnalisadorMemoriaLimitada):
+            analisador.fechar()
+    return min(tempos)
+
+def _medir_pico(criar_analisador, programa):
+    gc.collect()
+    tracemalloc.start()
+    analisador = _executar(criar_analisador, programa)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pico, analisador
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede o pico de memória e o tempo da execução com memória limitada.")
+    parser.add_argument("-n", "--instrucoes", type=int, default=300_000, help="Número aproximado de instruções do programa.")
+    parser.add_argument("-r", "--repeticoes", type=int, default=3, help="Repetições de cada medida de tempo (vale a menor).")
+    parser.add_argument("-p", "--perfil", choices=gerador.PERFIS, default="largo", help="Perfil do programa gerado (padrão: largo).")
+    parser.add_argument("-o", "--orcamentos", type=int, nargs="+", default=[1_000, 10_000, 100_000], help="Orçamentos medidos, em símbolos.")
+    args = parser.parse_args()
+
+    programa = ProgramaCompacto.de_instrucoes(ProcessadorSemantico(Rastreador()).gerar_instrucoes(gerador.gerar(args.perfil, args.instrucoes)))
+    print(f"{args.perfil}: {len(programa)} instruções")
+    print(f"{'forma':<18} {'tempo (s)':>10} {'pico (MB)':>10} {'símbolos':>9} {'acertos':>8}")
+    criar = lambda: AnalisadorSemantico(Rastreador(), ColetorSaida())
+    tempo = _medir_tempo(criar, programa, args.repeticoes)
+    pico, _ = _medir_pico(criar, programa)
+    print(f"{'sem limite':<18} {tempo:>10.3f} {pico / 2**20:>10.1f} {'-':>9} {'-':>8}")
+    for orcamento in args.orcamentos:
+        criar = lambda: AnalisadorMemoriaLimitada(Rastreador(), ColetorSaida(), orcamento)
+        tempo = _medir_tempo(criar, programa, args.repeticoes)
+        pico, analisador = _medir_pico(criar, programa)
+        estatisticas = analisador.armazem.estatisticas
+        consultas = estatisticas["acertos"] + estatisticas["faltas"]
+        acertos = f"{100 * estatisticas['acertos'] / consultas:.1f}%" if consultas else "-"
+        analisador.fechar()
+        print(f"{f'orçamento {orcamento}':<18} {tempo:>10.3f} {pico / 2**20:>10.1f} {analisador.pico_residentes:>9} {acertos:>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Mede a partida da linha de comando em um programa que não faz nada, onde quase todo o tempo
+é o de iniciar o Python, importar os módulos e preparar a execução.
+
+São medidos, em processos novos, o interpretador sozinho (python -c pass), main.py executado
+diretamente, cic.py (que importa main.py do cache de bytecode e, em uma execução simples,
+não importa o argparse nem o logging) e cic.py com uma opção que exige o argparse. Em
+seguida, `python -X importtime cic.py` lista os módulos importados além dos do interpretador,
+com o tempo acumulado de cada um.
+
+O orçamento é o acréscimo de cic.py sobre o interpretador sozinho, pela mediana; passar dele,
+ou importar na partida simples algum módulo de MODULOS_ADIADOS, é uma regressão e faz o
+script terminar com código 1.
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.partida [-r REPETICOES] [--orcamento MS]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# Módulos que a partida simples não deve importar: só as opções que os usam os carregam
+MODULOS_ADIADOS = ("logging", "argparse", "json", "csv")
+# Acréscimo tolerado de cic.py sobre `python -c pass`, em milissegundos
+ORCAMENTO_PADRAO = 25.0
+
+def _tempos(comando, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        subprocess.run(comando, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        tempos.append(time.perf_counter() - inicio)
+    tempos.sort()
+    return tempos[0], tempos[len(tempos) // 2]
+
+def _importacoes(comando):
+    """
+    Executa um comando com -X importtime e lê os módulos importados.
+
+    Returns:
+        list[tuple[int, str, float]]: (profundidade, módulo, tempo acumulado em ms) de cada
+            módulo, na ordem do relatório do importtime (cada módulo logo após os que ele importou).
+    """
+    resultado = subprocess.run([sys.executable, "-X", "importtime", *comando], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    modulos = []
+    for linha in resultado.stderr.splitlines():
+        if not linha.startswith("import time:") or linha.endswith("imported package"):
+            continue
+        _, acumulado, nome = linha.split("|")
+        # Os módulos importados por outros vêm recuados dois espaços por nível
+        recuo = len(nome) - len(nome.lstrip()) - 1
+        modulos.append((recuo // 2, nome.strip(), int(acumulado) / 1000))
+    return modulos
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede a partida da linha de comando e a compara com um orçamento.")
+    parser.add_argument("-r", "--repeticoes", type=int, default=30, help="Processos iniciados por forma (vale a mediana).")
+    parser.add_argument("--orcamento", type=float, default=ORCAMENTO_PADRAO, help=f"Acréscimo tolerado de cic.py sobre o interpretador, em ms (padrão: {ORCAMENTO_PADRAO:g}).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        programa = os.path.join(diretorio, "vazio.cic")
+        with open(programa, 'w', encoding='utf-8') as arquivo:
+            arquivo.write("BLOCO _vazio_\nFIM _vazio_\n")
+        # O cache de bytecode de main.py é gerado antes das medidas
+        subprocess.run([sys.executable, "cic.py", "-i", programa], stdout=subprocess.DEVNULL, check=True)
+        formas = (
+            ("python -c pass", [sys.executable, "-c", "pass"]),
+            ("main.py", [sys.executable, "main.py", "-i", programa]),
+            ("cic.py", [sys.executable, "cic.py", "-i", programa]),
+            ("cic.py -w", [sys.executable, "cic.py", "-i", programa, "-w"]),
+        )
+        print(f"{'forma':<16} {'mínimo (ms)':>12} {'mediana (ms)':>13} {'acréscimo (ms)':>15}")
+        medianas = {}
+        for nome, comando in formas:
+            minimo, mediana = _tempos(comando, args.repeticoes)
+            medianas[nome] = mediana
+            print(f"{nome:<16} {minimo * 1e3:>12.1f} {mediana * 1e3:>13.1f} {(mediana - medianas['python -c pass']) * 1e3:>15.1f}")
+
+        do_interpretador = {nome for _, nome, _ in _importacoes(["-c", "pass"])}
+        importados = [modulo for modulo in _importacoes(["cic.py", "-i", programa]) if modulo[1] not in do_interpretador]
+        print("\nMódulos importados por cic.py além dos do interpretador (tempo acumulado, até dois níveis):")
+        for profundidade, nome, acumulado in importados:
+            if profundidade <= 1:
+                print(f"  {'  ' * profundidade}{nome:<{24 - 2 * profundidade}} {acumulado:>7.2f} ms")
+        adiados = sorted(set(MODULOS_ADIADOS) & {nome for _, nome, _ in importados})
+
+    acrescimo = (medianas["cic.py"] - medianas["python -c pass"]) * 1e3
+    regressao = False
+    if acrescimo > args.orcamento:
+        print(f"\nREGRESSÃO: cic.py acrescenta {acrescimo:.1f} ms ao interpretador (orçamento: {args.orcamento:g} ms).")
+        regressao = True
+    if adiados:
+        print(f"\nREGRESSÃO: a partida simples importou {', '.join(adiados)}.")
+        regressao = True
+    if regressao:
+        sys.exit(1)
+    print(f"\nDentro do orçamento: {acrescimo:.1f} ms de {args.orcamento:g} ms, sem {', '.join(MODULOS_ADIADOS)}.")
+
+if __name__ == "__main__":
+    main()
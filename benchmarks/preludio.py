@@ -0,0 +1,78 @@
+"""
+Mede o custo por programa de partir de um prelúdio grande: reexecutando o prelúdio antes de
+cada programa e partindo do estado congelado dele (preludio.Preludio), para prelúdios de
+vários tamanhos.
+
+O prelúdio abre um bloco com muitas declarações, e cada programa, pequeno, abre um bloco
+dentro dele, lê e altera algumas variáveis do prelúdio e declara as suas. Para cada tamanho
+são informados o tempo de executar o prelúdio uma vez e o tempo médio por programa nas duas
+formas; com o estado congelado, o tempo por programa não deve crescer com o prelúdio.
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.preludio [-p TAMANHO ...] [-n PROGRAMAS]
+"""
+import argparse
+import gc
+import random
+import time
+
+from main import AnalisadorSemantico, ProcessadorSemantico
+from preludio import Preludio
+from programa_compacto import ProgramaCompacto
+from rastreamento import Rastreador
+from saida import ColetorSaida
+
+def _compilar(linhas):
+    return ProgramaCompacto.de_instrucoes(ProcessadorSemantico(Rastreador()).gerar_instrucoes(linhas))
+
+def _gerar_preludio(tamanho):
+    yield "BLOCO _comum_"
+    for i in range(tamanho):
+        yield f"  NUMERO c{i} = {i}" if i % 2 else f'  CADEIA c{i} = "t{i}"'
+
+def _gerar_programa(tamanho_preludio, aleatorio):
+    yield "  BLOCO _programa_"
+    for i in range(10):
+        externa = 2 * aleatorio.randrange(tamanho_preludio // 2) + 1
+        yield f"    NUMERO v{i} = {i}"
+        yield f"    c{externa} = {i}"
+        yield f"    PRINT c{externa}"
+        yield f"    PRINT v{i}"
+    yield "  FIM _programa_"
+
+def _por_programa(executar, programas):
+    gc.collect()
+    inicio = time.perf_counter()
+    for programa in programas:
+        executar(programa)
+    return (time.perf_counter() - inicio) / len(programas)
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede o custo por programa com e sem o estado congelado de um prelúdio.")
+    parser.add_argument("-p", "--preludios", type=int, nargs="+", default=[1_000, 10_000, 100_000], help="Tamanhos do prelúdio medidos, em declarações.")
+    parser.add_argument("-n", "--programas", type=int, default=200, help="Número de programas executados em cada forma.")
+    args = parser.parse_args()
+
+    print(f"{'prelúdio':>9} {'execução (ms)':>14} {'reexecutando (ms)':>18} {'congelado (ms)':>15} {'ganho':>8}")
+    for tamanho in args.preludios:
+        aleatorio = random.Random(tamanho)
+        preludio = _compilar(_gerar_preludio(tamanho))
+        programas = [_compilar(_gerar_programa(tamanho, aleatorio)) for _ in range(args.programas)]
+        inicio = time.perf_counter()
+        congelado = Preludio.executar(preludio, Rastreador(), ColetorSaida())
+        execucao = time.perf_counter() - inicio
+
+        def reexecutar(programa):
+            analisador = AnalisadorSemantico(Rastreador(), ColetorSaida())
+            analisador.executar_programa(preludio)
+            analisador.executar_programa(programa)
+        def partir_do_congelado(programa):
+            congelado.analisador(Rastreador(), ColetorSaida()).executar_programa(programa)
+
+        # A reexecução é medida em menos programas: com prelúdios grandes ela domina o tempo
+        reexecutando = _por_programa(reexecutar, programas[:max(1, args.programas * 1_000 // tamanho)])
+        partindo = _por_programa(partir_do_congelado, programas)
+        print(f"{tamanho:>9} {execucao * 1e3:>14.2f} {reexecutando * 1e3:>18.3f} {partindo * 1e3:>15.3f} {reexecutando / partindo:>7.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Mede a vazão do processamento de um arquivo grande (código-fonte → programa compacto)
+com ProcessadorSemantico.compilar_arquivo e com processamento_paralelo.compilar_arquivo_paralelo
+em 2, 4, ... processos, até o número de CPUs.
+
+O ganho do processamento paralelo é limitado pela união das tabelas de lexemas, feita em um
+único processo, e pelo envio dos trechos compactados de volta; a coluna "CPU principal"
+mostra esse custo, que não se divide entre os processos. Com -j maior que as CPUs
+disponíveis, compilar_arquivo_paralelo usa só as CPUs disponíveis, e com uma só CPU
+processa o arquivo sequencialmente.
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.processamento_paralelo [-n INSTRUCOES] [-r REPETICOES] [-j MAXIMO]
+"""
+import argparse
+import gc
+import os
+import tempfile
+import time
+
+from benchmarks import gerador
+from main import ProcessadorSemantico
+from processamento_paralelo import compilar_arquivo_paralelo, cpus_disponiveis
+from rastreamento import Rastreador
+
+def _melhor_tempo(funcao, repeticoes):
+    """Returns: tuple[float, float]: O tempo e a CPU usada por este processo na execução mais rápida."""
+    tempos = []
+    for _ in range(repeticoes):
+        gc.collect()
+        inicio, inicio_cpu = time.perf_counter(), time.process_time()
+        funcao()
+        tempos.append((time.perf_counter() - inicio, time.process_time() - inicio_cpu))
+    return min(tempos)
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede a vazão do processamento sequencial e paralelo de um arquivo grande.")
+    parser.add_argument("-n", "--instrucoes", type=int, default=2_000_000, help="Número aproximado de instruções do arquivo.")
+    parser.add_argument("-r", "--repeticoes", type=int, default=3, help="Repetições de cada medida (vale a menor).")
+    parser.add_argument("-j", "--workers", type=int, default=cpus_disponiveis(), help="Maior número de processos medido (padrão: número de CPUs disponíveis).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        arquivo = os.path.join(diretorio, "grande.cic")
+        # O recuo não muda o processamento, e sem ele o arquivo tem o tamanho do código em si
+        with open(arquivo, 'w', encoding='utf-8') as destino:
+            for linha in gerador.gerar("misto", args.instrucoes):
+                destino.write(linha.lstrip() + "\n")
+        megabytes = os.path.getsize(arquivo) / 2**20
+        print(f"{arquivo}: {megabytes:.1f} MB, ~{args.instrucoes} instruções, {cpus_disponiveis()} CPUs disponíveis")
+        print(f"{'forma':<14} {'tempo (s)':>10} {'CPU principal (s)':>18} {'MB/s':>8} {'ganho':>7}")
+        sequencial, cpu = _melhor_tempo(lambda: ProcessadorSemantico(Rastreador()).compilar_arquivo(arquivo), args.repeticoes)
+        print(f"{'sequencial':<14} {sequencial:>10.3f} {cpu:>18.3f} {megabytes / sequencial:>8.1f} {1:>6.2f}x")
+        # Com um só processo não há divisão
+        maximo = max(args.workers, 2)
+        for workers in sorted({2 ** expoente for expoente in range(1, maximo.bit_length())} | {maximo}):
+            tempo, cpu = _melhor_tempo(lambda: compilar_arquivo_paralelo(arquivo, Rastreador(), workers), args.repeticoes)
+            print(f"{f'paralelo -j {workers}':<14} {tempo:>10.3f} {cpu:>18.3f} {megabytes / tempo:>8.1f} {sequencial / tempo:>6.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Compara o custo de analisar programas pequenos com uma execução do main.py por programa
+e com o servidor de análise já carregado (main.py --serve --socket, ver servidor.py).
+
+São gerados vários programas pequenos do perfil misto e, para cada forma de análise, é
+informada a mediana do tempo por programa, medida de fora:
+
+    main.py         um processo `python main.py -i ARQUIVO` por programa
+    cliente.py      um processo `python cliente.py -s SOCKET ARQUIVO` por programa
+    requisição      uma requisição por vez, pelo socket, sem iniciar processos
+    lote            todas as requisições em uma única conexão (tempo total / programas)
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.servidor [-n INSTRUCOES] [-p PROGRAMAS] [-j WORKERS]
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks import gerador
+
+def _cronometrar_processo(comando):
+    inicio = time.perf_counter()
+    subprocess.run(comando, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+    return time.perf_counter() - inicio
+
+def _esperar_socket(caminho, limite=30.0):
+    prazo = time.monotonic() + limite
+    while time.monotonic() < prazo:
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conexao:
+                conexao.connect(caminho)
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise TimeoutError(f"o servidor não abriu {caminho}")
+
+def _requisicao(indice, texto):
+    return (json.dumps({"id": indice, "programa": texto}, ensure_ascii=False) + "\n").encode("utf-8")
+
+def medir_requisicoes(caminho_socket, textos):
+    """
+    Mede as requisições ao servidor, uma por vez e todas em uma só conexão.
+
+    Args:
+        caminho_socket (str): O socket do servidor.
+        textos (list[str]): O código de cada programa.
+
+    Returns:
+        tuple: (tempos de cada requisição isolada, tempo total do lote), em segundos.
+    """
+    tempos = []
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conexao, conexao.makefile('rb') as respostas:
+        conexao.connect(caminho_socket)
+        for indice, texto in enumerate(textos):
+            inicio = time.perf_counter()
+            conexao.sendall(_requisicao(indice, texto))
+            respostas.readline()
+            tempos.append(time.perf_counter() - inicio)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conexao, conexao.makefile('rb') as respostas:
+        conexao.connect(caminho_socket)
+        dados = b"".join(_requisicao(indice, texto) for indice, texto in enumerate(textos))
+        inicio = time.perf_counter()
+        # Como no cliente.py, as respostas são lidas enquanto as requisições são enviadas
+        envio = threading.Thread(target=conexao.sendall, args=(dados,))
+        envio.start()
+        for _ in textos:
+            respostas.readline()
+        lote = time.perf_counter() - inicio
+        envio.join()
+    return tempos, lote
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara main.py por programa com o servidor de análise já carregado.")
+    parser.add_argument("-n", "--instrucoes", type=int, default=200, help="Número aproximado de instruções por programa.")
+    parser.add_argument("-p", "--programas", type=int, default=30, help="Quantidade de programas.")
+    parser.add_argument("-j", "--workers", type=int, default=2, help="Processos do servidor.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        arquivos = [os.path.join(diretorio, f"p{indice}.cic") for indice in range(args.programas)]
+        for indice, arquivo in enumerate(arquivos):
+            gerador.gravar("misto", args.instrucoes, arquivo, semente=indice)
+        textos = []
+        for arquivo in arquivos:
+            with open(arquivo, encoding='utf-8') as fonte:
+                textos.append(fonte.read())
+        caminho_socket = os.path.join(diretorio, "servidor.sock")
+
+        main_py = [_cronometrar_processo([sys.executable, "main.py", "-i", arquivo]) for arquivo in arquivos]
+        inicio = time.perf_counter()
+        servidor = subprocess.Popen(
+            [sys.executable, "main.py", "--serve", "--socket", caminho_socket, "-j", str(args.workers)],
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            _esperar_socket(caminho_socket)
+            partida = time.perf_counter() - inicio
+            cliente = [_cronometrar_processo([sys.executable, "cliente.py", "-s", caminho_socket, arquivo]) for arquivo in arquivos]
+            requisicoes, lote = medir_requisicoes(caminho_socket, textos)
+        finally:
+            servidor.terminate()
+            servidor.wait()
+
+    print(f"{args.programas} programas de ~{args.instrucoes} instruções; servidor com {args.workers} processo(s), pronto em {partida * 1000:.0f} ms")
+    print(f"{'forma':<14} {'ms/programa':>12}")
+    for nome, tempo in (
+        ("main.py", statistics.median(main_py)),
+        ("cliente.py", statistics.median(cliente)),
+        ("requisição", statistics.median(requisicoes)),
+        ("lote", lote / len(textos)),
+    ):
+        print(f"{nome:<14} {tempo * 1000:>12.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Compara a memória e o tempo da TabelaSimbolos em colunas com as classes originais
+(um Simbolo com __dict__ por símbolo, em um dicionário por tabela).
+
+Uma única tabela recebe `quantidade` símbolos, com valores divididos igualmente entre
+inteiros, reais e cadeias, convertidos do texto no momento da inserção como faz o
+AnalisadorSemantico. A memória é a retida pela tabela ao final (tracemalloc), sem
+contar os lexemas e os textos de origem, que são criados antes da medição.
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.tabelas [-n QUANTIDADE]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from main import Simbolo, TabelaSimbolos
+
+class SimboloOriginal:
+    def __init__(self, lexema, tipo, valor=None):
+        self.lexema = lexema
+        self.tipo = tipo
+        self.valor = valor
+
+class TabelaSimbolosOriginal:
+    def __init__(self):
+        self.simbolos = {}
+
+    def adicionar_simbolo(self, simbolo):
+        if simbolo.lexema not in self.simbolos:
+            self.simbolos[simbolo.lexema] = simbolo
+
+    def obter_tipo(self, lexema):
+        if lexema in self.simbolos:
+            return self.simbolos[lexema].tipo
+        return None
+
+    def atualizar_valor(self, lexema, novo_valor):
+        if lexema in self.simbolos:
+            self.simbolos[lexema].valor = novo_valor
+
+def _entradas(quantidade):
+    entradas = []
+    for i in range(quantidade):
+        if i % 3 == 0:
+            entradas.append((f"v{i}", "NUMERO", str(i * 7919), int))
+        elif i % 3 == 1:
+            entradas.append((f"v{i}", "NUMERO", f"{i}.25", float))
+        else:
+            entradas.append((f"v{i}", "CADEIA", f"texto {i}", str))
+    return entradas
+
+def _preencher_original(entradas):
+    tabela = TabelaSimbolosOriginal()
+    for lexema, tipo, texto, conversao in entradas:
+        tabela.adicionar_simbolo(SimboloOriginal(lexema, tipo, conversao(texto)))
+    return tabela
+
+def _preencher_compacta(entradas):
+    tabela = TabelaSimbolos()
+    for lexema, tipo, texto, conversao in entradas:
+        tabela.adicionar(lexema, tipo, conversao(texto))
+    return tabela
+
+def _preencher_compacta_simbolos(entradas):
+    tabela = TabelaSimbolos()
+    for lexema, tipo, texto, conversao in entradas:
+        tabela.adicionar_simbolo(Simbolo(lexema, tipo, conversao(texto)))
+    return tabela
+
+def _ler_original(tabela, entradas):
+    for lexema, _, _, _ in entradas:
+        tabela.simbolos[lexema].valor
+
+def _ler_compacta(tabela, entradas):
+    for lexema, _, _, _ in entradas:
+        tabela.obter_valor(lexema)
+
+def medir(preencher, ler, entradas):
+    """
+    Mede a memória retida por uma tabela e o tempo de preenchê-la e de ler todos os valores.
+
+    Args:
+        preencher (Callable): Cria e preenche a tabela a partir das entradas.
+        ler (Callable): Lê o valor de cada lexema da tabela.
+        entradas (list[tuple]): (lexema, tipo, texto do valor, conversão) de cada símbolo.
+
+    Returns:
+        dict: memoria (bytes), bytes_por_simbolo, tempo_insercao e tempo_leitura (segundos).
+    """
+    gc.collect()
+    tracemalloc.start()
+    tabela = preencher(entradas)
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tabela
+
+    gc.collect()
+    inicio = time.perf_counter()
+    tabela = preencher(entradas)
+    tempo_insercao = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    ler(tabela, entradas)
+    tempo_leitura = time.perf_counter() - inicio
+    return {
+        "memoria": memoria,
+        "bytes_por_simbolo": memoria / len(entradas),
+        "tempo_insercao": tempo_insercao,
+        "tempo_leitura": tempo_leitura,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara a memória das tabelas de símbolos.")
+    parser.add_argument("-n", "--quantidade", type=int, default=1_000_000, help="Símbolos na tabela (padrão: 1000000).")
+    args = parser.parse_args()
+
+    entradas = _entradas(args.quantidade)
+    variantes = (
+        ("original (Simbolo + __dict__)", _preencher_original, _ler_original),
+        ("colunas (adicionar)", _preencher_compacta, _ler_compacta),
+        ("colunas (adicionar_simbolo)", _preencher_compacta_simbolos, _ler_compacta),
+    )
+    print(f"{'tabela':<32} {'memória':>10} {'bytes/símb':>11} {'inserção (s)':>13} {'leitura (s)':>12}")
+    for nome, preencher, ler in variantes:
+        resultado = medir(preencher, ler, entradas)
+        print(
+            f"{nome:<32} {resultado['memoria'] / 2**20:>8.1f}MB {resultado['bytes_por_simbolo']:>11.1f} "
+            f"{resultado['tempo_insercao']:>13.3f} {resultado['tempo_leitura']:>12.3f}"
+        )
+
+if __name__ == "__main__":
+    main()
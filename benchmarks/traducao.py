@@ -0,0 +1,94 @@
+"""
+Compara a execução interpretada (AnalisadorSemantico.executar_programa) com a do
+programa traduzido para código Python (traducao.py).
+
+Para cada perfil do gerador são informados o tempo de tradução para código-fonte, o
+de compile(), o tamanho do código serializado com marshal e o tempo de carregá-lo
+(o que uma execução com --aot --cache paga), e o tempo de execução interpretada e
+traduzida. Os tempos de execução são o melhor de várias repetições intercaladas.
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.traducao [-n QUANTIDADE] [-r REPETICOES]
+"""
+import argparse
+import gc
+import marshal
+import os
+import time
+
+import traducao
+from benchmarks import gerador
+from main import AnalisadorSemantico, ProcessadorSemantico
+from programa_compacto import ProgramaCompacto
+from rastreamento import Rastreador
+from saida import SaidaTexto
+
+PERFIS = ("aninhamento", "largo", "sombreamento", "prints", "atribuicoes", "misto")
+
+def _cronometrar(funcao, *argumentos):
+    gc.collect()
+    inicio = time.perf_counter()
+    resultado = funcao(*argumentos)
+    return resultado, time.perf_counter() - inicio
+
+def _interpretar(programa, destino):
+    saida = SaidaTexto("bonito", destino, 1 << 16)
+    AnalisadorSemantico(Rastreador(), saida).executar_programa(programa)
+    saida.descarregar()
+
+def _executar_traduzido(codigo, destino):
+    saida = SaidaTexto("bonito", destino, 1 << 16)
+    traducao.executar(codigo, saida, Rastreador())
+    saida.descarregar()
+
+def medir(programa, repeticoes, destino):
+    """
+    Mede a tradução de um programa e compara a sua execução com a interpretada.
+
+    Args:
+        programa (ProgramaCompacto): O programa a ser medido.
+        repeticoes (int): Quantas vezes cada execução é repetida.
+        destino: O arquivo que recebe a saída dos PRINTs.
+
+    Returns:
+        dict: traducao, compilacao, carga e as execuções interpretado e traduzido (segundos),
+            e tamanho_marshal (bytes).
+    """
+    fonte, tempo_traducao = _cronometrar(traducao.traduzir, programa)
+    codigo, tempo_compilacao = _cronometrar(compile, fonte, "<benchmark>", "exec")
+    dados = marshal.dumps(codigo)
+    _, tempo_carga = _cronometrar(marshal.loads, dados)
+    interpretado, traduzido = [], []
+    for _ in range(repeticoes):
+        interpretado.append(_cronometrar(_interpretar, programa, destino)[1])
+        traduzido.append(_cronometrar(_executar_traduzido, codigo, destino)[1])
+    return {
+        "traducao": tempo_traducao,
+        "compilacao": tempo_compilacao,
+        "tamanho_marshal": len(dados),
+        "carga": tempo_carga,
+        "interpretado": min(interpretado),
+        "traduzido": min(traduzido),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara a execução interpretada com a traduzida para Python.")
+    parser.add_argument("-n", "--quantidade", type=int, default=200_000, help="Número aproximado de instruções por perfil.")
+    parser.add_argument("-r", "--repeticoes", type=int, default=3, help="Repetições de cada execução (vale a menor).")
+    args = parser.parse_args()
+
+    processador = ProcessadorSemantico(Rastreador())
+    print(f"{'perfil':<14} {'tradução':>9} {'compile':>8} {'marshal':>9} {'carga':>7} {'interp. (s)':>12} {'traduzido (s)':>14} {'ganho':>6}")
+    with open(os.devnull, 'w') as destino:
+        for perfil in PERFIS:
+            programa = ProgramaCompacto.de_instrucoes(processador.gerar_instrucoes(gerador.gerar(perfil, args.quantidade)))
+            resultado = medir(programa, args.repeticoes, destino)
+            print(
+                f"{perfil:<14} {resultado['traducao']:>9.3f} {resultado['compilacao']:>8.3f} "
+                f"{resultado['tamanho_marshal'] / 2**20:>7.1f}MB {resultado['carga']:>7.3f} "
+                f"{resultado['interpretado']:>12.3f} {resultado['traduzido']:>14.3f} "
+                f"{resultado['interpretado'] / resultado['traduzido']:>5.1f}x"
+            )
+
+if __name__ == "__main__":
+    main()
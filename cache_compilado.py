@@ -0,0 +1,245 @@
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+import rastreamento
+from programa_compacto import ProgramaCompacto
+from rastreamento import Rastreador
+
+# Formato do arquivo .cicc (ordem de bytes nativa, registrada no cabeçalho):
+#   cabeçalho | opcodes (n bytes) | alinhamento | operandos, tipos, valores (n inteiros cada)
+#   | tamanhos dos lexemas (m inteiros) | lexemas em UTF-8 concatenados
+MAGICA = b"CICC"
+# Incrementada sempre que o formato ou a leitura das linhas muda: um cache de outra versão é
+# descartado mesmo que o fonte não tenha mudado (2: analisador léxico do lexico.py)
+VERSAO = 2
+CABECALHO = struct.Struct("=4sHBBqq32sQQQI")
+# Posição da data de modificação do fonte no cabeçalho, regravada por conferir_fonte
+POSICAO_MTIME = struct.calcsize("=4sHBB")
+EXTENSAO = ".cicc"
+
+class CacheInvalido(Exception):
+    """Indica que um arquivo de cache está corrompido, é de outro formato ou não corresponde ao fonte."""
+
+def caminho_cache(nome_arquivo):
+    """
+    Obtém o caminho do arquivo de cache correspondente a um arquivo fonte.
+
+    Args:
+        nome_arquivo (str): O caminho do arquivo .cic.
+
+    Returns:
+        str: O caminho do arquivo .cicc.
+    """
+    return os.path.splitext(nome_arquivo)[0] + EXTENSAO
+
+def hash_arquivo(nome_arquivo):
+    """
+    Calcula o SHA-256 do conteúdo de um arquivo, lendo-o em blocos.
+
+    Args:
+        nome_arquivo (str): O caminho do arquivo.
+
+    Returns:
+        bytes: O resumo SHA-256.
+    """
+    resumo = hashlib.sha256()
+    with open(nome_arquivo, 'rb') as arquivo:
+        for bloco in iter(lambda: arquivo.read(1 << 20), b""):
+            resumo.update(bloco)
+    return resumo.digest()
+
+def conferir_fonte(nome_cache, posicao_mtime, mtime, tamanho_fonte, resumo, fonte):
+    """
+    Confere se um cache corresponde ao conteúdo atual do arquivo fonte.
+
+    Se só a data de modificação do fonte mudou, e o conteúdo é o mesmo, a nova data é
+    regravada no cabeçalho do cache, para que as próximas cargas não recalculem o resumo.
+
+    Args:
+        nome_cache (str): O caminho do cache.
+        posicao_mtime (int): A posição da data de modificação (um inteiro "q") no cabeçalho do cache.
+        mtime (int): A data de modificação do fonte gravada no cabeçalho, em nanossegundos.
+        tamanho_fonte (int): O tamanho do fonte gravado no cabeçalho.
+        resumo (bytes): O SHA-256 do fonte gravado no cabeçalho.
+        fonte (str): O caminho do arquivo fonte.
+
+    Raises:
+        CacheInvalido: Se o conteúdo do fonte mudou.
+    """
+    info = os.stat(fonte)
+    if (mtime, tamanho_fonte) == (info.st_mtime_ns, info.st_size):
+        return
+    # Data de modificação diferente não basta: o conteúdo pode ser o mesmo
+    if tamanho_fonte != info.st_size or resumo != hash_arquivo(fonte):
+        raise CacheInvalido("desatualizado")
+    try:
+        with open(nome_cache, 'r+b') as arquivo:
+            arquivo.seek(posicao_mtime)
+            arquivo.write(struct.pack("=q", info.st_mtime_ns))
+    except OSError:
+        # Sem permissão de escrita o cache continua válido; só o resumo volta a ser calculado
+        pass
+
+def carregar_ou_gerar(nome_arquivo, nome_cache, carregar, gerar, salvar, rastreador:Rastreador=None):
+    """
+    Obtém o conteúdo de um cache de um arquivo .cic, gerando-o e regravando o cache quando ele não é válido.
+
+    Se o cache não existir, estiver desatualizado ou corrompido, o conteúdo é gerado
+    novamente a partir do fonte e o cache é regravado. Cada uma dessas situações é
+    informada ao rastreador como um evento CACHE.
+
+    Args:
+        nome_arquivo (str): O caminho do arquivo .cic.
+        nome_cache (str): O caminho do cache.
+        carregar (Callable[[str, str], object]): Carrega o cache (nome_cache, fonte), lançando CacheInvalido.
+        gerar (Callable[[str], object]): Gera o conteúdo a partir do arquivo fonte.
+        salvar (Callable[[object, str, str], None]): Grava o conteúdo no cache (conteúdo, nome_cache, fonte).
+        rastreador (Rastreador, optional): O rastreador que recebe os eventos CACHE.
+
+    Returns:
+        object: O conteúdo carregado ou gerado.
+
+    Raises:
+        FileNotFoundError: Se o arquivo fonte não existir.
+    """
+    rastreador = rastreador if rastreador is not None else Rastreador()
+    if not os.path.exists(nome_arquivo):
+        raise FileNotFoundError(nome_arquivo)
+    try:
+        conteudo = carregar(nome_cache, nome_arquivo)
+        if rastreador.cache:
+            rastreador.emitir(rastreamento.CACHE, "carregado", nome_cache, None)
+        return conteudo
+    except FileNotFoundError:
+        pass
+    except CacheInvalido as erro:
+        if rastreador.cache:
+            rastreador.emitir(rastreamento.CACHE, "invalido", nome_cache, str(erro))
+
+    conteudo = gerar(nome_arquivo)
+    try:
+        salvar(conteudo, nome_cache, nome_arquivo)
+    except OSError as erro:
+        if rastreador.cache:
+            rastreador.emitir(rastreamento.CACHE, "gravacao", nome_cache, str(erro))
+    return conteudo
+
+def _alinhar(posicao, tamanho):
+    return (posicao + tamanho - 1) // tamanho * tamanho
+
+def salvar(programa, nome_cache, fonte):
+    """
+    Grava um programa compacto no formato .cicc.
+
+    O arquivo é escrito em um temporário e renomeado ao final, para que uma
+    interrupção nunca deixe um cache parcialmente escrito no lugar do válido.
+
+    Args:
+        programa (ProgramaCompacto): O programa a ser gravado.
+        nome_cache (str): O caminho do arquivo .cicc.
+        fonte (str): O caminho do arquivo .cic que originou o programa.
+    """
+    info = os.stat(fonte)
+    lexemas = [(lexema or "").encode('utf-8') for lexema in programa.lexemas]
+    tamanhos = array('I', map(len, lexemas))
+    colunas = [array('I', programa.operandos), array('I', programa.tipos), array('I', programa.valores), tamanhos]
+    corpo = [bytes(programa.opcodes), b"\0" * (_alinhar(len(programa), 4) - len(programa))]
+    corpo += [coluna.tobytes() for coluna in colunas]
+    corpo.append(b"".join(lexemas))
+    verificacao = 0
+    for parte in corpo:
+        verificacao = zlib.crc32(parte, verificacao)
+    cabecalho = CABECALHO.pack(
+        MAGICA, VERSAO, array('I').itemsize, sys.byteorder == "little",
+        info.st_mtime_ns, info.st_size, hash_arquivo(fonte),
+        len(programa), len(lexemas), sum(tamanhos), verificacao,
+    )
+    temporario = f"{nome_cache}.{os.getpid()}.tmp"
+    with open(temporario, 'wb') as arquivo:
+        arquivo.write(cabecalho)
+        arquivo.writelines(corpo)
+    os.replace(temporario, nome_cache)
+
+def carregar(nome_cache, fonte):
+    """
+    Carrega um programa de um arquivo .cicc, mapeando-o em memória.
+
+    As colunas do programa retornado são visões somente leitura sobre o
+    arquivo mapeado; apenas a tabela de lexemas é decodificada.
+
+    Args:
+        nome_cache (str): O caminho do arquivo .cicc.
+        fonte (str): O caminho do arquivo .cic correspondente.
+
+    Returns:
+        ProgramaCompacto: O programa carregado.
+
+    Raises:
+        CacheInvalido: Se o cache estiver corrompido ou desatualizado em relação ao fonte.
+    """
+    with open(nome_cache, 'rb') as arquivo:
+        try:
+            mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise CacheInvalido("arquivo vazio")
+    try:
+        if len(mapa) < CABECALHO.size:
+            raise CacheInvalido("cabeçalho incompleto")
+        (magica, versao, tamanho_inteiro, little_endian, mtime, tamanho_fonte, resumo,
+         total, total_lexemas, bytes_lexemas, verificacao) = CABECALHO.unpack_from(mapa)
+        if magica != MAGICA or versao != VERSAO:
+            raise CacheInvalido("formato desconhecido")
+        if tamanho_inteiro != array('I').itemsize or little_endian != (sys.byteorder == "little"):
+            raise CacheInvalido("gerado em outra plataforma")
+        conferir_fonte(nome_cache, POSICAO_MTIME, mtime, tamanho_fonte, resumo, fonte)
+
+        inicio_colunas = CABECALHO.size + _alinhar(total, 4)
+        inicio_lexemas = inicio_colunas + tamanho_inteiro * (3 * total + total_lexemas)
+        if len(mapa) != inicio_lexemas + bytes_lexemas:
+            raise CacheInvalido("tamanho inconsistente")
+        visao = memoryview(mapa)
+        if zlib.crc32(visao[CABECALHO.size:]) != verificacao:
+            raise CacheInvalido("soma de verificação inválida")
+
+        inteiros = visao[inicio_colunas:inicio_lexemas].cast('I')
+        tamanhos = inteiros[3 * total:]
+        lexemas = [None]
+        posicao = inicio_lexemas + tamanhos[0]
+        for tamanho in tamanhos[1:]:
+            lexemas.append(str(visao[posicao:posicao + tamanho], 'utf-8'))
+            posicao += tamanho
+        programa = ProgramaCompacto.de_colunas(
+            lexemas,
+            visao[CABECALHO.size:CABECALHO.size + total],
+            inteiros[:total], inteiros[total:2 * total], inteiros[2 * total:3 * total],
+        )
+    except (struct.error, ValueError, TypeError) as erro:
+        raise CacheInvalido(str(erro))
+    # Mantém o mapeamento vivo enquanto o programa existir
+    programa.mapa = mapa
+    return programa
+
+def carregar_ou_compilar(nome_arquivo, compilar, rastreador:Rastreador=None):
+    """
+    Obtém o programa compacto de um arquivo .cic, usando o cache .cicc quando válido.
+
+    Se o cache não existir, estiver desatualizado ou corrompido, o arquivo é
+    processado novamente com a função de compilação e o cache é regravado.
+
+    Args:
+        nome_arquivo (str): O caminho do arquivo .cic.
+        compilar (Callable[[str], ProgramaCompacto]): Função que processa o arquivo fonte.
+        rastreador (Rastreador, optional): O rastreador que recebe os eventos CACHE.
+
+    Returns:
+        ProgramaCompacto: O programa compacto.
+
+    Raises:
+        FileNotFoundError: Se o arquivo fonte não existir.
+    """
+    return carregar_ou_gerar(nome_arquivo, caminho_cache(nome_arquivo), carregar, compilar, salvar, rastreador)
@@ -0,0 +1,7 @@
+# Ponto de entrada com partida rápida, com as mesmas opções de main.py. Executado diretamente,
+# main.py é compilado a cada chamada, o que custa mais que analisar um programa pequeno;
+# importado daqui, ele é lido do cache de bytecode (__pycache__).
+from main import main
+
+if __name__ == "__main__":
+    main()
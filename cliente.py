@@ -0,0 +1,117 @@
+import argparse
+import json
+import socket
+import sys
+import threading
+
+# Cliente do servidor de análise (main.py --serve --socket). Só usa a biblioteca padrão e não
+# importa o analisador, para que cada chamada custe apenas a partida do Python e a conexão.
+
+def analisar_arquivos(caminho_socket, arquivos, formato="bonito", verificar=False, max_erros=None):
+    """
+    Envia arquivos ao servidor, todos pela mesma conexão, e espera as respostas.
+
+    Args:
+        caminho_socket (str): O socket Unix do servidor.
+        arquivos (list[str]): Os arquivos .cic.
+        formato (str, optional): O formato da saída dos PRINTs.
+        verificar (bool, optional): Se True, só verifica os arquivos, como --check.
+        max_erros (int, optional): Com verificar, interrompe após esse número de erros distintos.
+
+    Returns:
+        list[dict]: As respostas do servidor (ver servidor.py), na ordem dos arquivos.
+
+    Raises:
+        FileNotFoundError: Se um arquivo não existir.
+        OSError: Se não for possível conectar ao servidor.
+    """
+    requisicoes = []
+    for indice, arquivo in enumerate(arquivos):
+        with open(arquivo, 'r', encoding='utf-8') as fonte:
+            requisicao = {"id": indice, "programa": fonte.read(), "formato": formato, "nome": arquivo}
+        if verificar:
+            requisicao["verificar"] = True
+            requisicao["max_erros"] = max_erros
+        requisicoes.append(json.dumps(requisicao, ensure_ascii=False) + "\n")
+
+    respostas = {}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conexao:
+        conexao.connect(caminho_socket)
+        dados = "".join(requisicoes).encode("utf-8")
+
+        def enviar():
+            try:
+                conexao.sendall(dados)
+            except OSError:
+                # O servidor encerrou a conexão; a falta das respostas é reportada pela leitura
+                pass
+
+        # O envio fica em outra thread: o servidor só lê novas requisições enquanto as respostas são lidas
+        envio = threading.Thread(target=enviar, daemon=True)
+        envio.start()
+        with conexao.makefile('rb') as entrada:
+            while len(respostas) < len(requisicoes):
+                linha = entrada.readline()
+                if not linha:
+                    raise ConnectionError("o servidor encerrou a conexão antes de responder.")
+                resposta = json.loads(linha)
+                respostas[resposta["id"]] = resposta
+        envio.join()
+    return [respostas[indice] for indice in range(len(requisicoes))]
+
+def escrever_resposta(arquivo, resposta, saida, saida_erros):
+    """
+    Escreve a resposta de um arquivo como o main.py a escreveria.
+
+    Args:
+        arquivo (str): O arquivo analisado.
+        resposta (dict): A resposta do servidor.
+        saida (TextIO): Destino dos PRINTs.
+        saida_erros (TextIO): Destino dos erros semânticos e falhas de uma execução.
+
+    Returns:
+        bool: True se a resposta tiver diagnósticos, uma falha ou um erro.
+    """
+    if "erro" in resposta:
+        saida_erros.write(f"{arquivo}: ERRO: {resposta['erro']}\n")
+        return True
+    if "saida" not in resposta:
+        # Verificação: os diagnósticos são a saída, no formato de verificacao.Diagnostico
+        for diagnostico in resposta["diagnosticos"]:
+            ocorrencias = f" ({diagnostico['ocorrencias']} ocorrências)" if diagnostico["ocorrencias"] > 1 else ""
+            saida.write(f"{arquivo}:{diagnostico['linha']}:{diagnostico['coluna']}: {diagnostico['mensagem']}{ocorrencias}\n")
+    else:
+        saida.write(resposta["saida"])
+        for diagnostico in resposta["diagnosticos"]:
+            saida_erros.write(f"{arquivo}: {diagnostico['mensagem']}\n")
+    if resposta.get("falha"):
+        saida_erros.write(f"{arquivo}: FALHA: {resposta['falha']}\n")
+    return bool(resposta["diagnosticos"] or resposta.get("falha"))
+
+def main():
+    parser = argparse.ArgumentParser(description="Analisa arquivos .cic em um servidor já carregado (main.py --serve --socket).")
+    parser.add_argument("arquivos", nargs="+", metavar="ARQUIVO", help="Os arquivos .cic a analisar.")
+    parser.add_argument("-s", "--socket", required=True, metavar="CAMINHO", help="O socket Unix do servidor.")
+    parser.add_argument("-f", "--formato", default="bonito", help="Formato da saída dos PRINTs (padrão: bonito).")
+    parser.add_argument("--check", action="store_true", help="Apenas verifica os arquivos, listando os erros com linha e coluna.")
+    parser.add_argument("--max-errors", type=int, metavar="N", help="Com --check, interrompe a verificação após N erros distintos.")
+    args = parser.parse_args()
+
+    try:
+        respostas = analisar_arquivos(args.socket, args.arquivos, args.formato, args.check, args.max_errors)
+    except FileNotFoundError as erro:
+        print(f"ERRO: Arquivo '{erro.filename}' não encontrado.")
+        sys.exit(1)
+    except OSError as erro:
+        print(f"ERRO: Não foi possível usar o servidor em '{args.socket}': {erro}")
+        sys.exit(1)
+    com_erro = False
+    for arquivo, resposta in zip(args.arquivos, respostas):
+        if len(args.arquivos) > 1:
+            sys.stdout.write(f"==> {arquivo} <==\n")
+        com_erro |= escrever_resposta(arquivo, resposta, sys.stdout, sys.stderr)
+    sys.stdout.flush()
+    sys.exit(1 if com_erro else 0)
+
+if __name__ == "__main__":
+    main()
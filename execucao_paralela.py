@@ -0,0 +1,309 @@
+import os
+import signal
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count
+
+import rastreamento
+from inferencia import ProgramaInferido
+from main import AnalisadorSemantico, TabelaSimbolos
+from programa_compacto import ATRIBUICAO, BLOCO, DECLARACAO, FIM, ProgramaCompacto
+from rastreamento import Coletor, ColetorMemoria, Rastreador
+from saida import Saida
+
+# Execução paralela de blocos irmãos. Um bloco (de um BLOCO até o FIM correspondente) que
+# não altera nenhuma variável dos escopos que o envolvem não interfere no que vem depois
+# dele, a não ser pelos seus PRINTs e erros: pode então ser executado em outro processo,
+# sobre uma cópia das variáveis externas que ele lê, enquanto este processo segue adiante.
+# A saída e os eventos de cada bloco voltam como uma lista e são intercalados com os deste
+# processo na ordem do programa, de modo que o resultado é o mesmo da execução sequencial.
+#
+# A única instrução que altera um escopo externo é a atribuição sem tipo a um lexema
+# declarado fora do escopo atual (DECLARACAO e a atribuição com tipo sempre declaram no
+# escopo atual). Uma passagem sobre o programa reúne, para cada bloco, os lexemas atribuídos
+# sem uma declaração certa antes, no próprio bloco ou em um bloco intermediário; na
+# execução, o bloco só é enviado a outro processo se nenhum deles estiver declarado.
+
+# Blocos menores que este número de instruções não compensam o envio a outro processo
+TAMANHO_MINIMO_BLOCO = 2048
+# Blocos por processo: um bloco maior que o programa dividido por processos × BLOCOS_POR_PROCESSO
+# é executado por este processo, que envia os blocos dentro dele
+BLOCOS_POR_PROCESSO = 4
+# Um bloco que atribui a mais lexemas sem declará-los não é executado em paralelo
+LIMITE_LEXEMAS_ATRIBUIDOS = 64
+
+def _declaracao_certa(tipo, valor):
+    # Se a atribuição com tipo certamente declara o lexema: sem valor, ou com um literal do tipo
+    # (ver AnalisadorSemantico._tratar_valor); o valor de uma variável só é conhecido na execução
+    if valor is None:
+        return True
+    if tipo == "CADEIA":
+        return valor.startswith('"') and valor.endswith('"')
+    return tipo == "NUMERO" and valor.lstrip('-+').replace('.', '', 1).isdigit()
+
+def analisar_blocos(programa:ProgramaCompacto, minimo=TAMANHO_MINIMO_BLOCO, maximo=None):
+    """
+    Encontra os blocos que podem ser executados em outro processo.
+
+    Args:
+        programa (ProgramaCompacto): O programa.
+        minimo (int, optional): O menor número de instruções de um bloco.
+        maximo (int, optional): O maior número de instruções de um bloco; um bloco maior só
+            é escolhido se não houver blocos a escolher dentro dele. Padrão: sem limite.
+
+    Returns:
+        list[tuple[int, int, frozenset[str]]]: Para cada bloco, na ordem do programa, o índice
+            do BLOCO, o do FIM correspondente e os lexemas atribuídos sem uma declaração certa
+            dentro do bloco, que não podem estar declarados fora dele na execução.
+    """
+    lexemas = programa.lexemas
+    # Um quadro por bloco aberto: [índice do BLOCO, lexemas declarados, lexemas atribuídos
+    # sem declaração (None se passarem do limite), se há um bloco escolhido dentro dele]
+    quadros = []
+    blocos = []
+    # _declaracao_certa de cada par (tipo, valor) já visto
+    certas = {}
+    for indice, opcode, lexema, tipo, valor in zip(count(), programa.opcodes, programa.operandos, programa.tipos, programa.valores):
+        if opcode == ATRIBUICAO or opcode == DECLARACAO:
+            if not quadros:
+                continue
+            quadro = quadros[-1]
+            if tipo:
+                certa = True if opcode == DECLARACAO else certas.get((tipo, valor))
+                if certa is None:
+                    certa = certas[tipo, valor] = _declaracao_certa(lexemas[tipo], lexemas[valor])
+                if certa:
+                    quadro[1].add(lexema)
+            elif quadro[2] is not None and lexema not in quadro[1]:
+                quadro[2].add(lexema)
+                if len(quadro[2]) > LIMITE_LEXEMAS_ATRIBUIDOS:
+                    quadro[2] = None
+        elif opcode == BLOCO:
+            quadros.append([indice, set(), set(), False])
+        elif opcode == FIM:
+            if not quadros:
+                continue
+            inicio, _, atribuidos, escolhido_dentro = quadros.pop()
+            tamanho = indice - inicio + 1
+            escolhido = (atribuidos is not None and tamanho >= minimo
+                         and (maximo is None or tamanho <= maximo or not escolhido_dentro))
+            if escolhido:
+                blocos.append((inicio, indice, frozenset(lexemas[lexema] for lexema in atribuidos)))
+            if quadros:
+                pai = quadros[-1]
+                pai[3] = pai[3] or escolhido or escolhido_dentro
+                if pai[2] is not None:
+                    if atribuidos is None:
+                        pai[2] = None
+                    else:
+                        # Os lexemas declarados no bloco pai antes deste bloco são locais a ele
+                        pai[2].update(atribuidos - pai[1])
+                        if len(pai[2]) > LIMITE_LEXEMAS_ATRIBUIDOS:
+                            pai[2] = None
+    blocos.sort()
+    return blocos
+
+class _ColetorOrdenado(Coletor):
+    # Recebe os mesmos eventos que o rastreador de destino; enquanto houver blocos em outros
+    # processos antes do ponto atual, os eventos são guardados para depois deles
+    def __init__(self, analisador, destino:Rastreador):
+        super().__init__()
+        self._analisador = analisador
+        self._aceitos = tuple(getattr(destino, nome) for nome in rastreamento.NOMES_EVENTOS)
+
+    def aceita(self, evento):
+        return self._aceitos[evento]
+
+    def registrar(self, evento, campos):
+        capturas = self._analisador._capturas
+        if capturas is None:
+            self._analisador._rastreador_destino.emitir(evento, *campos)
+        else:
+            capturas.append((evento, campos))
+
+class _SaidaOrdenada(Saida):
+    # O mesmo para os PRINTs, guardados na mesma sequência dos eventos (evento None)
+    def __init__(self, analisador):
+        self._analisador = analisador
+
+    def escrever(self, lexema, tipo, valor, bloco):
+        capturas = self._analisador._capturas
+        if capturas is None:
+            self._analisador._saida_destino.escrever(lexema, tipo, valor, bloco)
+        else:
+            capturas.append((None, (lexema, tipo, valor, bloco)))
+
+# Estado de cada processo do pool, definido por _iniciar_processo
+_programa = None
+_rastreador = None
+
+def _iniciar_processo(programa, eventos):
+    global _programa, _rastreador
+    # O Ctrl+C chega a todo o grupo de processos; quem encerra os processos do pool é o principal
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _programa = programa
+    coletor = ColetorMemoria()
+    coletor.tipos_eventos = frozenset(eventos)
+    _rastreador = Rastreador([coletor])
+
+def executar_bloco(inicio, fim, profundidade, bloco, foto):
+    """
+    Executa um bloco em um processo do pool, sobre a foto das variáveis externas.
+
+    Args:
+        inicio (int): O índice do BLOCO.
+        fim (int): O índice logo após o FIM correspondente.
+        profundidade (int): O número de escopos abertos antes do bloco.
+        bloco (list[str]): O nome do bloco que o envolve, se houver, visto nos eventos do BLOCO.
+        foto (list): As variáveis externas lidas pelo bloco (ver AnalisadorParalelo._fotografar).
+
+    Returns:
+        tuple: A lista de PRINTs e eventos, na ordem, e a exceção que interrompeu o bloco, ou None.
+    """
+    analisador = AnalisadorParalelo(_rastreador, Saida(), workers=1)
+    analisador._capturas = capturas = []
+    analisador._restaurar(profundidade, bloco, foto)
+    try:
+        analisador.executar_trecho(_programa, inicio, fim)
+    except Exception as erro:
+        return capturas, erro
+    return capturas, None
+
+class AnalisadorParalelo(AnalisadorSemantico):
+    """
+    AnalisadorSemantico que executa em outros processos os blocos que não alteram os escopos externos.
+
+    O resultado é o mesmo da execução sequencial: os mesmos PRINTs, eventos e erros, na mesma
+    ordem, e a mesma exceção, se alguma interromper a execução. Com um perfilador, com um só
+    processo ou se nenhum bloco tiver ao menos `tamanho_minimo` instruções, a execução é a
+    do AnalisadorSemantico.
+
+    Args:
+        rastreador (Rastreador, optional): O rastreador que recebe os eventos.
+        saida (Saida, optional): O destino dos PRINTs.
+        workers (int, optional): Número de processos. Padrão: número de CPUs.
+        tamanho_minimo (int, optional): O menor número de instruções de um bloco enviado a outro processo.
+
+    Attributes:
+        blocos_enviados (int): Quantos blocos foram executados em outros processos.
+    """
+    def __init__(self, rastreador:Rastreador=None, saida:Saida=None, workers=None, tamanho_minimo=TAMANHO_MINIMO_BLOCO):
+        super().__init__(rastreador, saida)
+        self._rastreador_destino, self._saida_destino = self.rastreador, self.saida
+        self.rastreador = Rastreador([_ColetorOrdenado(self, self._rastreador_destino)])
+        self.saida = _SaidaOrdenada(self)
+        self.workers = workers or os.cpu_count() or 1
+        self.tamanho_minimo = tamanho_minimo
+        self.blocos_enviados = 0
+        # Blocos em outros processos, na ordem do programa, cada um com a lista dos PRINTs e
+        # eventos deste processo que vieram depois dele
+        self._pendentes = deque()
+        # A lista em que este processo guarda PRINTs e eventos; None se não houver blocos pendentes
+        self._capturas = None
+
+    def executar_programa(self, programa:ProgramaCompacto|ProgramaInferido, perfilador=None):
+        if perfilador is not None or self.workers < 2:
+            return super().executar_programa(programa, perfilador)
+        base = programa.programa if isinstance(programa, ProgramaInferido) else programa
+        maximo = max(self.tamanho_minimo, len(base) // (self.workers * BLOCOS_POR_PROCESSO))
+        blocos = analisar_blocos(base, self.tamanho_minimo, maximo)
+        if not blocos:
+            return super().executar_programa(programa)
+
+        eventos = [evento for evento, nome in enumerate(rastreamento.NOMES_EVENTOS) if getattr(self.rastreador, nome)]
+        executor = ProcessPoolExecutor(self.workers, initializer=_iniciar_processo, initargs=(programa, eventos))
+        falha = None
+        try:
+            posicao = 0
+            try:
+                for inicio, fim, atribuidos in blocos:
+                    if inicio < posicao:
+                        # Dentro de um bloco já enviado
+                        continue
+                    self.executar_trecho(programa, posicao, inicio)
+                    posicao = inicio
+                    # Um bloco fora de qualquer escopo nunca tem a tabela removida no FIM (ver fechar_escopo)
+                    if not self.pilha_escopo or not atribuidos.isdisjoint(self._vinculos):
+                        continue
+                    futuro = executor.submit(executar_bloco, inicio, fim + 1, len(self.pilha_escopo), self.nome_blocos[-1:], self._fotografar(base, inicio, fim + 1))
+                    self._capturas = []
+                    self._pendentes.append((futuro, self._capturas))
+                    self.blocos_enviados += 1
+                    posicao = fim + 1
+                    self._descarregar()
+                self.executar_trecho(programa, posicao)
+            except Exception as erro:
+                # Os blocos pendentes vêm antes do ponto da falha, e os seus resultados saem antes dela
+                falha = erro
+            self._descarregar(esperar=True)
+        finally:
+            executor.shutdown(cancel_futures=True)
+            self._pendentes.clear()
+            self._capturas = None
+        if falha is not None:
+            raise falha
+
+    def _fotografar(self, programa, inicio, fim):
+        """
+        Copia as variáveis externas que um trecho do programa pode ler.
+
+        Returns:
+            list[tuple]: Para cada lexema do trecho declarado fora dele, (lexema, [(profundidade,
+                tipo, valor), ...]), com uma entrada por tabela que o declara, da mais externa à mais interna.
+        """
+        lexemas, vinculos, pilha = programa.lexemas, self._vinculos, self.pilha_escopo
+        indices = set(programa.operandos[inicio:fim])
+        indices.update(programa.valores[inicio:fim])
+        foto = []
+        for indice in indices:
+            lexema = lexemas[indice]
+            profundidades = vinculos.get(lexema)
+            if profundidades:
+                foto.append((lexema, [(profundidade, pilha[profundidade].obter_tipo(lexema), pilha[profundidade].obter_valor(lexema))
+                                      for profundidade in profundidades]))
+        return foto
+
+    def _restaurar(self, profundidade, bloco, foto):
+        """
+        Recria os escopos externos de um bloco a partir da foto tirada por _fotografar e do
+        nome do bloco que o envolve.
+        """
+        self.pilha_escopo = [TabelaSimbolos() for _ in range(profundidade)]
+        self.nome_blocos = list(bloco)
+        self._desfazer = [[] for _ in range(profundidade)]
+        self._vinculos = {}
+        for lexema, declaracoes in foto:
+            for posicao, tipo, valor in declaracoes:
+                self.pilha_escopo[posicao].adicionar(lexema, tipo, valor)
+            self._vinculos[lexema] = [posicao for posicao, _, _ in declaracoes]
+
+    def _descarregar(self, esperar=False):
+        """
+        Repassa, na ordem do programa, os resultados dos blocos já concluídos e o que este processo produziu depois deles.
+
+        Args:
+            esperar (bool, optional): Se True, espera todos os blocos pendentes.
+
+        Raises:
+            Exception: A exceção que interrompeu um bloco, depois dos resultados anteriores a ela.
+        """
+        pendentes = self._pendentes
+        while pendentes and (esperar or pendentes[0][0].done()):
+            futuro, capturas = pendentes.popleft()
+            registros, erro = futuro.result()
+            self._repassar(registros)
+            if erro is not None:
+                # A execução sequencial pararia aqui: nada do que vem depois é repassado
+                pendentes.clear()
+                raise erro
+            self._repassar(capturas)
+        if not pendentes:
+            self._capturas = None
+
+    def _repassar(self, registros):
+        rastreador, saida = self._rastreador_destino, self._saida_destino
+        for evento, campos in registros:
+            if evento is None:
+                saida.escrever(*campos)
+            else:
+                rastreador.emitir(evento, *campos)
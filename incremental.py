@@ -0,0 +1,596 @@
+import gc
+import os
+import sys
+import time
+
+import rastreamento
+from main import AnalisadorSemantico, ProcessadorSemantico
+from mapa_persistente import MAPA_VAZIO
+from rastreamento import Coletor, Rastreador
+from saida import Saida
+
+# Reanálise incremental: o estado do AnalisadorSemantico (pilha de escopos, nomes dos blocos
+# e índice de resolução) passa a ser guardado em estruturas persistentes, de modo que tirar
+# uma foto do estado custa O(1) e as fotos compartilham tudo o que não mudou entre elas. A
+# SessaoIncremental guarda uma foto antes de cada BLOCO e FIM e, após uma edição, volta à
+# foto mais próxima antes do trecho editado e executa só até o estado voltar a coincidir
+# com o da execução anterior.
+
+class _VistaTabela:
+    """
+    Uma tabela de símbolos da PilhaTabelas, com a mesma interface de TabelaSimbolos.
+
+    A vista não guarda símbolos: cada operação lê a tabela da sua profundidade na pilha e as
+    alterações criam uma nova versão dela. Há uma única vista por profundidade, de modo que
+    comparações por identidade (`escopo is pilha_escopo[-1]`) continuam valendo.
+    """
+    __slots__ = ("_pilha", "_profundidade")
+
+    def __init__(self, pilha, profundidade):
+        self._pilha = pilha
+        self._profundidade = profundidade
+
+    def _mapa(self):
+        pilha = self._pilha
+        if self._profundidade == pilha._tamanho - 1:
+            return pilha._topo
+        return pilha._tabelas.obter(self._profundidade)
+
+    def __len__(self):
+        return len(self._mapa())
+
+    def adicionar(self, lexema, tipo, valor=None):
+        mapa = self._mapa()
+        if lexema not in mapa:
+            # A posição de inserção mantém a ordem dos símbolos nos eventos de tabela
+            simbolo = (len(mapa), tipo, valor)
+            pilha = self._pilha
+            pilha._substituir(self._profundidade, mapa.associar(lexema, simbolo, pilha._dono))
+            pilha._impressao += hash((self._profundidade, lexema, simbolo))
+
+    def obter_tipo(self, lexema):
+        simbolo = self._mapa().obter(lexema)
+        return simbolo[1] if simbolo is not None else None
+
+    def obter_valor(self, lexema):
+        simbolo = self._mapa().obter(lexema)
+        return simbolo[2] if simbolo is not None else None
+
+    def atualizar_valor(self, lexema, novo_valor):
+        mapa = self._mapa()
+        anterior = mapa.obter(lexema)
+        if anterior is not None:
+            simbolo = (anterior[0], anterior[1], novo_valor)
+            pilha = self._pilha
+            pilha._substituir(self._profundidade, mapa.associar(lexema, simbolo, pilha._dono))
+            pilha._impressao += hash((self._profundidade, lexema, simbolo)) - hash((self._profundidade, lexema, anterior))
+
+    def tem_simbolo(self, lexema):
+        return lexema in self._mapa()
+
+    def itens(self):
+        for lexema, (_, tipo, valor) in sorted(self._mapa().itens(), key=lambda item: item[1][0]):
+            yield lexema, tipo, valor
+
+class PilhaTabelas:
+    """
+    Pilha de escopos persistente. Cada tabela é um MapaPersistente do lexema para
+    (posição, tipo, valor); a do topo, que recebe quase todas as alterações, fica à parte, e
+    as demais ficam em um MapaPersistente da profundidade para a tabela. Os mapas são
+    alterados com o dono `_dono`, trocado a cada foto do estado (ver mapa_persistente).
+
+    `_impressao`, a soma dos hashes de (profundidade, lexema, símbolo) de todos os símbolos,
+    é mantida a cada alteração e permite descartar em O(1) a maioria dos estados diferentes.
+
+    Oferece a parte da interface de lista usada pelo AnalisadorSemantico (`len` e índices,
+    inclusive negativos), com as mesmas exceções de uma lista vazia.
+    """
+    __slots__ = ("_tabelas", "_topo", "_tamanho", "_impressao", "_vistas", "_dono")
+
+    def __init__(self):
+        self._tabelas = MAPA_VAZIO
+        self._topo = None
+        self._tamanho = 0
+        self._impressao = 0
+        self._dono = object()
+        self._vistas:list[_VistaTabela] = []
+
+    def __len__(self):
+        return self._tamanho
+
+    def __getitem__(self, indice):
+        if indice < 0:
+            indice += self._tamanho
+        if not 0 <= indice < self._tamanho:
+            raise IndexError("list index out of range")
+        vistas = self._vistas
+        while len(vistas) <= indice:
+            vistas.append(_VistaTabela(self, len(vistas)))
+        return vistas[indice]
+
+    def empilhar(self):
+        if self._tamanho:
+            self._tabelas = self._tabelas.associar(self._tamanho - 1, self._topo, self._dono)
+        self._topo = MAPA_VAZIO
+        self._tamanho += 1
+
+    def desempilhar(self):
+        """
+        Remove a tabela do topo.
+
+        Returns:
+            MapaPersistente: A tabela removida.
+        """
+        tabela = self._topo
+        self._tamanho -= 1
+        for lexema, simbolo in tabela.itens():
+            self._impressao -= hash((self._tamanho, lexema, simbolo))
+        if self._tamanho:
+            self._topo = self._tabelas.obter(self._tamanho - 1)
+            self._tabelas = self._tabelas.remover(self._tamanho - 1)
+        else:
+            self._topo = None
+        return tabela
+
+    def _substituir(self, profundidade, tabela):
+        if profundidade == self._tamanho - 1:
+            self._topo = tabela
+        else:
+            self._tabelas = self._tabelas.associar(profundidade, tabela, self._dono)
+
+class PilhaNomes:
+    """
+    Pilha persistente dos nomes dos blocos, em células (nome, restante, impressão), com a
+    parte da interface de lista usada pelo AnalisadorSemantico. A impressão de uma célula
+    resume os nomes dela para baixo, e permite descartar em O(1) a maioria das pilhas diferentes.
+    """
+    __slots__ = ("_topo", "_tamanho")
+
+    def __init__(self):
+        self._topo = None
+        self._tamanho = 0
+
+    def __len__(self):
+        return self._tamanho
+
+    def __getitem__(self, indice):
+        if indice != -1 or self._topo is None:
+            raise IndexError("list index out of range")
+        return self._topo[0]
+
+    def append(self, nome):
+        topo = self._topo
+        self._topo = (nome, topo, hash((nome, topo[2] if topo is not None else 0)))
+        self._tamanho += 1
+
+    def pop(self):
+        if self._topo is None:
+            raise IndexError("pop from empty list")
+        nome, self._topo, _ = self._topo
+        self._tamanho -= 1
+        return nome
+
+def _mesmos_nomes(a, b):
+    if a is not None and b is not None and a[2] != b[2]:
+        return False
+    while a is not b:
+        if a is None or b is None or a[0] != b[0]:
+            return False
+        a, b = a[1], b[1]
+    return True
+
+class AnalisadorPersistente(AnalisadorSemantico):
+    """
+    AnalisadorSemantico cujo estado é guardado em estruturas persistentes.
+
+    A execução é a mesma, com os mesmos erros, eventos e exceções; só muda onde os escopos
+    ficam guardados. Em troca de cada alteração custar O(log n) em vez de O(1), `estado()`
+    devolve em O(1) uma foto do estado, que `restaurar` reinstala, também em O(1).
+    """
+    def __init__(self, rastreador:Rastreador=None, saida:Saida=None):
+        super().__init__(rastreador, saida)
+        self.nome_blocos = PilhaNomes()
+        self.pilha_escopo = PilhaTabelas()
+        # Para cada lexema, as profundidades das tabelas que o declaram, em células
+        # (restante, profundidade): como na lista do AnalisadorSemantico, [-1] é a mais interna
+        self._vinculos = MAPA_VAZIO
+        # As tabelas já registram os lexemas de cada escopo, que são os desfeitos ao fechá-lo
+        self._desfazer = None
+
+    def estado(self):
+        """
+        Tira uma foto do estado atual.
+
+        Returns:
+            tuple: O estado, que pode ser passado a `restaurar` ou comparado com `mesmo_estado`.
+        """
+        pilha, nomes = self.pilha_escopo, self.nome_blocos
+        # A foto compartilha os nós atuais, que a partir daqui não podem mais ser alterados no lugar
+        pilha._dono = object()
+        return (pilha._tabelas, pilha._topo, pilha._tamanho, nomes._topo, nomes._tamanho, self._vinculos, pilha._impressao)
+
+    def restaurar(self, estado):
+        """
+        Reinstala um estado obtido com `estado()`.
+
+        Args:
+            estado (tuple): O estado a ser reinstalado.
+        """
+        pilha, nomes = self.pilha_escopo, self.nome_blocos
+        pilha._tabelas, pilha._topo, pilha._tamanho, nomes._topo, nomes._tamanho, self._vinculos, pilha._impressao = estado
+        pilha._dono = object()
+
+    @staticmethod
+    def mesmo_estado(a, b):
+        """
+        Compara dois estados, pulando as partes que eles compartilham.
+
+        Tamanhos e impressões diferentes descartam o estado sem percorrer as tabelas, que só
+        são comparadas quando tudo isso coincide. O índice de resolução não é comparado, pois
+        é determinado pelas tabelas.
+
+        Args:
+            a (tuple): Um estado.
+            b (tuple): Outro estado.
+
+        Returns:
+            bool: True se a execução a partir de ambos for indistinguível.
+        """
+        return (a[2] == b[2] and a[4] == b[4] and a[6] == b[6] and _mesmos_nomes(a[3], b[3])
+                and a[1] == b[1] and a[0] == b[0])
+
+    def abrir_escopo(self, nome_bloco=""):
+        if self.rastreador.escopo_aberto:
+            self.rastreador.emitir(rastreamento.ESCOPO_ABERTO, nome_bloco)
+        self.nome_blocos.append(nome_bloco)
+        self.pilha_escopo.empilhar()
+
+    def fechar_escopo(self, nome_bloco=""):
+        if self.rastreador.tabela:
+            self._imprimir_tabela_simbolos()
+
+        if self.rastreador.escopo_fechado:
+            self.rastreador.emitir(rastreamento.ESCOPO_FECHADO, nome_bloco)
+        self.nome_blocos.pop()
+        if len(self.pilha_escopo) > 1:
+            vinculos, dono = self._vinculos, self.pilha_escopo._dono
+            for lexema in self.pilha_escopo.desempilhar():
+                restante = vinculos.obter(lexema)[0]
+                vinculos = vinculos.associar(lexema, restante, dono) if restante is not None else vinculos.remover(lexema)
+            self._vinculos = vinculos
+
+    def _vincular(self, lexema):
+        profundidade = len(self.pilha_escopo) - 1
+        celula = self._vinculos.obter(lexema)
+        if celula is None or celula[-1] != profundidade:
+            self._vinculos = self._vinculos.associar(lexema, (celula, profundidade), self.pilha_escopo._dono)
+
+    def obter_valor(self, lexema):
+        celula = self._vinculos.obter(lexema)
+        valor = posicao = None
+        # Percorre as declarações sombreadas deste lexema, da mais interna para a mais externa
+        while celula is not None:
+            celula, profundidade = celula
+            valor = self.pilha_escopo[profundidade].obter_valor(lexema)
+            if valor is not None:
+                posicao = profundidade
+                break
+        if self.rastreador.consulta:
+            topo = len(self.pilha_escopo) - 1
+            self.rastreador.emitir(rastreamento.CONSULTA, "valor", lexema, posicao == topo, None if posicao is None else topo - posicao)
+        return valor
+
+class _ColetorCaptura(Coletor):
+    # Recebe os mesmos eventos que o rastreador de destino e os guarda na linha em execução
+    def __init__(self, sessao, destino:Rastreador):
+        super().__init__()
+        self._sessao = sessao
+        self._aceitos = tuple(getattr(destino, nome) for nome in rastreamento.NOMES_EVENTOS)
+
+    def aceita(self, evento):
+        return self._aceitos[evento]
+
+    def registrar(self, evento, campos):
+        self._sessao._eventos.append((evento, campos))
+
+class _SaidaCaptura(Saida):
+    # Guarda os PRINTs na linha em execução, na mesma sequência dos eventos (evento None)
+    def __init__(self, sessao):
+        self._sessao = sessao
+
+    def escrever(self, lexema, tipo, valor, bloco):
+        self._sessao._eventos.append((None, (lexema, tipo, valor, bloco)))
+
+_SEM_INSTRUCOES = ()
+
+def _prefixo_comum(a, b, passo=4096):
+    limite = min(len(a), len(b))
+    inicio = 0
+    # Compara em fatias, no C, e só percorre linha a linha a fatia que difere
+    while inicio < limite and a[inicio:inicio + passo] == b[inicio:inicio + passo]:
+        inicio += passo
+    inicio = min(inicio, limite)
+    while inicio < limite and a[inicio] == b[inicio]:
+        inicio += 1
+    return inicio
+
+class SessaoIncremental:
+    """
+    Mantém um programa processado e executado, e o atualiza a cada edição sem refazer tudo.
+
+    Para cada linha são guardados o texto, as instruções, os eventos do processamento e os
+    da execução (PRINTs inclusive) e, nas linhas de BLOCO e FIM, a foto do estado antes
+    delas; em trechos longos sem blocos, também a cada `intervalo_fotos` linhas. Uma edição
+    processa apenas as linhas novas e retoma a execução da foto mais próxima antes da
+    edição; depois do trecho editado, a execução para na primeira foto antiga cujo estado
+    coincide com o atual, pois daí em diante tudo se repetiria, e os resultados antigos das
+    linhas seguintes são reaproveitados.
+
+    O custo de uma edição depende, portanto, do trecho editado e de até onde o seu efeito
+    chega, e não do tamanho do arquivo: uma edição dentro de um bloco converge no FIM que
+    fecha o escopo afetado; uma que muda um valor visível até o fim do arquivo executa até o fim.
+
+    Args:
+        rastreador (Rastreador, optional): Define quais eventos são guardados para `reproduzir`.
+        linhas (Iterable[str], optional): O programa inicial.
+        intervalo_fotos (int, optional): Maior distância, em linhas, entre duas fotos.
+
+    Attributes:
+        falha (tuple or None): (índice da linha, exceção) se a execução foi interrompida.
+        estatisticas (dict): Como foi a última atualização: linhas_processadas,
+            linhas_executadas, retomada (índice da linha) e convergencia (índice da linha ou None).
+    """
+    def __init__(self, rastreador:Rastreador=None, linhas=(), intervalo_fotos=256):
+        rastreador = rastreador if rastreador is not None else Rastreador()
+        self._eventos:list = []
+        captura = Rastreador([_ColetorCaptura(self, rastreador)])
+        self._processador = ProcessadorSemantico(captura)
+        self._analisador = AnalisadorPersistente(captura, _SaidaCaptura(self))
+        self._estado_inicial = self._analisador.estado()
+        self.linhas:list[str] = []
+        self._instrucoes:list[tuple] = []
+        self._eventos_processamento:list = []
+        self._eventos_execucao:list = []
+        # Estado antes de cada linha de BLOCO ou FIM (ou a cada intervalo_fotos linhas) já executada, e None nas demais
+        self.intervalo_fotos = intervalo_fotos
+        self._fotos:list = []
+        self._pontos:list[bool] = []
+        self._total_instrucoes = 0
+        self.falha = None
+        self.estatisticas = {}
+        self.editar(0, 0, list(linhas))
+
+    def __len__(self):
+        return len(self.linhas)
+
+    def atualizar(self, linhas):
+        """
+        Substitui o programa por uma nova versão, reprocessando só o trecho que mudou.
+
+        Args:
+            linhas (list[str]): Todas as linhas da nova versão.
+
+        Returns:
+            dict: As estatísticas da atualização.
+        """
+        antigas = self.linhas
+        inicio = _prefixo_comum(antigas, linhas)
+        # O sufixo comum não pode avançar sobre o prefixo em nenhuma das versões
+        sufixo = _prefixo_comum(antigas[:inicio - 1 if inicio else None:-1], linhas[:inicio - 1 if inicio else None:-1])
+        return self.editar(inicio, len(antigas) - sufixo, linhas[inicio:len(linhas) - sufixo])
+
+    def editar(self, inicio, fim, novas_linhas):
+        """
+        Substitui as linhas [inicio, fim) por novas linhas e atualiza a execução.
+
+        Args:
+            inicio (int): Índice da primeira linha substituída.
+            fim (int): Índice seguinte ao da última linha substituída.
+            novas_linhas (list[str]): As linhas que entram no lugar.
+
+        Returns:
+            dict: As estatísticas da atualização.
+        """
+        # As estruturas persistentes criam muitos objetos pequenos e sem ciclos, que só fariam o
+        # coletor cíclico percorrer repetidamente todas as fotos guardadas
+        coletor_ativo = gc.isenabled()
+        gc.disable()
+        try:
+            return self._editar(inicio, fim, list(novas_linhas))
+        finally:
+            if coletor_ativo:
+                gc.enable()
+
+    def _editar(self, inicio, fim, novas_linhas):
+        processador = self._processador
+        instrucoes, pontos, eventos = [], [], []
+        for linha in novas_linhas:
+            resultado = processador.processar_linha(linha)
+            if resultado is None:
+                resultado = _SEM_INSTRUCOES
+            elif isinstance(resultado, dict):
+                resultado = (resultado,)
+            else:
+                resultado = tuple(resultado)
+            instrucoes.append(resultado)
+            pontos.append(len(resultado) == 1 and resultado[0]["instrucao"] in ("BLOCO", "FIM"))
+            eventos.append(self._eventos or None)
+            self._eventos = []
+        removidas = sum(map(len, self._instrucoes[inicio:fim]))
+        self._total_instrucoes += sum(map(len, instrucoes)) - removidas
+
+        self.linhas[inicio:fim] = novas_linhas
+        self._instrucoes[inicio:fim] = instrucoes
+        self._pontos[inicio:fim] = pontos
+        self._eventos_processamento[inicio:fim] = eventos
+        # As linhas seguintes guardam os resultados da execução anterior, deslocados
+        vazios = [None] * len(novas_linhas)
+        self._eventos_execucao[inicio:fim] = vazios
+        self._fotos[inicio:fim] = vazios
+        deslocamento = len(novas_linhas) - (fim - inicio)
+        falha_anterior = self.falha
+        if falha_anterior is not None:
+            indice, erro = falha_anterior
+            falha_anterior = (indice + deslocamento, erro) if indice >= fim else None
+
+        # Retoma da foto mais próxima antes do trecho editado (as linhas sem foto valem None)
+        retomada = min(inicio, len(self._fotos)) - 1
+        while retomada >= 0 and self._fotos[retomada] is None:
+            retomada -= 1
+        if retomada < 0:
+            retomada, estado = 0, self._estado_inicial
+        else:
+            estado = self._fotos[retomada]
+        convergencia = self._executar(retomada, estado, inicio + len(novas_linhas), falha_anterior)
+        fim_execucao = convergencia if convergencia is not None else (self.falha[0] + 1 if self.falha else len(self.linhas))
+        self.estatisticas = {
+            "linhas_processadas": len(novas_linhas),
+            "linhas_executadas": fim_execucao - retomada,
+            "retomada": retomada,
+            "convergencia": convergencia,
+        }
+        return self.estatisticas
+
+    def _executar(self, inicio, estado, fim_edicao, falha_anterior):
+        """
+        Executa a partir de uma linha até convergir com a execução anterior, falhar ou terminar.
+
+        Args:
+            inicio (int): A linha em que a execução começa.
+            estado (tuple): O estado antes dessa linha.
+            fim_edicao (int): A primeira linha depois do trecho editado.
+            falha_anterior (tuple or None): A falha da execução anterior, já deslocada.
+
+        Returns:
+            int or None: A linha em que a execução convergiu, ou None.
+        """
+        analisador = self._analisador
+        analisador.restaurar(estado)
+        executar = analisador._executar_instrucao
+        mesmo_estado = analisador.mesmo_estado
+        instrucoes, pontos, fotos = self._instrucoes, self._pontos, self._fotos
+        eventos_execucao = self._eventos_execucao
+        intervalo = self.intervalo_fotos
+        desde_foto = intervalo
+        self._eventos = []
+        for indice in range(inicio, len(instrucoes)):
+            # As fotos antigas depois da edição são comparadas onde estiverem; as novas vão
+            # para as linhas de BLOCO e FIM e para os trechos longos sem elas
+            anterior = fotos[indice]
+            foto = pontos[indice] or desde_foto >= intervalo
+            if foto or anterior is not None:
+                estado = analisador.estado()
+                if indice >= fim_edicao and anterior is not None and mesmo_estado(estado, anterior):
+                    self.falha = falha_anterior
+                    return indice
+                if foto:
+                    fotos[indice] = estado
+                    desde_foto = 0
+                else:
+                    fotos[indice] = None
+            desde_foto += 1
+            try:
+                for instrucao in instrucoes[indice]:
+                    executar(instrucao)
+            except Exception as erro:
+                # Como na execução completa, nada depois da exceção é executado
+                eventos_execucao[indice] = self._eventos or None
+                self._eventos = []
+                restantes = len(instrucoes) - indice - 1
+                eventos_execucao[indice + 1:] = [None] * restantes
+                fotos[indice + 1:] = [None] * restantes
+                self.falha = (indice, erro)
+                return None
+            if self._eventos:
+                eventos_execucao[indice] = self._eventos
+                self._eventos = []
+            else:
+                eventos_execucao[indice] = None
+        self.falha = None
+        return None
+
+    def reproduzir(self, saida:Saida, rastreador:Rastreador=None):
+        """
+        Envia a saída e os eventos do programa atual, na ordem de uma execução completa.
+
+        Args:
+            saida (Saida): Recebe os PRINTs.
+            rastreador (Rastreador, optional): Recebe os eventos guardados.
+        """
+        if rastreador is not None:
+            for eventos in self._eventos_processamento:
+                if eventos:
+                    for evento, campos in eventos:
+                        rastreador.emitir(evento, *campos)
+            if self._total_instrucoes and rastreador.processado:
+                rastreador.emitir(rastreamento.PROCESSADO, self._total_instrucoes)
+        for eventos in self._eventos_execucao:
+            if eventos:
+                for evento, campos in eventos:
+                    if evento is None:
+                        saida.escrever(*campos)
+                    elif rastreador is not None:
+                        rastreador.emitir(evento, *campos)
+
+def _ler_linhas(nome_arquivo):
+    with open(nome_arquivo, 'r', encoding='utf-8') as arquivo:
+        return arquivo.readlines()
+
+def _resumo(nome_arquivo, sessao, segundos):
+    estatisticas = sessao.estatisticas
+    texto = (
+        f"{nome_arquivo}: {estatisticas['linhas_processadas']} linha(s) processada(s), "
+        f"{estatisticas['linhas_executadas']} executada(s) a partir da linha {estatisticas['retomada'] + 1}"
+    )
+    if estatisticas["convergencia"] is not None:
+        texto += f", estado igual ao anterior na linha {estatisticas['convergencia'] + 1}"
+    texto += f" ({segundos * 1000:.1f} ms)"
+    if sessao.falha is not None:
+        linha, erro = sessao.falha
+        texto += f"\n{nome_arquivo}:{linha + 1}: execução interrompida: {type(erro).__name__}: {erro}"
+    return texto + "\n"
+
+def acompanhar_arquivo(nome_arquivo, criar_saida, rastreador:Rastreador=None, intervalo=0.2):
+    """
+    Executa um arquivo e o reexecuta incrementalmente a cada alteração, até ser interrompido (Ctrl+C).
+
+    A cada versão, a saída completa é reenviada a uma nova saída e um resumo da atualização
+    (linhas processadas e executadas, onde a execução retomou e convergiu) vai para o stderr.
+
+    Args:
+        nome_arquivo (str): O arquivo acompanhado.
+        criar_saida (Callable[[], Saida]): Cria a saída que recebe os PRINTs de cada versão.
+        rastreador (Rastreador, optional): Recebe os eventos de cada versão.
+        intervalo (float, optional): Segundos entre duas verificações do arquivo.
+
+    Raises:
+        FileNotFoundError: Se o arquivo não existir no início.
+    """
+    assinatura = None
+    sessao = None
+    try:
+        while True:
+            try:
+                informacoes = os.stat(nome_arquivo)
+                atual = (informacoes.st_mtime_ns, informacoes.st_size)
+                if atual != assinatura:
+                    linhas = _ler_linhas(nome_arquivo)
+                    assinatura = atual
+                    inicio = time.perf_counter()
+                    if sessao is None:
+                        sessao = SessaoIncremental(rastreador, linhas)
+                    else:
+                        sessao.atualizar(linhas)
+                    segundos = time.perf_counter() - inicio
+                    saida = criar_saida()
+                    sessao.reproduzir(saida, rastreador)
+                    saida.fechar()
+                    sys.stderr.write(_resumo(nome_arquivo, sessao, segundos))
+                    sys.stderr.flush()
+            except FileNotFoundError:
+                # O arquivo pode sumir por um instante enquanto um editor o salva
+                if sessao is None:
+                    raise
+            time.sleep(intervalo)
+    except KeyboardInterrupt:
+        pass
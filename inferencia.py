@@ -0,0 +1,247 @@
+from array import array
+
+from programa_compacto import ProgramaCompacto, NOMES_OPCODES, BLOCO, FIM, ATRIBUICAO, DECLARACAO
+
+# Códigos de operação especializados pela inferência, que continuam a numeração de
+# programa_compacto (e, portanto, a tabela de despacho do AnalisadorSemantico):
+#   ATRIBUICAO_TRATADA        o valor já vem convertido do reservatório de literais; o resto
+#                             da atribuição, inclusive a verificação de tipo, fica como antes
+#   DECLARACAO_PROVADA        o valor já vem convertido e a atribuição certamente declara o
+#                             lexema no escopo atual, sem erro
+#   ATUALIZACAO_PROVADA       o valor já vem convertido e a atribuição certamente atualiza a
+#                             declaração mais interna do lexema, sem erro
+#   COPIA_DECLARACAO_PROVADA  como DECLARACAO_PROVADA e ATUALIZACAO_PROVADA, mas o valor é
+#   COPIA_ATUALIZACAO_PROVADA outra variável, que continua sendo lida em tempo de execução
+(ATRIBUICAO_TRATADA, DECLARACAO_PROVADA, ATUALIZACAO_PROVADA,
+ COPIA_DECLARACAO_PROVADA, COPIA_ATUALIZACAO_PROVADA) = range(len(NOMES_OPCODES), len(NOMES_OPCODES) + 5)
+
+# Nome de cada código nos eventos de rastreamento: as especializações continuam sendo atribuições
+NOMES_OPCODES_ESPECIALIZADOS = NOMES_OPCODES + ("ATRIBUICAO",) * 5
+
+TIPOS_VALIDOS = {'NUMERO': (int, float), 'CADEIA': str}
+
+class _Marca:
+    def __init__(self, nome):
+        self.nome = nome
+
+    def __repr__(self):
+        return self.nome
+
+# Marca os valores que não são literais, e sim nomes de variáveis
+NAO_LITERAL = _Marca("NAO_LITERAL")
+
+def converter_literal(valor):
+    """
+    Converte o valor de uma atribuição como o AnalisadorSemantico._tratar_valor, sem consultar variáveis.
+
+    Args:
+        valor (str or None): O valor, como escrito no código.
+
+    Returns:
+        O valor convertido, ou NAO_LITERAL se ele for o nome de uma variável.
+
+    Raises:
+        ValueError: Se o valor parecer um número mas não puder ser convertido, como em tempo de execução.
+    """
+    if not valor:
+        # Valores ausentes ou vazios não são tratados
+        return valor
+    if valor.startswith('"') and valor.endswith('"'):
+        return valor.strip('"')
+    if valor.lstrip('-+').isdigit():
+        return int(valor)
+    if '.' in valor or valor.lstrip('-+').replace('.', '', 1).isdigit():
+        return float(valor)
+    return NAO_LITERAL
+
+# Tipos estáticos dos valores na tabela de lexemas, além de "NUMERO", "CADEIA" e None (nome de variável)
+_PENDENTE = _Marca("PENDENTE")    # ainda não classificado
+_AUSENTE = _Marca("AUSENTE")      # sem valor (índice 0)
+_INVALIDO = _Marca("INVALIDO")    # literal cuja conversão falha
+
+class ProgramaInferido:
+    """
+    Resultado da passagem de inferência sobre um ProgramaCompacto.
+
+    Os operandos continuam os do programa original; mudam apenas os códigos de operação das
+    atribuições que puderam ser especializadas e a tabela usada para o valor de cada instrução.
+
+    Attributes:
+        programa (ProgramaCompacto): O programa original.
+        opcodes (array): Os códigos de operação, com as atribuições especializadas.
+        valores (list): A tabela de lexemas com cada literal já convertido (o reservatório de
+            literais); nomes de variáveis e literais inválidos continuam como texto.
+        literais (int): Quantidade de literais distintos convertidos.
+        conversoes_removidas (int): Atribuições cujo valor deixou de ser convertido a cada execução.
+        verificacoes (int): Atribuições que fazem uma verificação de tipo em tempo de execução.
+        verificacoes_removidas (int): Verificações provadas em tempo de compilação e removidas.
+        instrucao_parada (int or None): Índice da instrução que interromperia a execução, onde a
+            passagem parou, ou None.
+    """
+    def __init__(self, programa:ProgramaCompacto):
+        self.programa = programa
+        self.opcodes = array('B', programa.opcodes)
+        self.valores = list(programa.lexemas)
+        self.literais = 0
+        self.conversoes_removidas = 0
+        self.verificacoes = 0
+        self.verificacoes_removidas = 0
+        self.instrucao_parada = None
+
+    def __len__(self):
+        return len(self.programa)
+
+    def __iter__(self):
+        return iter(self.programa)
+
+    def estatisticas(self):
+        """
+        Resume o efeito da passagem.
+
+        Returns:
+            dict: literais, conversoes_removidas, verificacoes, verificacoes_removidas e instrucao_parada.
+        """
+        return {
+            "literais": self.literais,
+            "conversoes_removidas": self.conversoes_removidas,
+            "verificacoes": self.verificacoes,
+            "verificacoes_removidas": self.verificacoes_removidas,
+            "instrucao_parada": self.instrucao_parada,
+        }
+
+def inferir_tipos(programa:ProgramaCompacto):
+    """
+    Converte os literais do programa uma única vez e prova, onde possível, as verificações de tipo.
+
+    Como a linguagem não tem desvios, os escopos podem ser simulados em tempo de compilação
+    com as mesmas regras do AnalisadorSemantico (e do VerificadorSemantico): para cada lexema,
+    as declarações visíveis com seu tipo e se já têm valor. Assim, o tipo do valor de uma
+    atribuição é conhecido mesmo quando ele é uma cópia (`e = d`, com `d = c`...). Uma
+    atribuição cuja verificação certamente passa é especializada em uma declaração ou
+    atualização provada, que não verifica o tipo nem consulta a declaração em tempo de
+    execução; as que falham continuam como antes, e o erro é emitido na execução. Uma instrução que interromperia a execução (FIM sem
+    BLOCO, declaração fora de bloco, literal que não converte) encerra a passagem: ela e as
+    seguintes, que nunca chegam a ser executadas, ficam como estão.
+
+    Args:
+        programa (ProgramaCompacto): O programa a ser analisado.
+
+    Returns:
+        ProgramaInferido: O programa com as atribuições especializadas e as estatísticas da passagem.
+    """
+    inferido = ProgramaInferido(programa)
+    lexemas = programa.lexemas
+    valores = inferido.valores
+    opcodes = inferido.opcodes
+    # Índice na tabela de lexemas -> tipo estático do valor; só os lexemas usados como valor são classificados
+    tipos_valores:list = [_AUSENTE] + [_PENDENTE] * (len(lexemas) - 1)
+    operandos, tipos, indices_valores = programa.operandos, programa.tipos, programa.valores
+    profundidade = blocos = 0
+    verificacoes = removidas = conversoes = 0
+    # Para cada lexema, as declarações visíveis [profundidade, tipo, tem_valor], da mais externa para a mais interna
+    vinculos:dict[str, list[list]] = {}
+    desfazer:list[list[str]] = []
+    for indice, opcode in enumerate(programa.opcodes):
+        if opcode == ATRIBUICAO:
+            valor = indices_valores[indice]
+            tipo_valor = tipos_valores[valor]
+            if tipo_valor is _PENDENTE:
+                tipo_valor = tipos_valores[valor] = _classificar(inferido, valor)
+            # Literal inválido ou atribuição fora de bloco: a execução é interrompida aqui, como antes
+            if tipo_valor is _INVALIDO or not profundidade:
+                inferido.instrucao_parada = indice
+                break
+            literal = tipo_valor is not None
+            if literal:
+                opcodes[indice] = ATRIBUICAO_TRATADA
+                if tipo_valor is _AUSENTE:
+                    tipo_valor = None
+                elif lexemas[valor]:
+                    conversoes += 1
+            else:
+                # O nome de uma variável vale o valor da declaração mais interna que já tem valor
+                for declaracao in reversed(vinculos.get(lexemas[valor], ())):
+                    if declaracao[2]:
+                        tipo_valor = declaracao[1]
+                        break
+
+            lexema = lexemas[operandos[indice]]
+            tipo_declarado = lexemas[tipos[indice]]
+            visiveis = vinculos.get(lexema)
+            if tipo_declarado is None and visiveis:
+                # Atualização da declaração mais interna, que passa se o valor tiver o mesmo tipo
+                verificacoes += 1
+                declaracao = visiveis[-1]
+                if tipo_valor is not None and declaracao[1] == tipo_valor:
+                    declaracao[2] = True
+                    removidas += 1
+                    opcodes[indice] = ATUALIZACAO_PROVADA if literal else COPIA_ATUALIZACAO_PROVADA
+                continue
+            if visiveis and visiveis[-1][0] == profundidade:
+                # Redeclaração: o erro é emitido sem verificação de tipo
+                continue
+            verificacoes += 1
+            if tipo_declarado is None:
+                # Declaração com o tipo do próprio valor, que sempre passa
+                tipo_declarado = "CADEIA" if tipo_valor == "CADEIA" else "NUMERO"
+            elif tipo_declarado not in TIPOS_VALIDOS or tipo_valor is not None and tipo_valor != tipo_declarado:
+                continue
+            removidas += 1
+            opcodes[indice] = DECLARACAO_PROVADA if literal else COPIA_DECLARACAO_PROVADA
+            vinculos.setdefault(lexema, []).append([profundidade, tipo_declarado, tipo_valor is not None])
+            desfazer[-1].append(lexema)
+        elif opcode == BLOCO:
+            blocos += 1
+            profundidade += 1
+            desfazer.append([])
+        elif opcode == FIM:
+            if not blocos:
+                # FIM sem BLOCO interrompe a execução
+                inferido.instrucao_parada = indice
+                break
+            blocos -= 1
+            # Como no AnalisadorSemantico, a tabela mais externa nunca é descartada
+            if profundidade > 1:
+                profundidade -= 1
+                for lexema in desfazer.pop():
+                    declaracoes = vinculos[lexema]
+                    declaracoes.pop()
+                    if not declaracoes:
+                        del vinculos[lexema]
+        elif opcode == DECLARACAO:
+            if not profundidade:
+                inferido.instrucao_parada = indice
+                break
+            lexema = lexemas[operandos[indice]]
+            tipo_declarado = lexemas[tipos[indice]]
+            visiveis = vinculos.get(lexema)
+            if tipo_declarado is None:
+                # Sem tipo, a declaração é uma atribuição sem valor: falha se o lexema já existe
+                tipo_declarado = None if visiveis else "NUMERO"
+            if not (visiveis and visiveis[-1][0] == profundidade) and tipo_declarado in TIPOS_VALIDOS:
+                vinculos.setdefault(lexema, []).append([profundidade, tipo_declarado, False])
+                desfazer[-1].append(lexema)
+    inferido.verificacoes, inferido.verificacoes_removidas, inferido.conversoes_removidas = verificacoes, removidas, conversoes
+    return inferido
+
+def _classificar(inferido, indice):
+    """
+    Converte um lexema usado como valor e guarda o resultado no reservatório de literais.
+
+    Args:
+        inferido (ProgramaInferido): O programa em análise.
+        indice (int): O índice do lexema na tabela de lexemas.
+
+    Returns:
+        "NUMERO" ou "CADEIA" para literais, None para nomes de variáveis e _INVALIDO para
+        literais cuja conversão falha.
+    """
+    try:
+        convertido = converter_literal(inferido.valores[indice])
+    except ValueError:
+        return _INVALIDO
+    if convertido is NAO_LITERAL:
+        return None
+    inferido.valores[indice] = convertido
+    inferido.literais += 1
+    return "CADEIA" if isinstance(convertido, str) else "NUMERO"
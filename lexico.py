@@ -0,0 +1,29 @@
+import re
+
+PALAVRAS_CHAVE = ("BLOCO", "FIM", "PRINT", "NUMERO", "CADEIA")
+
+# Análise léxica de uma linha (já sem o recuo), em uma única varredura da esquerda para
+# a direita. INSTRUCAO reconhece a palavra-chave inicial e o primeiro item; se ele terminar
+# em vírgula, os demais itens são reconhecidos por ITEM a partir do fim do casamento anterior.
+# Os grupos de cada casamento são os tokens, e `start(grupo)` dá a sua coluna, sem que
+# nenhum pedaço da linha seja recortado ou dividido de novo.
+#
+# Um item é um lexema, opcionalmente seguido de "= valor", e a vírgula que o separa do
+# próximo (ou o fim da linha). Uma cadeia é um único token, ainda que contenha espaços,
+# vírgulas ou "=". Em BLOCO, FIM e PRINT, o único item é o operando da instrução.
+_ITEM = (
+    r'(?P<lexema>[^\s=,"]+)\s*'
+    r'(?:(?P<igual>=)\s*(?P<valor>"[^"]*"|[^\s=,"]*)\s*)?'
+    r'(?:(?P<virgula>,)\s*|$)'
+)
+
+# A palavra-chave só vale como palavra inteira ("PRINTER = 1" e "NUMEROS = 2" são
+# atribuições comuns) e, uma vez reconhecida, não pode ser reinterpretada como lexema: se
+# ela não for consumida, a segunda alternativa exige que a linha não comece por ela. (É o
+# mesmo que um grupo opcional possessivo, `(?:...)?+`, que só existe a partir do Python 3.11.)
+_PALAVRA_CHAVE = r'(?:BLOCO|FIM|PRINT|NUMERO|CADEIA)(?![^\s=,"])'
+INSTRUCAO = re.compile(
+    r'(?:(?P<chave>BLOCO|FIM|PRINT|NUMERO|CADEIA)(?![^\s=,"])\s*|(?!' + _PALAVRA_CHAVE + r'))' + _ITEM
+)
+
+ITEM = re.compile(_ITEM)
@@ -0,0 +1,96 @@
+import gzip
+import logging
+import os
+import re
+import shutil
+
+_CORES = re.compile(r"\033\[[0-9;]*m")
+
+class FormatadorLogArquivo(logging.Formatter):
+    """
+    Formata os registros para o arquivo de log: sem códigos de cor e com um emoji por categoria.
+
+    🔶 marca erros, 💠 marca operações de escopo (abertura, fechamento e adição de variáveis)
+    e 🔹 marca as demais mensagens.
+    """
+    def format(self, record):
+        mensagem = _CORES.sub("", record.getMessage())
+        if mensagem.startswith("ERRO"):
+            return f"🔶 {mensagem}"
+        if mensagem.startswith(("Adicionando", "Abrindo", "Fechando")):
+            return f"💠 {mensagem}"
+        return f"🔹 {mensagem}"
+
+class ManipuladorLogArquivo(logging.Handler):
+    """
+    Grava o log já formatado em um arquivo, à medida que os registros são emitidos.
+
+    A escrita é feita em buffer e o arquivo só é descarregado no fechamento (ou ao
+    chamar `flush`). Com `max_bytes`, o arquivo é rotacionado ao atingir esse tamanho:
+    log.txt vira log.txt.1, log.txt.1 vira log.txt.2 e assim por diante, mantendo no
+    máximo `backups` arquivos antigos, opcionalmente compactados com gzip.
+
+    Args:
+        nome_arquivo (str): O caminho do arquivo de log.
+        max_bytes (int, optional): Tamanho máximo do arquivo antes de rotacionar. 0 desativa a rotação.
+        backups (int, optional): Quantidade de arquivos rotacionados mantidos.
+        comprimir (bool, optional): Se True, compacta os arquivos rotacionados com gzip.
+        encoding (str, optional): A codificação do arquivo.
+    """
+    def __init__(self, nome_arquivo, max_bytes=0, backups=3, comprimir=False, encoding='utf-8'):
+        super().__init__()
+        self.nome_arquivo = os.path.abspath(nome_arquivo)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.comprimir = comprimir
+        self.encoding = encoding
+        self.setFormatter(FormatadorLogArquivo())
+        self._arquivo = open(self.nome_arquivo, 'wb', buffering=1 << 16)
+        self._tamanho = 0
+
+    def emit(self, record):
+        try:
+            dados = (self.format(record) + "\n").encode(self.encoding)
+            if self.max_bytes and self._tamanho and self._tamanho + len(dados) > self.max_bytes:
+                self._rotacionar()
+            self._arquivo.write(dados)
+            self._tamanho += len(dados)
+        except Exception:
+            self.handleError(record)
+
+    def _nome_backup(self, indice):
+        return f"{self.nome_arquivo}.{indice}" + (".gz" if self.comprimir else "")
+
+    def _rotacionar(self):
+        """
+        Fecha o arquivo atual, desloca os arquivos antigos e abre um arquivo novo.
+        """
+        self._arquivo.close()
+        if self.backups > 0:
+            for indice in range(self.backups - 1, 0, -1):
+                if os.path.exists(self._nome_backup(indice)):
+                    os.replace(self._nome_backup(indice), self._nome_backup(indice + 1))
+            if self.comprimir:
+                with open(self.nome_arquivo, 'rb') as origem, gzip.open(self._nome_backup(1), 'wb') as destino:
+                    shutil.copyfileobj(origem, destino)
+                os.remove(self.nome_arquivo)
+            else:
+                os.replace(self.nome_arquivo, self._nome_backup(1))
+        self._arquivo = open(self.nome_arquivo, 'wb', buffering=1 << 16)
+        self._tamanho = 0
+
+    def flush(self):
+        self.acquire()
+        try:
+            if not self._arquivo.closed:
+                self._arquivo.flush()
+        finally:
+            self.release()
+
+    def close(self):
+        self.acquire()
+        try:
+            self._arquivo.close()
+        finally:
+            self.release()
+        super().close()
@@ -0,0 +1,214 @@
+import glob
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import rastreamento
+from main import AnalisadorSemantico, ProcessadorSemantico
+from rastreamento import ColetorMemoria, Rastreador
+from saida import ColetorSaida
+
+# O prelúdio do lote (ver preludio.py), executado uma vez neste processo. Os processos do pool,
+# criados com fork, o herdam já pronto e compartilham suas páginas até alterá-las; onde não
+# há fork, cada processo do pool executa o prelúdio uma vez ao iniciar
+_preludio = None
+
+def expandir_entradas(entradas, vazias=None):
+    """
+    Expande diretórios e padrões glob na lista de arquivos .cic a analisar.
+
+    Diretórios são percorridos recursivamente em busca de arquivos .cic. A ordem
+    do resultado segue a ordem das entradas e, dentro de cada uma, a ordem alfabética;
+    arquivos repetidos aparecem apenas na primeira vez.
+
+    Args:
+        entradas (list[str]): Arquivos, diretórios ou padrões glob.
+        vazias (list[str], optional): Recebe os diretórios e padrões que não encontraram nenhum arquivo.
+
+    Returns:
+        list[str]: Os arquivos encontrados.
+    """
+    arquivos = {}
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            encontrados = glob.glob(os.path.join(entrada, "**", "*.cic"), recursive=True)
+        elif glob.has_magic(entrada):
+            encontrados = glob.glob(entrada, recursive=True)
+        else:
+            encontrados = [entrada]
+        if not encontrados and vazias is not None:
+            vazias.append(entrada)
+        for arquivo in sorted(encontrados):
+            arquivos.setdefault(os.path.normpath(arquivo), None)
+    return list(arquivos)
+
+def analisar_arquivo(arquivo, formato="bonito", preludio=None):
+    """
+    Processa e executa um arquivo com um par ProcessadorSemantico/AnalisadorSemantico próprio.
+
+    Args:
+        arquivo (str): O caminho do arquivo .cic.
+        formato (str, optional): O formato da saída dos PRINTs.
+        preludio (preludio.Preludio, optional): O estado de partida da execução.
+
+    Returns:
+        dict: O resultado do arquivo, com as chaves "arquivo", "instrucoes", "saida",
+            "erros" (mensagens dos erros semânticos), "falha" (descrição de uma falha
+            que impediu a análise, ou None) e "tempo" (em segundos).
+    """
+    inicio = time.perf_counter()
+    coletor_erros = ColetorMemoria(logging.ERROR)
+    rastreador = Rastreador([coletor_erros])
+    saida = ColetorSaida()
+    instrucoes = 0
+    falha = None
+    try:
+        programa = ProcessadorSemantico(rastreador).compilar_arquivo(arquivo)
+        instrucoes = len(programa)
+        analisador = preludio.analisador(rastreador, saida) if preludio is not None else AnalisadorSemantico(rastreador, saida)
+        analisador.executar_programa(programa)
+    except Exception as erro:
+        falha = f"{type(erro).__name__}: {erro}"
+    return {
+        "arquivo": arquivo,
+        "instrucoes": instrucoes,
+        "saida": saida.texto(formato),
+        "erros": [rastreamento.mensagem_erro(*campos) for _, campos in coletor_erros.eventos],
+        "falha": falha,
+        "tempo": time.perf_counter() - inicio,
+    }
+
+def _analisar_arquivo_formato(argumentos):
+    return analisar_arquivo(*argumentos, _preludio)
+
+def _carregar_preludio(arquivo_preludio, formato="bonito"):
+    # Executa o prelúdio e o guarda em _preludio, com o resultado no formato de analisar_arquivo
+    global _preludio
+    from preludio import Preludio
+    inicio = time.perf_counter()
+    coletor_erros = ColetorMemoria(logging.ERROR)
+    rastreador = Rastreador([coletor_erros])
+    saida = ColetorSaida()
+    instrucoes = 0
+    falha = None
+    try:
+        programa = ProcessadorSemantico(rastreador).compilar_arquivo(arquivo_preludio)
+        instrucoes = len(programa)
+        _preludio = Preludio.executar(programa, rastreador, saida)
+    except Exception as erro:
+        falha = f"{type(erro).__name__}: {erro}"
+    return {
+        "arquivo": arquivo_preludio,
+        "instrucoes": instrucoes,
+        "saida": saida.texto(formato),
+        "erros": [rastreamento.mensagem_erro(*campos) for _, campos in coletor_erros.eventos],
+        "falha": falha,
+        "tempo": time.perf_counter() - inicio,
+    }
+
+def _opcoes_pool(arquivo_preludio):
+    if arquivo_preludio is None:
+        return {}
+    if "fork" in multiprocessing.get_all_start_methods():
+        return {"mp_context": multiprocessing.get_context("fork")}
+    return {"initializer": _carregar_preludio, "initargs": (arquivo_preludio,)}
+
+def executar_lote(entradas, workers=None, formato="bonito", saida=None, saida_erros=None, preludio=None):
+    """
+    Analisa vários arquivos em paralelo e imprime os resultados na ordem dos arquivos.
+
+    Cada arquivo é analisado em um processo do pool. A saída de cada arquivo é
+    escrita sob um cabeçalho com seu nome, seguida dos seus erros, e ao final é
+    impresso um relatório agregado.
+
+    Um diretório ou padrão glob que não encontra nenhum arquivo é reportado como uma falha.
+
+    Com um prelúdio, ele é executado uma única vez, antes dos arquivos e com a saída e os
+    erros sob o seu próprio cabeçalho, e cada arquivo parte do estado final dele. Se o
+    prelúdio falhar, nenhum arquivo é analisado.
+
+    Args:
+        entradas (list[str]): Arquivos, diretórios ou padrões glob.
+        workers (int, optional): Número de processos. Se omitido, usa o número de CPUs; 1 analisa sem pool.
+        formato (str, optional): O formato da saída dos PRINTs.
+        saida (TextIO, optional): Destino das saídas e do relatório. Padrão: sys.stdout.
+        saida_erros (TextIO, optional): Destino dos erros. Padrão: sys.stderr.
+        preludio (str, optional): O caminho de um arquivo .cic executado antes de cada arquivo.
+
+    Returns:
+        dict: O relatório agregado (arquivos, falhas, instrucoes, erros, arquivos_com_erro, tempo).
+    """
+    saida = saida or sys.stdout
+    saida_erros = saida_erros or sys.stderr
+    inicio = time.perf_counter()
+    vazias = []
+    arquivos = expandir_entradas(entradas, vazias)
+    tarefas = [(arquivo, formato) for arquivo in arquivos]
+
+    relatorio = {"arquivos": len(arquivos) + len(vazias), "falhas": 0, "instrucoes": 0, "erros": 0, "arquivos_com_erro": 0}
+    def registrar(resultado, cabecalho):
+        saida.write(f"==> {cabecalho} <==\n{resultado['saida']}")
+        for mensagem in resultado["erros"]:
+            saida_erros.write(f"{resultado['arquivo']}: {mensagem}\n")
+        if resultado["falha"]:
+            saida_erros.write(f"{resultado['arquivo']}: FALHA: {resultado['falha']}\n")
+            relatorio["falhas"] += 1
+        relatorio["instrucoes"] += resultado["instrucoes"]
+        relatorio["erros"] += len(resultado["erros"])
+        relatorio["arquivos_com_erro"] += bool(resultado["erros"])
+
+    # Um diretório ou padrão sem nenhum arquivo falha como um arquivo que não existe
+    for entrada in vazias:
+        registrar({"arquivo": entrada, "instrucoes": 0, "saida": "", "erros": [], "falha": "nenhum arquivo .cic encontrado."}, entrada)
+
+    global _preludio
+    executor = None
+    try:
+        if preludio is not None:
+            resultado = _carregar_preludio(preludio, formato)
+            registrar(resultado, f"{preludio} (prelúdio)")
+            if resultado["falha"]:
+                tarefas = []
+        if workers == 1 or len(tarefas) <= 1:
+            resultados = map(_analisar_arquivo_formato, tarefas)
+        else:
+            executor = ProcessPoolExecutor(max_workers=workers, **_opcoes_pool(preludio))
+            lote = max(1, len(tarefas) // ((workers or os.cpu_count() or 1) * 4))
+            resultados = executor.map(_analisar_arquivo_formato, tarefas, chunksize=lote)
+        for resultado in resultados:
+            registrar(resultado, resultado["arquivo"])
+    finally:
+        _preludio = None
+        if executor is not None:
+            executor.shutdown()
+
+    relatorio["tempo"] = time.perf_counter() - inicio
+    saida.write(formatar_relatorio(relatorio))
+    saida.flush()
+    return relatorio
+
+def formatar_relatorio(relatorio):
+    """
+    Formata o relatório agregado de um lote.
+
+    Args:
+        relatorio (dict): O relatório retornado por executar_lote.
+
+    Returns:
+        str: O relatório em texto.
+    """
+    tempo = relatorio["tempo"]
+    linha_separadora = "=" * 50
+    return (
+        f"{linha_separadora}\n"
+        f"Arquivos:          {relatorio['arquivos']} ({relatorio['falhas']} com falha)\n"
+        f"Instruções:        {relatorio['instrucoes']}\n"
+        f"Erros semânticos:  {relatorio['erros']} (em {relatorio['arquivos_com_erro']} arquivos)\n"
+        f"Tempo:             {tempo:.3f} s\n"
+        f"Vazão:             {relatorio['instrucoes'] / tempo if tempo else 0:,.0f} instruções/s, "
+        f"{relatorio['arquivos'] / tempo if tempo else 0:,.1f} arquivos/s\n"
+        f"{linha_separadora}\n"
+    )
@@ -1,16 +1,59 @@
-import logging
 import sys
-import argparse
+import time
+from array import array
+from programa_compacto import ProgramaCompacto, OPCODES, INVALIDA, operandos
+from inferencia import ProgramaInferido, NOMES_OPCODES_ESPECIALIZADOS, inferir_tipos
+import lexico
+import rastreamento
+from rastreamento import Rastreador
+from saida import Saida, SaidaTexto, FORMATOS
 
 class Simbolo:
+    __slots__ = ("lexema", "tipo", "valor")
+
     def __init__(self, lexema, tipo, valor=None):
         self.lexema = lexema
         self.tipo = tipo
         self.valor = valor
 
+# Marcas do valor guardado em cada linha de uma TabelaSimbolos
+_SEM_VALOR, _INTEIRO, _REAL, _OBJETO = range(4)
+# Maior inteiro (em valor absoluto) representado exatamente por um double
+_MAIOR_INTEIRO_EXATO = 2 ** 53
+# Nomes dos tipos, indexados pelo código de uma linha; novos tipos são acrescentados sob demanda
+_NOMES_TIPOS = ["NUMERO", "CADEIA"]
+_CODIGOS_TIPOS = {nome: codigo for codigo, nome in enumerate(_NOMES_TIPOS)}
+# Copiar um array vazio é mais rápido que construir um novo, e há uma tabela por bloco
+_NUMEROS_VAZIO = array('d')
+
+def _codigo_tipo(tipo):
+    codigo = _CODIGOS_TIPOS.get(tipo)
+    if codigo is None:
+        codigo = _CODIGOS_TIPOS[tipo] = len(_NOMES_TIPOS)
+        _NOMES_TIPOS.append(tipo)
+    return codigo
+
 class TabelaSimbolos:
+    """
+    Tabela de símbolos de um escopo, guardada em colunas.
+
+    Cada símbolo ocupa uma linha: o lexema aponta para a linha em `_linhas` e as colunas
+    guardam o código do tipo (um byte), a marca do valor (um byte) e o valor. Números
+    ficam em um array('d') — inteiros até 2**53 são guardados nele e convertidos de volta
+    na leitura — e apenas cadeias e inteiros maiores ocupam a coluna de objetos. Assim,
+    um símbolo não custa um objeto Simbolo com seu próprio dicionário nem um objeto por valor.
+    """
+    __slots__ = ("_linhas", "_tipos", "_marcas", "_numeros", "_objetos")
+
     def __init__(self):
-        self.simbolos = {}
+        self._linhas:dict[str, int] = {}
+        self._tipos = bytearray()
+        self._marcas = bytearray()
+        self._numeros = _NUMEROS_VAZIO[:]
+        self._objetos:list = []
+
+    def __len__(self):
+        return len(self._linhas)
 
     def adicionar_simbolo(self, simbolo):
         """
@@ -19,8 +62,41 @@ class TabelaSimbolos:
         Args:
             simbolo: O símbolo a ser adicionado.
         """
-        if simbolo.lexema not in self.simbolos:
-            self.simbolos[simbolo.lexema] = simbolo
+        self.adicionar(simbolo.lexema, simbolo.tipo, simbolo.valor)
+
+    def adicionar(self, lexema, tipo, valor=None):
+        """
+        Adiciona um símbolo à tabela a partir dos seus campos, sem criar um Simbolo.
+
+        Args:
+            lexema: O lexema do símbolo.
+            tipo: O tipo do símbolo.
+            valor: O valor inicial do símbolo.
+        """
+        linhas = self._linhas
+        if lexema in linhas:
+            return
+        linhas[lexema] = len(linhas)
+        codigo = _CODIGOS_TIPOS.get(tipo)
+        self._tipos.append(_codigo_tipo(tipo) if codigo is None else codigo)
+        # Mesma codificação de atualizar_valor, repetida para não custar uma chamada a mais por símbolo
+        tipo_valor = type(valor)
+        if tipo_valor is float or tipo_valor is int and -_MAIOR_INTEIRO_EXATO <= valor <= _MAIOR_INTEIRO_EXATO:
+            self._marcas.append(_REAL if tipo_valor is float else _INTEIRO)
+            self._numeros.append(valor)
+            self._objetos.append(None)
+        else:
+            self._marcas.append(_SEM_VALOR if valor is None else _OBJETO)
+            self._numeros.append(0.0)
+            self._objetos.append(valor)
+
+    def _ler_valor(self, linha):
+        marca = self._marcas[linha]
+        if marca == _REAL:
+            return self._numeros[linha]
+        if marca == _INTEIRO:
+            return int(self._numeros[linha])
+        return self._objetos[linha]
 
     def obter_tipo(self, lexema):
         """
@@ -32,10 +108,32 @@ class TabelaSimbolos:
         Returns:
             O tipo do símbolo, ou None se o símbolo não estiver na tabela.
         """
-        if lexema in self.simbolos:
-            return self.simbolos[lexema].tipo
+        linha = self._linhas.get(lexema)
+        if linha is not None:
+            return _NOMES_TIPOS[self._tipos[linha]]
         return None
 
+    def obter_valor(self, lexema):
+        """
+        Obtém o valor de um símbolo na tabela de símbolos.
+
+        Args:
+            lexema: O lexema do símbolo.
+
+        Returns:
+            O valor do símbolo, ou None se ele não tiver valor ou não estiver na tabela.
+        """
+        linha = self._linhas.get(lexema)
+        if linha is None:
+            return None
+        # Mesma decodificação de _ler_valor, repetida aqui por ser o caminho mais usado
+        marca = self._marcas[linha]
+        if marca == _REAL:
+            return self._numeros[linha]
+        if marca == _INTEIRO:
+            return int(self._numeros[linha])
+        return self._objetos[linha]
+
     def atualizar_valor(self, lexema, novo_valor):
         """
         Atualiza o valor de um símbolo na tabela de símbolos.
@@ -44,8 +142,17 @@ class TabelaSimbolos:
             lexema: O lexema do símbolo.
             novo_valor: O novo valor do símbolo.
         """
-        if lexema in self.simbolos:
-            self.simbolos[lexema].valor = novo_valor
+        linha = self._linhas.get(lexema)
+        if linha is None:
+            return
+        tipo_valor = type(novo_valor)
+        if tipo_valor is float or tipo_valor is int and -_MAIOR_INTEIRO_EXATO <= novo_valor <= _MAIOR_INTEIRO_EXATO:
+            self._marcas[linha] = _REAL if tipo_valor is float else _INTEIRO
+            self._numeros[linha] = novo_valor
+            self._objetos[linha] = None
+        else:
+            self._marcas[linha] = _SEM_VALOR if novo_valor is None else _OBJETO
+            self._objetos[linha] = novo_valor
     
     def tem_simbolo(self, lexema):
         """
@@ -57,7 +164,7 @@ class TabelaSimbolos:
         Returns:
             True se o símbolo estiver presente, False caso contrário.
         """
-        return lexema in self.simbolos
+        return lexema in self._linhas
     
     def substituir_simbolo(self, lexema, tipo, valor):
         """
@@ -68,23 +175,135 @@ class TabelaSimbolos:
             tipo: O tipo do símbolo.
             valor: O valor do símbolo.
         """
-        self.simbolos[lexema] = Simbolo(lexema, tipo, valor)
+        linha = self._linhas.get(lexema)
+        if linha is None:
+            self.adicionar(lexema, tipo, valor)
+        else:
+            self._tipos[linha] = _codigo_tipo(tipo)
+            self.atualizar_valor(lexema, valor)
+
+    def itens(self):
+        """
+        Percorre os símbolos da tabela na ordem em que foram adicionados.
+
+        Yields:
+            tuple: (lexema, tipo, valor) de cada símbolo.
+        """
+        for lexema, linha in self._linhas.items():
+            yield lexema, _NOMES_TIPOS[self._tipos[linha]], self._ler_valor(linha)
+
+    @property
+    def simbolos(self):
+        """
+        Os símbolos da tabela como um dicionário de Simbolo, criado a cada acesso.
+
+        Alterações nesse dicionário ou nos seus símbolos não afetam a tabela; use os métodos dela.
+        """
+        return {lexema: Simbolo(lexema, tipo, valor) for lexema, tipo, valor in self.itens()}
 
 class AnalisadorSemantico:
-    def __init__(self):
+    def __init__(self, rastreador:Rastreador=None, saida:Saida=None):
+        self.rastreador = rastreador if rastreador is not None else Rastreador.do_logging()
+        self.saida = saida if saida is not None else SaidaTexto()
         self.nome_blocos = []
         self.pilha_escopo:list[TabelaSimbolos] = []
         self.tipos_validos = {'NUMERO': (int, float), 'CADEIA': str}
+        # Índice de resolução de nomes: para cada lexema, a pilha de posições (em pilha_escopo)
+        # das tabelas que o declaram, da mais externa para a mais interna.
+        self._vinculos:dict[str, list[int]] = {}
+        # Registro de desfazer: para cada escopo aberto, os lexemas vinculados nele.
+        self._desfazer:list[list[str]] = []
+        # Tabela de despacho indexada pelo código de operação (ver programa_compacto)
+        self._despacho = (
+            self._executar_bloco,
+            self._executar_fim,
+            self._executar_print,
+            self._executar_atribuicao,
+            self._executar_declaracao,
+            self._executar_invalida,
+            # Atribuições especializadas pela passagem de inferência (ver inferencia.py)
+            self._executar_atribuicao_tratada,
+            self._executar_declaracao_provada,
+            self._executar_atualizacao_provada,
+            self._executar_copia_declaracao_provada,
+            self._executar_copia_atualizacao_provada,
+        )
         
-    def executar_instrucoes(self, instrucoes):
+    def executar_instrucoes(self, instrucoes, perfilador=None):
         """
         Executa uma lista de instruções.
 
         Args:
-            instrucoes (list[dict]): A lista de instruções a ser executada.
+            instrucoes (Iterable[dict]): As instruções a serem executadas. Pode ser um gerador,
+                caso em que cada instrução é executada assim que é produzida.
+            perfilador (perfil.Perfilador, optional): Se informado, recebe o tempo de cada instrução.
         """
+        if perfilador is not None:
+            relogio = time.perf_counter_ns
+            for instrucao in instrucoes:
+                inicio = relogio()
+                self._executar_instrucao(instrucao)
+                perfilador.registrar_instrucao(instrucao["instrucao"], relogio() - inicio)
+            return
         for instrucao in instrucoes:
             self._executar_instrucao(instrucao)
+
+    def executar_programa(self, programa:ProgramaCompacto|ProgramaInferido, perfilador=None):
+        """
+        Executa um programa na representação compacta.
+
+        Args:
+            programa (ProgramaCompacto or ProgramaInferido): O programa a ser executado. Se ele passou
+                pela inferência de tipos, os literais já vêm convertidos e as atribuições provadas
+                não verificam o tipo do valor.
+            perfilador (perfil.Perfilador, optional): Se informado, recebe o tempo de cada instrução.
+        """
+        if perfilador is None:
+            return self.executar_trecho(programa)
+        if not isinstance(programa, ProgramaInferido):
+            return self.executar_instrucoes(programa, perfilador)
+        # As instruções especializadas só existem nesta representação, e são cronometradas aqui
+        opcodes, valores = programa.opcodes, programa.valores
+        programa = programa.programa
+        lexemas = programa.lexemas
+        despacho = self._despacho
+        rastreador = self.rastreador
+        relogio = time.perf_counter_ns
+        for opcode, operando, tipo, valor in zip(opcodes, programa.operandos, programa.tipos, programa.valores):
+            operando, tipo = lexemas[operando], lexemas[tipo]
+            nome = NOMES_OPCODES_ESPECIALIZADOS[opcode]
+            if rastreador.instrucao:
+                rastreador.emitir(rastreamento.INSTRUCAO, nome, (operando, tipo, lexemas[valor]), self._bloco_atual())
+            inicio = relogio()
+            despacho[opcode](operando, tipo, valores[valor])
+            perfilador.registrar_instrucao(nome, relogio() - inicio)
+
+    def executar_trecho(self, programa:ProgramaCompacto|ProgramaInferido, inicio=0, fim=None):
+        """
+        Executa as instruções de um trecho de um programa na representação compacta.
+
+        Args:
+            programa (ProgramaCompacto or ProgramaInferido): O programa (ver executar_programa).
+            inicio (int, optional): O índice da primeira instrução executada.
+            fim (int, optional): O índice logo após a última instrução executada. Padrão: o fim do programa.
+        """
+        if isinstance(programa, ProgramaInferido):
+            opcodes, valores = programa.opcodes, programa.valores
+            programa = programa.programa
+        else:
+            opcodes, valores = programa.opcodes, programa.lexemas
+        lexemas = programa.lexemas
+        despacho = self._despacho
+        rastreador = self.rastreador
+        colunas = (opcodes, programa.operandos, programa.tipos, programa.valores)
+        if inicio or fim is not None:
+            colunas = [coluna[inicio:fim] for coluna in colunas]
+        for opcode, operando, tipo, valor in zip(*colunas):
+            operando, tipo = lexemas[operando], lexemas[tipo]
+            if rastreador.instrucao:
+                # O evento mostra o valor como escrito no código, e não o literal já convertido
+                rastreador.emitir(rastreamento.INSTRUCAO, NOMES_OPCODES_ESPECIALIZADOS[opcode], (operando, tipo, lexemas[valor]), self._bloco_atual())
+            despacho[opcode](operando, tipo, valores[valor])
         
     def _executar_instrucao(self, instrucao):
         """
@@ -93,43 +312,130 @@ class AnalisadorSemantico:
         Args:
             instrucao (dict): A instrução a ser executada.
         """
-        instrucao_formatada = f"{instrucao['instrucao']}: " + ', '.join(f"{value}" for key, value in instrucao.items() if key != "instrucao" and value)
-        if instrucao_formatada.startswith("PRINT"):
-            instrucao_formatada = f"{instrucao_formatada} no bloco {self.nome_blocos[-1]}"
-        logging.warning(f"\033[95mExecutando instrução: {instrucao_formatada}\033[0m")
-        if instrucao["instrucao"] == "BLOCO":
-            self.abrir_escopo(instrucao["nome_bloco"])
-        elif instrucao["instrucao"] == "FIM":
-            self.fechar_escopo(instrucao["nome_bloco"])
-        elif instrucao["instrucao"] == "PRINT":
-            self.processar_print(instrucao["lexema"])
-        elif instrucao["instrucao"] == "ATRIBUICAO":
-            self.adicionar_variavel(instrucao["lexema"], instrucao["tipo_declarado"], instrucao["valor"])
-        elif instrucao["instrucao"] == "DECLARACAO":
-            self.adicionar_variavel(instrucao["lexema"], instrucao["tipo"])
-        else:
-            logging.error(f"\033[91mERRO: Instrução inválida.\033[0m")
+        argumentos = operandos(instrucao)
+        if self.rastreador.instrucao:
+            self.rastreador.emitir(rastreamento.INSTRUCAO, instrucao["instrucao"], argumentos, self._bloco_atual())
+        self._despacho[OPCODES.get(instrucao["instrucao"], INVALIDA)](*argumentos)
+
+    def _bloco_atual(self):
+        """
+        Obtém o nome do bloco atual, ou uma string vazia fora de qualquer bloco.
+        """
+        return self.nome_blocos[-1] if self.nome_blocos else ""
+
+    def _erro(self, codigo, lexema=None):
+        """
+        Emite um erro semântico.
+
+        Args:
+            codigo (str): O código do erro (ver rastreamento.MENSAGENS_ERRO).
+            lexema (str, optional): O lexema envolvido no erro.
+        """
+        if self.rastreador.erro:
+            self.rastreador.emitir(rastreamento.ERRO, codigo, lexema)
+
+    def _executar_bloco(self, nome_bloco, tipo, valor):
+        self.abrir_escopo(nome_bloco)
+
+    def _executar_fim(self, nome_bloco, tipo, valor):
+        self.fechar_escopo(nome_bloco)
+
+    def _executar_print(self, lexema, tipo, valor):
+        self.processar_print(lexema)
+
+    def _executar_atribuicao(self, lexema, tipo, valor):
+        self.adicionar_variavel(lexema, tipo, valor)
+
+    def _executar_declaracao(self, lexema, tipo, valor):
+        self.adicionar_variavel(lexema, tipo)
+
+    def _executar_invalida(self, operando, tipo, valor):
+        self._erro("instrucao_invalida")
+
+    def _executar_atribuicao_tratada(self, lexema, tipo, valor):
+        self._adicionar_valor_tratado(self.pilha_escopo[-1], lexema, tipo, valor)
+
+    def _executar_declaracao_provada(self, lexema, tipo, valor):
+        # A inferência provou que o lexema não existe no escopo atual e que o valor tem o tipo
+        # certo; com os eventos da declaração habilitados, segue o caminho comum para emiti-los
+        rastreador = self.rastreador
+        if rastreador.verificacao or rastreador.declaracao:
+            self._adicionar_valor_tratado(self.pilha_escopo[-1], lexema, tipo, valor, True)
+            return
+        if tipo is None:
+            tipo = "CADEIA" if isinstance(valor, str) else "NUMERO"
+        self.pilha_escopo[-1].adicionar(lexema, tipo, valor)
+        self._vincular(lexema)
+
+    def _executar_atualizacao_provada(self, lexema, tipo, valor):
+        # A inferência provou que o lexema está declarado e que o valor tem o tipo dele
+        rastreador = self.rastreador
+        if rastreador.verificacao or rastreador.atribuicao:
+            self._adicionar_valor_tratado(self.pilha_escopo[-1], lexema, tipo, valor, True)
+            return
+        # Pelo _resolver, que as subclasses usam para saber quais tabelas foram acessadas (ver AnalisadorMemoriaLimitada)
+        self.pilha_escopo[self._resolver(lexema)].atualizar_valor(lexema, valor)
+
+    def _executar_copia_declaracao_provada(self, lexema, tipo, valor):
+        self._executar_declaracao_provada(lexema, tipo, self.obter_valor(valor))
+
+    def _executar_copia_atualizacao_provada(self, lexema, tipo, valor):
+        self._executar_atualizacao_provada(lexema, tipo, self.obter_valor(valor))
 
     def abrir_escopo(self, nome_bloco=""):
         """
         Abre um novo escopo adicionando uma nova tabela de símbolos à pilha de escopos.
         """
-        logging.debug(f"Abrindo bloco: {nome_bloco}")
+        if self.rastreador.escopo_aberto:
+            self.rastreador.emitir(rastreamento.ESCOPO_ABERTO, nome_bloco)
         self.nome_blocos.append(nome_bloco)
         nova_tabela = TabelaSimbolos()
         self.pilha_escopo.append(nova_tabela)
+        self._desfazer.append([])
 
     def fechar_escopo(self, nome_bloco=""):
         """
         Remove o escopo atual da pilha de escopos, caso haja mais de um escopo na pilha.
         """
-        if logging.getLogger().isEnabledFor(logging.DEBUG):
+        if self.rastreador.tabela:
             self._imprimir_tabela_simbolos()
         
-        logging.debug(f"Fechando bloco: {nome_bloco}")
+        if self.rastreador.escopo_fechado:
+            self.rastreador.emitir(rastreamento.ESCOPO_FECHADO, nome_bloco)
         self.nome_blocos.pop()
         if len(self.pilha_escopo) > 1:
             self.pilha_escopo.pop()
+            for lexema in self._desfazer.pop():
+                profundidades = self._vinculos[lexema]
+                profundidades.pop()
+                if not profundidades:
+                    del self._vinculos[lexema]
+
+    def _vincular(self, lexema):
+        """
+        Registra no índice de resolução que o lexema foi declarado no escopo atual.
+
+        Args:
+            lexema (str): O lexema declarado.
+        """
+        profundidade = len(self.pilha_escopo) - 1
+        profundidades = self._vinculos.setdefault(lexema, [])
+        if not profundidades or profundidades[-1] != profundidade:
+            profundidades.append(profundidade)
+            self._desfazer[-1].append(lexema)
+
+    def _resolver(self, lexema):
+        """
+        Resolve um lexema para a tabela mais interna que o declara, em tempo constante.
+
+        Args:
+            lexema (str): O lexema a ser resolvido.
+
+        Returns:
+            int or None: A posição da tabela em pilha_escopo, ou None se o lexema não estiver declarado.
+        """
+        profundidades = self._vinculos.get(lexema)
+        return profundidades[-1] if profundidades else None
 
     
     def adicionar_variavel(self, lexema, tipo, valor=None):
@@ -149,21 +455,36 @@ class AnalisadorSemantico:
         # Tratar valor apenas se estiver presente
         if valor:                 
             valor = self._tratar_valor(valor)
-        
+        return self._adicionar_valor_tratado(escopo_atual, lexema, tipo, valor)
+
+    def _adicionar_valor_tratado(self, escopo_atual, lexema, tipo, valor, verificado=False):
+        """
+        Continua adicionar_variavel a partir do valor já tratado.
+
+        Args:
+            escopo_atual (TabelaSimbolos): A tabela do escopo atual.
+            lexema (str): O nome da variável.
+            tipo (str): O tipo da variável.
+            valor (any): O valor já tratado.
+            verificado (bool, optional): Se True, o tipo do valor já foi provado pela inferência e não é verificado.
+
+        Returns:
+            bool: True se a variável foi adicionada com sucesso, False caso contrário.
+        """
         # Se o tipo não foi especificado, verifica se a variável já foi declarada e atualiza o valor
         # See não foi declarada, verifica o tipo do valor e adiciona a variável
         if tipo is None:
             declaracao_status = self.verificar_declaracao(lexema) # Verifica se a variável já foi declarada
             if declaracao_status in {1, -1}: 
-                return self.atualizar_valor(lexema, valor) # Atualiza o valor se a variavel já foi declarada
+                return self.atualizar_valor(lexema, valor, verificado) # Atualiza o valor se a variavel já foi declarada
             else:
                 tipo = "CADEIA" if isinstance(valor, str) else "NUMERO" 
         
         if escopo_atual.tem_simbolo(lexema):
-            logging.error(f"\033[91mERRO SEMÂNTICO: Variável '{lexema}' já declarada neste escopo.\033[0m") 
+            self._erro("redeclaracao", lexema)
             return False
 
-        return self._adicionar_variavel_escopo(escopo_atual, lexema, tipo, valor)
+        return self._adicionar_variavel_escopo(escopo_atual, lexema, tipo, valor, verificado)
         
     def _tratar_valor(self, valor):
         """ 
@@ -182,7 +503,7 @@ class AnalisadorSemantico:
                     self.obter_valor(valor)
                 )  
         
-    def _adicionar_variavel_escopo(self, escopo, lexema, tipo, valor):
+    def _adicionar_variavel_escopo(self, escopo, lexema, tipo, valor, verificado=False):
         """
         Adiciona uma variável ao escopo especificado.
 
@@ -191,18 +512,21 @@ class AnalisadorSemantico:
             lexema (str): O nome da variável.
             tipo (str): O tipo da variável.
             valor (any, optional): O valor inicial da variável. Defaults to None.
+            verificado (bool, optional): Se True, o tipo do valor já foi provado e não é verificado.
 
         Returns:
             bool: True se a variável foi adicionada com sucesso, False caso contrário.
         """
-        logging.debug(f"Adicionando variável '{lexema}' ao escopo atual com tipo '{tipo}' e valor '{valor}'")
+        if self.rastreador.declaracao:
+            self.rastreador.emitir(rastreamento.DECLARACAO, lexema, tipo, valor)
      
-        if tipo in self.tipos_validos and (valor is None or isinstance(valor, self.tipos_validos[tipo])):
-            simbolo = Simbolo(lexema, tipo, valor)
-            escopo.adicionar_simbolo(simbolo)
+        if verificado or tipo in self.tipos_validos and (valor is None or isinstance(valor, self.tipos_validos[tipo])):
+            escopo.adicionar(lexema, tipo, valor)
+            if escopo is self.pilha_escopo[-1]:
+                self._vincular(lexema)
             return True
         else:
-            logging.error(f"\033[91mERRO SEMÂNTICO: Tentativa de atribuir um valor inválido à variável '{lexema}'.\033[0m")
+            self._erro("valor_invalido", lexema)
             return False
 
     def verificar_tipo(self, lexema):
@@ -215,17 +539,12 @@ class AnalisadorSemantico:
         Returns:
             str or None: O tipo do lexema, se encontrado. Caso contrário, retorna None.
         """
-        escopo_atual = self.pilha_escopo[-1]
-        tipo = escopo_atual.obter_tipo(lexema)
-        logging.info(f"\033[90mVerificando tipo do símbolo '{lexema}' no escopo atual\033[0m")
-        if tipo:
-            return tipo
-
-        logging.info(f"\033[90mVerificando tipo do símbolo '{lexema}' em escopos anteriores\033[0m")
-        for tabela in self.pilha_escopo[-2::-1]:
-            tipo = tabela.obter_tipo(lexema)
-            if tipo:
-                return tipo
+        posicao = self._resolver(lexema)
+        if self.rastreador.consulta:
+            topo = len(self.pilha_escopo) - 1
+            self.rastreador.emitir(rastreamento.CONSULTA, "tipo", lexema, posicao == topo, None if posicao is None else topo - posicao)
+        if posicao is not None:
+            return self.pilha_escopo[posicao].obter_tipo(lexema)
     
     def verificar_declaracao(self, lexema):
         """
@@ -237,58 +556,60 @@ class AnalisadorSemantico:
         Returns:
             int: 1 se o lexema está declarado no escopo atual, -1 se está declarado em escopos anteriores, 0 caso não esteja declarado.
         """
-        logging.debug(f"\033[90mVerificando declaração do símbolo '{lexema}' no escopo atual\033[0m")
-        escopo_atual = self.pilha_escopo[-1]
-        if escopo_atual.tem_simbolo(lexema):
+        posicao = self._resolver(lexema)
+        topo = len(self.pilha_escopo) - 1
+        if self.rastreador.verificacao:
+            self.rastreador.emitir(rastreamento.VERIFICACAO, lexema, posicao == topo, None if posicao is None else topo - posicao)
+        if posicao == topo:
             return 1
         
-        logging.debug(f"\033[90mVerificando declaração do símbolo '{lexema}' em escopos anteriores\033[0m")
-        if any(tabela.tem_simbolo(lexema) for tabela in self.pilha_escopo[-2::-1]):
+        if posicao is not None:
             return -1
         
         return 0
 
-    def atualizar_valor(self, lexema, novo_valor):
+    def atualizar_valor(self, lexema, novo_valor, verificado=False):
         """
         Atualiza o valor de um símbolo no escopo atual ou em escopos anteriores.
 
         Args:
             lexema (str): O lexema do símbolo a ser atualizado.
             novo_valor: O novo valor a ser atribuído ao símbolo.
+            verificado (bool, optional): Se True, o tipo do valor já foi provado e não é verificado.
 
         Returns:
             bool: True se o valor foi atualizado com sucesso, False caso contrário.
 
         """
-        escopo_atual = self.pilha_escopo[-1]
+        posicao = self._resolver(lexema)
+        if posicao is None:
+            return False
 
-        if lexema in escopo_atual.simbolos:
-            logging.debug(f"Atualizando valor do símbolo '{lexema}' no escopo atual")
-            return self._atualizar_valor_simbolo(escopo_atual.simbolos[lexema], novo_valor)
-                
-        for tabela in self.pilha_escopo[-2::-1]:
-            if lexema in tabela.simbolos:
-                logging.debug(f"Atualizando valor do símbolo '{lexema}' em escopos anteriores")
-                return self._atualizar_valor_simbolo(tabela.simbolos[lexema], novo_valor)
-        return False
+        if self.rastreador.atribuicao:
+            self.rastreador.emitir(rastreamento.ATRIBUICAO, lexema, novo_valor, posicao == len(self.pilha_escopo) - 1)
+        escopo = self.pilha_escopo[posicao]
+        if verificado:
+            escopo.atualizar_valor(lexema, novo_valor)
+            return True
+        return self._atualizar_valor_simbolo(escopo, lexema, novo_valor)
     
-    def _atualizar_valor_simbolo(self, simbolo, novo_valor):
+    def _atualizar_valor_simbolo(self, escopo, lexema, novo_valor):
         """
         Atualiza o valor de um símbolo no escopo.
 
         Args:
-            simbolo (objeto): O símbolo a ser atualizado.
+            escopo (TabelaSimbolos): A tabela que contém o símbolo.
+            lexema (str): O lexema do símbolo a ser atualizado.
             novo_valor (objeto): O novo valor a ser atribuído ao símbolo.
             
         Returns:
             bool: True se o valor foi atualizado com sucesso, False caso contrário.
         """
-        logging.debug(f"Atualizando valor do símbolo '{simbolo.lexema}' para '{novo_valor}'")
-        if isinstance(novo_valor, self.tipos_validos[simbolo.tipo]):
-            simbolo.valor = novo_valor
+        if isinstance(novo_valor, self.tipos_validos[escopo.obter_tipo(lexema)]):
+            escopo.atualizar_valor(lexema, novo_valor)
             return True
         else:
-            logging.error(f"\033[91mERRO SEMÂNTICO: Tentativa de modificar o tipo da variável '{simbolo.lexema}'.\033[0m")
+            self._erro("modificacao_tipo", lexema)
             return False
 
     def processar_print(self, lexema):
@@ -300,17 +621,13 @@ class AnalisadorSemantico:
         """
         tipo = self.verificar_tipo(lexema)
         
-        logging.info(f"\033[90mProcessando instrução de impressão: {lexema} no bloco {self.nome_blocos[-1]}\033[0m")
+        if self.rastreador.print:
+            self.rastreador.emitir(rastreamento.PRINT, lexema, self._bloco_atual())
         if tipo:
             valor = self.obter_valor(lexema)
-            linha_separadora = "-" * 50
-            print(linha_separadora)
-            print(f"\033[92mPRINT <{lexema}>:\033[0m")
-            print(f"   \033[94mTipo:\033[0m  {tipo}")
-            print(f"   \033[94mValor:\033[0m {valor}")
-            print(linha_separadora)
+            self.saida.escrever(lexema, tipo, valor, self._bloco_atual())
         else:
-            logging.error(f"\033[91mERRO SEMÂNTICO: Variável '{lexema}' não declarada.\033[0m")
+            self._erro("nao_declarada", lexema)
 
     def obter_valor(self, lexema):
         """
@@ -322,29 +639,52 @@ class AnalisadorSemantico:
         Returns:
             O valor do símbolo, se encontrado. Caso contrário, retorna None.
         """
-        escopo_atual = self.pilha_escopo[-1]
-        logging.info(f"\033[90mObtendo valor do símbolo '{lexema}' no escopo atual\033[0m")
-        if escopo_atual.tem_simbolo(lexema) and escopo_atual.simbolos[lexema].valor is not None:
-            return escopo_atual.simbolos[lexema].valor
-        else:
-            logging.info(f"\033[90mObtendo valor do símbolo '{lexema}' em escopos anteriores\033[0m")
-            for tabela in self.pilha_escopo[-2::-1]:
-                if tabela.tem_simbolo(lexema) and tabela.simbolos[lexema].valor is not None:
-                    return tabela.simbolos[lexema].valor
-        return None
+        profundidades = self._vinculos.get(lexema, ())
+        valor = posicao = None
+        # Percorre apenas as declarações sombreadas deste lexema, e não a pilha inteira
+        for i in range(len(profundidades) - 1, -1, -1):
+            valor = self.pilha_escopo[profundidades[i]].obter_valor(lexema)
+            if valor is not None:
+                posicao = profundidades[i]
+                break
+        if self.rastreador.consulta:
+            topo = len(self.pilha_escopo) - 1
+            self.rastreador.emitir(rastreamento.CONSULTA, "valor", lexema, posicao == topo, None if posicao is None else topo - posicao)
+        return valor
 
     def _imprimir_tabela_simbolos(self):
         """
         Imprime a tabela de símbolos do bloco atual no log.
         """
-        logging.info(f"\033[90mImprimindo tabela de símbolos do bloco que está sendo fechado\033[0m")
-        for chave, simbolo in self.pilha_escopo[-1].simbolos.items():
-            logging.info(f"\033[90mLexema: {simbolo.lexema}, Tipo: {simbolo.tipo}, Valor: {simbolo.valor}\033[0m")
+        simbolos = tuple(self.pilha_escopo[-1].itens())
+        self.rastreador.emitir(rastreamento.TABELA, self._bloco_atual(), simbolos)
     
 class ProcessadorSemantico:
-    def __init__(self):
+    def __init__(self, rastreador:Rastreador=None, posicoes=False):
+        self.rastreador = rastreador if rastreador is not None else Rastreador.do_logging()
         self.tipos_validos = {'NUMERO': (int, float), 'CADEIA': str}
+        # Com posicoes, cada instrução recebe as chaves "linha" e "coluna" (a partir de 1) do seu lexema
+        self.posicoes = posicoes
+        # Número da linha em processamento e tamanho do seu recuo (este só é mantido com posicoes)
+        self.numero_linha = 0
+        self.recuo = 0
     
+    def compilar_arquivo(self, nome_arquivo):
+        """
+        Processa o código de um arquivo diretamente para a representação compacta.
+
+        Args:
+            nome_arquivo (str): O nome do arquivo a ser processado.
+
+        Returns:
+            ProgramaCompacto: O programa compactado.
+        """
+        with open(nome_arquivo, 'r', encoding='utf-8') as arquivo:
+            programa = ProgramaCompacto.de_instrucoes(self.gerar_instrucoes(arquivo))
+        if programa and self.rastreador.processado:
+            self.rastreador.emitir(rastreamento.PROCESSADO, len(programa))
+        return programa
+
     def processar_codigo_arquivo(self, nome_arquivo):
         """
         Processa o código de um arquivo.
@@ -352,124 +692,192 @@ class ProcessadorSemantico:
         Args:
             nome_arquivo (str): O nome do arquivo a ser processado.
         """
-        instrucoes:list[dict] = []
         with open(nome_arquivo, 'r', encoding='utf-8') as arquivo:
-            for linha in arquivo:
-                if linha.strip():
-                    instrucao = self.processar_linha(linha)
-                    if isinstance(instrucao, dict):
-                        instrucoes.append(instrucao)
-                    elif isinstance(instrucao, list):
-                        instrucoes.extend(instrucao)
-        if instrucoes:
-            logging.warning(f"\033[92mInstruções processadas com sucesso\033[0m")
+            instrucoes:list[dict] = list(self.gerar_instrucoes(arquivo))
+        if instrucoes and self.rastreador.processado:
+            self.rastreador.emitir(rastreamento.PROCESSADO, len(instrucoes))
         return instrucoes
+
+    def gerar_instrucoes(self, linhas):
+        """
+        Gera as instruções de uma sequência de linhas à medida que são processadas, sem acumulá-las.
+
+        Args:
+            linhas (Iterable[str]): As linhas de código (por exemplo, um arquivo aberto).
+
+        Yields:
+            dict: Cada instrução processada, na ordem do código.
+        """
+        for numero_linha, linha in enumerate(linhas, 1):
+            self.numero_linha = numero_linha
+            instrucao = self.processar_linha(linha)
+            if isinstance(instrucao, dict):
+                yield instrucao
+            elif isinstance(instrucao, list):
+                yield from instrucao
     
     def processar_linha(self, linha):
         """
         Processa uma linha do código.
 
+        A linha é lida pelo analisador léxico (lexico.INSTRUCAO) em uma única varredura e
+        o casamento, com os tokens e suas posições, é entregue ao processamento da instrução
+        correspondente. Linhas em branco são ignoradas.
+
         Args:
             linha (str): A linha de código a ser processada.
+
+        Returns:
+            dict or list[dict] or None: A instrução ou as instruções da linha.
         """
-        logging.warning(f"\033[95mProcessando linha: {linha.strip()}\033[0m")
-        
-        linha = linha.strip()
-
-        if linha.startswith("BLOCO"):
-            return self.processar_bloco(linha)
-        elif linha.startswith("FIM"):
-            return self.processar_fim(linha)
-        elif linha.startswith("PRINT"):
-            return self.processar_print(linha)
-        elif "=" in linha:
-            return self.processar_atribuicao(linha)
-        elif linha.startswith(tuple(self.tipos_validos.keys())):
-            return self.processar_declaracao(linha)
-            
-    def processar_bloco(self, linha):
+        texto = linha.lstrip()
+        if not texto:
+            return None
+        if self.rastreador.linha:
+            self.rastreador.emitir(rastreamento.LINHA, texto.rstrip())
+        if self.posicoes:
+            self.recuo = len(linha) - len(texto)
+
+        instrucao = lexico.INSTRUCAO.match(texto)
+        if instrucao is None:
+            return self._erro_formato(texto.split(None, 1)[0])
+
+        chave = instrucao["chave"]
+        if chave == "BLOCO":
+            return self.processar_bloco(instrucao)
+        elif chave == "FIM":
+            return self.processar_fim(instrucao)
+        elif chave == "PRINT":
+            return self.processar_print(instrucao)
+        return self.processar_lista(texto, instrucao)
+
+    def _erro_formato(self, chave):
+        """
+        Emite o erro de formato correspondente à instrução de uma linha malformada.
+
+        Args:
+            chave (str): A primeira palavra da linha.
+        """
+        if self.rastreador.erro:
+            codigo = {"BLOCO": "formato_bloco", "FIM": "formato_fim", "PRINT": "formato_print"}.get(chave, "formato_atribuicao")
+            self.rastreador.emitir(rastreamento.ERRO, codigo, None)
+
+    def _posicionar(self, instrucao, item):
+        """
+        Acrescenta a uma instrução a linha e a coluna do seu lexema.
+
+        Args:
+            instrucao (dict): A instrução produzida.
+            item (re.Match): O casamento do analisador léxico que contém o lexema.
+
+        Returns:
+            dict: A própria instrução.
+        """
+        instrucao["linha"] = self.numero_linha
+        instrucao["coluna"] = self.recuo + item.start("lexema") + 1
+        return instrucao
+
+    def processar_bloco(self, instrucao):
         """
         Processa um bloco de código.
 
         Args:
-            linha (str): A linha de código contendo o bloco.
+            instrucao (re.Match): A linha do bloco, casada com lexico.INSTRUCAO.
         """
-        partes = linha.split()
-        if len(partes) == 2:
-            nome_bloco = partes[1]
-            return {"instrucao": "BLOCO", "nome_bloco": nome_bloco}
-        else:
-            messagem_erro = f"ERRO: Formato inválido para BLOCO."
-            logging.error(f"\033[91m{messagem_erro}\033[0m")
+        if instrucao["igual"] or instrucao["virgula"]:
+            return self._erro_formato("BLOCO")
+        if self.posicoes:
+            return self._posicionar({"instrucao": "BLOCO", "nome_bloco": instrucao["lexema"]}, instrucao)
+        return {"instrucao": "BLOCO", "nome_bloco": instrucao["lexema"]}
     
-    def processar_fim(self, linha):
+    def processar_fim(self, instrucao):
         """
         Processa a instrução 'FIM' do programa.
 
         Fecha o bloco atual e imprime a tabela de símbolos, se o modo de depuração estiver ativado.
 
         Args:
-            linha (str): A linha contendo a instrução 'FIM'.
+            instrucao (re.Match): A linha da instrução 'FIM', casada com lexico.INSTRUCAO.
         """       
-        partes = linha.split()
-        if len(partes) == 2:
-            nome_bloco = partes[1]
-            return {"instrucao": "FIM", "nome_bloco": nome_bloco}
-        else:
-            messagem_erro = f"ERRO: Formato inválido para FIM."
-            logging.error(f"\033[91m{messagem_erro}\033[0m")
+        if instrucao["igual"] or instrucao["virgula"]:
+            return self._erro_formato("FIM")
+        if self.posicoes:
+            return self._posicionar({"instrucao": "FIM", "nome_bloco": instrucao["lexema"]}, instrucao)
+        return {"instrucao": "FIM", "nome_bloco": instrucao["lexema"]}
     
-    def processar_print(self, linha):
+    def processar_print(self, instrucao):
         """
         Processa a instrução de impressão.
 
         Args:
-            linha (str): A linha contendo a instrução de impressão.
+            instrucao (re.Match): A linha da instrução de impressão, casada com lexico.INSTRUCAO.
+        """
+        if instrucao["igual"] or instrucao["virgula"]:
+            return self._erro_formato("PRINT")
+        if self.posicoes:
+            return self._posicionar({"instrucao": "PRINT", "lexema": instrucao["lexema"]}, instrucao)
+        return {"instrucao": "PRINT", "lexema": instrucao["lexema"]}
+
+    def processar_lista(self, texto, instrucao):
+        """
+        Processa uma lista de declarações ou atribuições separadas por vírgula.
+
+        Se algum item tiver "= valor", todos os itens são atribuições; caso contrário, a linha
+        é uma declaração sem valores (e é ignorada se não começar por um tipo).
+
+        Args:
+            texto (str): A linha, sem o recuo.
+            instrucao (re.Match): O tipo e o primeiro item, casados com lexico.INSTRUCAO.
         """
-        lexema = linha.split()[1]
-        return {"instrucao": "PRINT", "lexema": lexema}
+        tipo = instrucao["chave"]
+        itens = [instrucao]
+        atribuicao = instrucao["igual"] is not None
+        if instrucao["virgula"]:
+            posicao = instrucao.end()
+            while posicao < len(texto):
+                item = lexico.ITEM.match(texto, posicao)
+                if item is None:
+                    return self._erro_formato(tipo)
+                itens.append(item)
+                if item["igual"]:
+                    atribuicao = True
+                posicao = item.end()
+
+        if atribuicao:
+            return self.processar_atribuicao(itens, tipo)
+        elif tipo:
+            return self.processar_declaracao(itens, tipo)
         
-    def processar_atribuicao(self, linha):
+    def processar_atribuicao(self, itens, tipo_declarado=None):
         """
-        Processa uma linha contendo uma atribuição de variáveis.
+        Processa os itens de uma linha contendo uma atribuição de variáveis.
         
         Args:
-            linha (str): A linha contendo a atribuição.
+            itens (list[re.Match]): Os itens da linha, casados com lexico.ITEM.
+            tipo_declarado (str, optional): O tipo declarado no início da linha, se houver.
         """
-        if linha.startswith(tuple(self.tipos_validos.keys())): 
-            partes = linha.split(maxsplit=1)
-            tipo_declarado = partes[0]
-            declaracoes = partes[1].split(",") 
-        else:
-            declaracoes = linha.split(",")
-            tipo_declarado = None
-        
         instrucoes:list[dict] = []
-        for declaracao in declaracoes:
-            valor = None
-            if "=" in declaracao:
-                lexema, valor = declaracao.split("=")
-                lexema, valor = lexema.strip(), valor.strip()  
-            else:
-                lexema = declaracao.strip()
-            
-            instrucoes.append({"instrucao": "ATRIBUICAO", "lexema": lexema, "tipo_declarado": tipo_declarado, "valor": valor})
+        for item in itens:
+            instrucoes.append({"instrucao": "ATRIBUICAO", "lexema": item["lexema"], "tipo_declarado": tipo_declarado, "valor": item["valor"]})
+        if self.posicoes:
+            for instrucao, item in zip(instrucoes, itens):
+                self._posicionar(instrucao, item)
         return instrucoes
         
-    def processar_declaracao(self, linha):
+    def processar_declaracao(self, itens, tipo):
         """
-        Processa uma declaração de variável.
+        Processa os itens de uma declaração de variáveis sem atribuição.
 
         Args:
-            linha (str): A linha contendo a declaração de variável.
+            itens (list[re.Match]): Os itens da linha, casados com lexico.ITEM.
+            tipo (str): O tipo declarado.
         """
-        # Adicionando variaveis sem atribuição
-        partes = linha.split(maxsplit=1)
-        tipo = partes[0]
-        declaracoes = partes[1].replace(" ", "").split(",") 
         instrucoes:list[dict] = []
-        for declaracao in declaracoes:
-            instrucoes.append({"instrucao": "DECLARACAO", "lexema": declaracao, "tipo": tipo})
+        for item in itens:
+            instrucoes.append({"instrucao": "DECLARACAO", "lexema": item["lexema"], "tipo": tipo})
+        if self.posicoes:
+            for instrucao, item in zip(instrucoes, itens):
+                self._posicionar(instrucao, item)
         return instrucoes
 
 def config_logging(debug=False, info=False, warning=False):
@@ -485,13 +893,13 @@ def config_logging(debug=False, info=False, warning=False):
 
     """
     if debug:
-        level = logging.DEBUG
+        level = rastreamento.DEBUG
     elif info:
-        level = logging.INFO
+        level = rastreamento.INFO
     elif warning:
-        level = logging.WARNING
+        level = rastreamento.WARNING
     else:
-        level = logging.ERROR
+        level = rastreamento.ERROR
         
     return level
 
@@ -502,62 +910,297 @@ def analisar_argumentos():
     Returns:
         argparse.Namespace: Objeto contendo os argumentos processados.
     """
+    import argparse
+
+    def inteiro_positivo(texto):
+        try:
+            valor = int(texto)
+        except ValueError:
+            valor = 0
+        if valor < 1:
+            raise argparse.ArgumentTypeError(f"deve ser um inteiro positivo: '{texto}'")
+        return valor
+
     parser = argparse.ArgumentParser(description="Executa o processador semântico em um arquivo.")
     
     parser.add_argument("-i", "--input", help="Executa o processador semântico no arquivo ARQUIVO.")
+    parser.add_argument("-b", "--batch", nargs="+", metavar="CAMINHO", help="Analisa em paralelo todos os arquivos .cic dos arquivos, diretórios ou padrões glob CAMINHO.")
+    parser.add_argument("-j", "--workers", type=inteiro_positivo, metavar="N", help="Número de processos usados com --batch, --serve, --parallel-parse e --parallel-blocks (padrão: número de CPUs).")
     parser.add_argument("-d", "--debug", action="store_true", help="Ativa o modo de depuração.")
     parser.add_argument("-id", "--info", action="store_true", help="Ativa o modo de depuração com mensagens informativas.")
     parser.add_argument("-w", "--warning", action="store_true", help="Ativa o modo de depuração com mensagens de aviso.")
     parser.add_argument("-l", "--log", action="store_true", help="Salva o log em um arquivo.")
+    parser.add_argument("--log-file", metavar="ARQUIVO", default="log.txt", help="Arquivo de log usado com --log (padrão: log.txt).")
+    parser.add_argument("--log-max-bytes", type=int, default=0, metavar="BYTES", help="Rotaciona o arquivo de log ao atingir BYTES (padrão: sem rotação).")
+    parser.add_argument("--log-backups", type=int, default=3, metavar="N", help="Quantidade de arquivos de log rotacionados mantidos (padrão: 3).")
+    parser.add_argument("--log-gzip", action="store_true", help="Compacta com gzip os arquivos de log rotacionados.")
+    parser.add_argument("-f", "--formato", choices=FORMATOS, default="bonito", help="Formato da saída dos PRINTs (padrão: bonito).")
+    parser.add_argument("-o", "--output", metavar="ARQUIVO", help="Escreve a saída dos PRINTs em ARQUIVO em vez da saída padrão.")
+    parser.add_argument("--trace-jsonl", metavar="ARQUIVO", help="Grava todos os eventos do processamento em ARQUIVO, um objeto JSON por linha.")
+    parser.add_argument("--trace-bin", metavar="ARQUIVO", help="Grava todos os eventos do processamento em ARQUIVO, em formato binário compacto.")
+    parser.add_argument("-c", "--cache", action="store_true", help="Reutiliza o programa já processado salvo em ARQUIVO.cicc, gerando-o se necessário.")
+    parser.add_argument("-s", "--stream", action="store_true", help="Processa e executa o arquivo em fluxo, linha a linha, sem carregar todas as instruções na memória.")
+    parser.add_argument("--parallel-parse", action="store_true", help="Mapeia o arquivo em memória e processa trechos dele em paralelo, um por processo (ver -j); útil para arquivos muito grandes (sem efeito com --stream).")
+    parser.add_argument("--parallel-blocks", action="store_true", help="Executa em outros processos (ver -j) os blocos que não alteram variáveis dos escopos externos, com a saída na ordem do programa (sem efeito com --stream, --aot ou perfil).")
+    parser.add_argument("--memory-budget", type=inteiro_positivo, metavar="N", help="Mantém no máximo cerca de N símbolos em memória, despejando em disco (sqlite) as tabelas de escopo acessadas há mais tempo, e informa no stderr o despejo e os acertos do cache (sem efeito com --aot; ignora --parallel-blocks).")
+    parser.add_argument("--spill-dir", metavar="DIRETORIO", help="Com --memory-budget, diretório do banco dos símbolos despejados (padrão: o diretório temporário do sistema).")
+    parser.add_argument("--prelude", metavar="ARQUIVO", help="Executa ARQUIVO uma única vez, antes do programa ou, com --batch, de todos os arquivos, e cada programa parte do estado final dos escopos dele, compartilhado sem cópia (ignora --infer-types, --aot, --parallel-blocks e --memory-budget; sem efeito com --watch, --serve e --check).")
+    parser.add_argument("--infer-types", action="store_true", help="Antes de executar, converte cada literal uma única vez e remove as verificações de tipo que puder provar (sem efeito com --stream).")
+    parser.add_argument("--aot", action="store_true", help="Traduz o programa para um código Python e o executa (com --cache, o código é salvo em ARQUIVO.cicx). Só vale sem eventos de depuração, rastro ou perfil.")
+    parser.add_argument("--watch", action="store_true", help="Executa o arquivo e o reexecuta a cada alteração, retomando do bloco editado, até Ctrl+C (ignora --stream, --cache, --infer-types e --aot).")
+    parser.add_argument("--serve", action="store_true", help="Mantém o analisador carregado e analisa os programas recebidos em JSON, um por linha, pela entrada padrão ou por --socket (ver servidor.py).")
+    parser.add_argument("--socket", metavar="CAMINHO", help="Com --serve, escuta no socket Unix CAMINHO em vez da entrada padrão.")
+    parser.add_argument("--check", action="store_true", help="Apenas verifica o arquivo, listando os erros com linha e coluna, sem executá-lo.")
+    parser.add_argument("--max-errors", type=int, metavar="N", help="Com --check, interrompe a verificação após N erros distintos.")
+    parser.add_argument("--profile", action="store_true", help="Ao final, imprime no stderr um perfil de tempo, memória, buscas e escopos da execução.")
+    parser.add_argument("--profile-json", metavar="ARQUIVO", help="Grava o perfil da execução em ARQUIVO, em JSON.")
 
     return parser.parse_args()
 
-def formatar_log(logname_file):
+# Opções aceitas pela partida rápida (ver argumentos_simples), com o nome de cada uma em analisar_argumentos
+_OPCOES_SIMPLES = {"-i": "input", "--input": "input", "-f": "formato", "--formato": "formato", "-o": "output", "--output": "output"}
+
+def argumentos_simples(argv):
     """
-    Formata o log para que as mensagens de erro sejam destacadas em vermelho.
+    Reconhece a linha de comando de uma execução simples, que só usa -i, -f e -o.
+
+    Só as formas "-i ARQUIVO" e "--input ARQUIVO" (e as equivalentes de -f e -o) são
+    reconhecidas; qualquer outra opção ou forma fica com o argparse.
 
     Args:
-        logname_file (str): O nome do arquivo de log.
+        argv (list[str]): Os argumentos, sem o nome do programa.
+
+    Returns:
+        dict or None: O valor de "input", "formato" e "output", ou None se a linha de comando
+            não for de uma execução simples.
     """
-    _cores = '\033[0m\033[91m\033[92m\033[93m\033[94m\033[95m\033[96m\033[97m'
-    with open(logname_file, 'r', encoding='utf-8') as arquivo:
-        log = ''
-        for linha in arquivo.read().split('\n'):
-            linha = linha.lstrip(_cores).rstrip('\033[0m')
-            log += f"🔶 {linha}\n" if linha.startswith('ERRO') else f"💠 {linha}\n" if linha.startswith(('Adicionando', 'Abrindo', 'Fechando')) else f"🔹 {linha}\n"
-    with open(logname_file, 'w', encoding='utf-8') as arquivo:
-        arquivo.write(log)        
-    print(f"Log salvo em {logname_file}")
+    valores = {"input": None, "formato": "bonito", "output": None}
+    if len(argv) % 2:
+        return None
+    for opcao, valor in zip(argv[::2], argv[1::2]):
+        nome = _OPCOES_SIMPLES.get(opcao)
+        if nome is None or valor.startswith("-"):
+            return None
+        valores[nome] = valor
+    # Um formato inválido é informado pelo argparse
+    return valores if valores["formato"] in FORMATOS else None
 
+def executar_simples(arquivo, formato="bonito", destino=None):
+    """
+    Processa e executa um arquivo como main() sem opções além de -i, -f e -o, mas sem importar
+    o argparse nem o logging: no nível padrão (ERROR) só os erros chegam ao console, e eles são
+    escritos direto no stderr, no mesmo formato do logging configurado por main().
+
+    Args:
+        arquivo (str): O caminho do arquivo .cic.
+        formato (str, optional): O formato da saída dos PRINTs.
+        destino (str, optional): O arquivo da saída dos PRINTs. Padrão: a saída padrão.
+    """
+    rastreador = Rastreador([rastreamento.ColetorFluxo(sys.stderr, rastreamento.ERROR, "\033[93m{}\033[0m\n")])
+    if destino:
+        saida = SaidaTexto.para_arquivo(destino, formato, 1 << 16)
+    else:
+        saida = SaidaTexto(formato, sys.stdout, 1 << 16)
+    try:
+        programa = ProcessadorSemantico(rastreador).compilar_arquivo(arquivo)
+    except FileNotFoundError:
+        print(f"ERRO: Arquivo '{arquivo}' não encontrado.")
+        sys.exit(1)
+    AnalisadorSemantico(rastreador, saida).executar_programa(programa)
+    saida.fechar()
+    rastreador.fechar()
 
 def main():
+    # Uma execução simples não precisa do argparse nem do logging, cuja importação e configuração
+    # custam mais que a análise de um programa pequeno
+    simples = argumentos_simples(sys.argv[1:])
+    if simples is not None:
+        executar_simples(simples["input"] or "programa.cic", simples["formato"], simples["output"])
+        return
+    import contextlib
+    import logging
+
     # Processa os argumentos de linha de comando e configura o logging
     args = analisar_argumentos()
     arquivo =  args.input if args.input else "programa.cic"  
     level = config_logging(args.debug, args.info, args.warning)  
-    logname = "log.txt" if args.log else None        
-    logging.basicConfig(filename=logname, filemode='w', encoding='utf-8', level=level, format='\033[93m%(message)s\033[0m')
-    
-    # Processa o código do arquivo e executa as instruções
-    instrucoes:list[dict] = []
-    processador = ProcessadorSemantico() 
-    try:
-        instrucoes = processador.processar_codigo_arquivo(arquivo) 
-    except FileNotFoundError:
-        print(f"ERRO: Arquivo '{arquivo}' não encontrado.")
-        sys.exit(1)
 
-    # Executa as instruções processadas
-    analisador = AnalisadorSemantico()
-    analisador.executar_instrucoes(instrucoes) 
-    
-    # Remove os caracteres de formatação do log e salva em um arquivo
+    # No modo em lote cada arquivo é analisado em um processo próprio, com saída e erros coletados
+    if args.batch:
+        from lote import executar_lote
+        relatorio = executar_lote(args.batch, args.workers, args.formato, preludio=args.prelude)
+        sys.exit(1 if relatorio["erros"] or relatorio["falhas"] else 0)
+    # No modo servidor os processos do pool ficam carregados e cada requisição tem um analisador próprio
+    if args.serve:
+        from servidor import servir
+        try:
+            estatisticas = servir(args.socket, args.workers)
+        except OSError as erro:
+            print(f"ERRO: Não foi possível iniciar o servidor: {erro}")
+            sys.exit(1)
+        if args.socket:
+            sys.stderr.write(f"Servidor encerrado: {estatisticas['requisicoes']} requisição(ões) em {estatisticas['conexoes']} conexão(ões), {estatisticas['erros']} recusada(s), {estatisticas['falhas']} com falha.\n")
+        return
+    # Na verificação só os tipos declarados são acompanhados; nada é executado nem impresso
+    if args.check:
+        from verificacao import VerificadorSemantico, formatar_diagnosticos
+        verificador = VerificadorSemantico(args.max_errors)
+        try:
+            diagnosticos = verificador.verificar_arquivo(arquivo)
+        except FileNotFoundError:
+            print(f"ERRO: Arquivo '{arquivo}' não encontrado.")
+            sys.exit(1)
+        sys.stdout.write(formatar_diagnosticos(diagnosticos, "jsonl" if args.formato == "jsonl" else "texto"))
+        if not diagnosticos:
+            sys.stderr.write(f"{arquivo}: nenhum erro encontrado.\n")
+        else:
+            interrompida = " (verificação interrompida por --max-errors)" if verificador.interrompido else ""
+            sys.stderr.write(f"{arquivo}: {len(diagnosticos)} erro(s) distinto(s), {sum(d.ocorrencias for d in diagnosticos)} ocorrência(s){interrompida}.\n")
+        sys.exit(1 if diagnosticos else 0)
     if args.log:
+        # O log é gravado já sem cores e com os emojis de cada categoria, à medida que é emitido
+        from log_arquivo import ManipuladorLogArquivo
+        manipulador = ManipuladorLogArquivo(args.log_file, args.log_max_bytes, args.log_backups, args.log_gzip)
+        logging.basicConfig(level=level, handlers=[manipulador])
+    else:
+        logging.basicConfig(level=level, format='\033[93m%(message)s\033[0m')
+
+    # As flags de depuração definem quais eventos chegam ao console; os arquivos de rastro recebem todos
+    coletores = [rastreamento.ColetorConsole(level)]
+    if args.trace_jsonl:
+        coletores.append(rastreamento.ColetorJSONL(args.trace_jsonl))
+    if args.trace_bin:
+        coletores.append(rastreamento.ColetorBinario(args.trace_bin))
+    perfilador = None
+    if args.profile or args.profile_json:
+        from perfil import Perfilador
+        perfilador = Perfilador()
+        coletores.append(perfilador)
+    rastreador = Rastreador(coletores)
+
+    # No acompanhamento, cada versão do arquivo é reexecutada a partir da foto do estado mais próxima da edição
+    if args.watch:
+        from incremental import acompanhar_arquivo
+        def criar_saida():
+            if args.output:
+                return SaidaTexto.para_arquivo(args.output, args.formato)
+            return SaidaTexto(args.formato, sys.stdout, 1 << 16)
+        try:
+            acompanhar_arquivo(arquivo, criar_saida, rastreador)
+        except FileNotFoundError:
+            print(f"ERRO: Arquivo '{arquivo}' não encontrado.")
+            sys.exit(1)
+        rastreador.fechar()
+        return
+
+    # No modo em fluxo cada PRINT é escrito de imediato; nos demais, a saída é acumulada em buffer
+    tamanho_buffer = 0 if args.stream else 1 << 16
+    if args.output:
+        saida = SaidaTexto.para_arquivo(args.output, args.formato, tamanho_buffer)
+    else:
+        saida = SaidaTexto(args.formato, sys.stdout, tamanho_buffer)
+    
+    # Processa o código do arquivo e executa as instruções
+    processador = ProcessadorSemantico(rastreador) 
+    if args.prelude:
+        # O prelúdio é executado uma vez, e o programa parte dos escopos dele, sem copiá-los
+        from preludio import Preludio
+        try:
+            preludio = Preludio.do_arquivo(args.prelude, rastreador, saida)
+        except FileNotFoundError:
+            print(f"ERRO: Arquivo '{args.prelude}' não encontrado.")
+            sys.exit(1)
+        analisador = preludio.analisador(rastreador, saida)
+    elif args.memory_budget:
+        # As tabelas de escopo acessadas há mais tempo vão para o disco quando passam do orçamento
+        from memoria_limitada import AnalisadorMemoriaLimitada
+        analisador = AnalisadorMemoriaLimitada(rastreador, saida, args.memory_budget, args.spill_dir)
+    elif args.parallel_blocks and not args.stream and not perfilador:
+        # Os blocos independentes dos escopos externos são executados por outros processos
+        from execucao_paralela import AnalisadorParalelo
+        analisador = AnalisadorParalelo(rastreador, saida, args.workers)
+    else:
+        analisador = AnalisadorSemantico(rastreador, saida)
+    compilar = processador.compilar_arquivo
+    if args.parallel_parse:
+        # Os trechos do arquivo são processados em paralelo e concatenados na ordem do arquivo
+        from processamento_paralelo import compilar_arquivo_paralelo
+        def compilar(nome_arquivo):
+            return compilar_arquivo_paralelo(nome_arquivo, rastreador, args.workers)
+    fase = contextlib.nullcontext
+    if perfilador:
+        perfilador.acompanhar(analisador)
+        fase = perfilador.fase
+    # A tradução não emite os eventos de depuração, de rastro nem do perfil, só os erros
+    traduzir = False
+    if args.aot and not args.stream and not args.prelude:
+        import traducao
+        traduzir = traducao.suporta(rastreador)
+        if not traduzir:
+            logging.warning("\033[93m--aot ignorado: os eventos pedidos só existem na execução interpretada\033[0m")
+    if args.stream:
+        # Cada instrução é executada assim que sua linha é processada
+        try:
+            arquivo_fonte = open(arquivo, 'r', encoding='utf-8')
+        except FileNotFoundError:
+            print(f"ERRO: Arquivo '{arquivo}' não encontrado.")
+            sys.exit(1)
+        with arquivo_fonte, fase("processamento e execução"):
+            analisador.executar_instrucoes(processador.gerar_instrucoes(arquivo_fonte), perfilador)
+    elif traduzir:
+        # O programa vira um único código Python, com os escopos em variáveis locais
         try:
-            formatar_log(logname)
+            with fase("tradução"):
+                if args.cache:
+                    codigo = traducao.carregar_ou_compilar(arquivo, compilar, rastreador)
+                else:
+                    codigo = traducao.compilar(compilar(arquivo), arquivo)
         except FileNotFoundError:
-            print(f"ERRO: Arquivo '{logname}' não encontrado.")
+            print(f"ERRO: Arquivo '{arquivo}' não encontrado.")
             sys.exit(1)
+        with fase("execução"):
+            traducao.executar(codigo, saida, rastreador)
+    else:
+        try:
+            with fase("processamento"):
+                if args.cache:
+                    from cache_compilado import carregar_ou_compilar
+                    programa = carregar_ou_compilar(arquivo, compilar, rastreador)
+                else:
+                    programa = compilar(arquivo)
+        except FileNotFoundError:
+            print(f"ERRO: Arquivo '{arquivo}' não encontrado.")
+            sys.exit(1)
+
+        # Converte os literais uma única vez e remove as verificações de tipo que puder provar
+        # (a inferência supõe que o programa parte de escopos vazios, o que não vale com um prelúdio)
+        if args.infer_types and not args.prelude:
+            with fase("inferência de tipos"):
+                programa = inferir_tipos(programa)
+            if perfilador:
+                perfilador.inferencia = programa.estatisticas()
+
+        # Executa as instruções processadas
+        with fase("execução"):
+            analisador.executar_programa(programa, perfilador) 
+    with fase("saída"):
+        saida.fechar()
+    rastreador.fechar()
+    if args.memory_budget and not args.prelude and not traduzir:
+        from memoria_limitada import formatar_estatisticas
+        analisador.fechar()
+        sys.stderr.write(formatar_estatisticas(analisador))
+
+    if perfilador:
+        if args.profile:
+            from perfil import formatar_relatorio
+            sys.stderr.write(formatar_relatorio(perfilador.relatorio()))
+        if args.profile_json:
+            perfilador.gravar_json(args.profile_json)
+
+    if args.log:
+        logging.shutdown()
+        print(f"Log salvo em {args.log_file}")
     
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,313 @@
+import math
+
+# Mapa persistente (imutável, com compartilhamento estrutural) no formato HAMT: uma árvore
+# de 32 ramos indexada por fatias de 5 bits do hash da chave. Associar ou remover uma chave
+# copia apenas o caminho da raiz até ela (no máximo 13 nós de até 32 entradas) e
+# compartilha todo o resto com o mapa original, de modo que guardar uma versão antiga do
+# mapa custa só a referência a ela.
+#
+# Cada entrada de um nó é uma folha (hash, chave, valor), um nó filho (_No) ou, quando
+# várias chaves têm o mesmo hash de 64 bits, uma _Colisao. A forma da árvore depende apenas
+# do conjunto de chaves, e não da ordem das operações: um compartimento com uma única chave
+# é sempre uma folha, e nunca um nó com um só elemento. Por isso, dois mapas iguais têm a
+# mesma estrutura e podem ser comparados nó a nó, pulando as subárvores compartilhadas.
+#
+# Como nas coleções "transientes" de Clojure, `associar` aceita um dono: os nós criados com
+# ele ainda não foram vistos por ninguém além da versão mais recente do mapa, e por isso
+# as associações seguintes com o mesmo dono os alteram no lugar em vez de copiá-los. Quem
+# guarda uma versão (uma foto) deve passar a usar um novo dono a partir dela.
+_BITS = 5
+_MASCARA = (1 << _BITS) - 1
+_MASCARA_HASH = (1 << 64) - 1
+
+class _No:
+    __slots__ = ("mapa_bits", "entradas", "dono")
+
+    def __init__(self, mapa_bits, entradas, dono=None):
+        self.mapa_bits = mapa_bits
+        self.entradas = entradas
+        self.dono = dono
+
+class _Colisao:
+    __slots__ = ("hash", "pares")
+
+    def __init__(self, hash_chave, pares):
+        self.hash = hash_chave
+        self.pares = pares
+
+_RAIZ_VAZIA = _No(0, [])
+
+def _hash(chave):
+    return hash(chave) & _MASCARA_HASH
+
+def _hash_entrada(entrada):
+    return entrada[0] if type(entrada) is tuple else entrada.hash
+
+def mesmo_valor(a, b):
+    """
+    Compara dois valores de forma estrita: além de iguais, devem ter o mesmo tipo e a mesma
+    representação (1 e 1.0, ou 0.0 e -0.0, são diferentes, pois seriam impressos de forma diferente).
+
+    Args:
+        a: O primeiro valor.
+        b: O segundo valor.
+
+    Returns:
+        bool: True se os valores forem indistinguíveis.
+    """
+    if a is b:
+        return True
+    if type(a) is not type(b):
+        return False
+    if type(a) is tuple:
+        return len(a) == len(b) and all(map(mesmo_valor, a, b))
+    if type(a) is float:
+        return a == b and math.copysign(1.0, a) == math.copysign(1.0, b)
+    return a == b
+
+def _juntar(deslocamento, a, b, dono):
+    """Cria a subárvore que contém as entradas terminais a e b, a partir do deslocamento dado."""
+    hash_a, hash_b = _hash_entrada(a), _hash_entrada(b)
+    if hash_a == hash_b:
+        # Só folhas chegam aqui com o mesmo hash: uma colisão nunca é separada de outra chave de mesmo hash
+        return _Colisao(hash_a, ((a[1], a[2]), (b[1], b[2])))
+    indice_a = (hash_a >> deslocamento) & _MASCARA
+    indice_b = (hash_b >> deslocamento) & _MASCARA
+    if indice_a == indice_b:
+        return _No(1 << indice_a, [_juntar(deslocamento + _BITS, a, b, dono)], dono)
+    if indice_a < indice_b:
+        return _No((1 << indice_a) | (1 << indice_b), [a, b], dono)
+    return _No((1 << indice_a) | (1 << indice_b), [b, a], dono)
+
+# Efeito de uma associação
+_NADA, _SUBSTITUIDA, _ADICIONADA = range(3)
+
+def _associar(no, deslocamento, hash_chave, chave, valor, dono):
+    """Retorna (nó, efeito); o nó é o próprio, alterado no lugar, se pertencer ao dono."""
+    bit = 1 << ((hash_chave >> deslocamento) & _MASCARA)
+    posicao = (no.mapa_bits & (bit - 1)).bit_count()
+    proprio = dono is not None and no.dono is dono
+    if not no.mapa_bits & bit:
+        folha = (hash_chave, chave, valor)
+        if proprio:
+            no.entradas.insert(posicao, folha)
+            no.mapa_bits |= bit
+            return no, _ADICIONADA
+        entradas = no.entradas.copy()
+        entradas.insert(posicao, folha)
+        return _No(no.mapa_bits | bit, entradas, dono), _ADICIONADA
+    entrada = no.entradas[posicao]
+    if type(entrada) is tuple:
+        if entrada[0] == hash_chave and entrada[1] == chave:
+            if entrada[2] is valor:
+                return no, _NADA
+            nova, efeito = (hash_chave, chave, valor), _SUBSTITUIDA
+        else:
+            nova, efeito = _juntar(deslocamento + _BITS, entrada, (hash_chave, chave, valor), dono), _ADICIONADA
+    elif type(entrada) is _No:
+        nova, efeito = _associar(entrada, deslocamento + _BITS, hash_chave, chave, valor, dono)
+        # Um filho alterado no lugar pertence ao dono, e então este nó também
+        if nova is entrada:
+            return no, efeito
+    elif entrada.hash == hash_chave:
+        pares = tuple(par for par in entrada.pares if par[0] != chave)
+        efeito = _ADICIONADA if len(pares) == len(entrada.pares) else _SUBSTITUIDA
+        nova = _Colisao(hash_chave, pares + ((chave, valor),))
+    else:
+        nova, efeito = _juntar(deslocamento + _BITS, entrada, (hash_chave, chave, valor), dono), _ADICIONADA
+    if proprio:
+        no.entradas[posicao] = nova
+        return no, efeito
+    entradas = no.entradas.copy()
+    entradas[posicao] = nova
+    return _No(no.mapa_bits, entradas, dono), efeito
+
+def _remover(no, deslocamento, hash_chave, chave):
+    """Retorna o novo nó (o mesmo, se a chave não existir), ou None se ele ficar vazio."""
+    bit = 1 << ((hash_chave >> deslocamento) & _MASCARA)
+    if not no.mapa_bits & bit:
+        return no
+    posicao = (no.mapa_bits & (bit - 1)).bit_count()
+    entrada = no.entradas[posicao]
+    if type(entrada) is tuple:
+        if entrada[0] != hash_chave or entrada[1] != chave:
+            return no
+        nova = None
+    elif type(entrada) is _No:
+        nova = _remover(entrada, deslocamento + _BITS, hash_chave, chave)
+        if nova is entrada:
+            return no
+        # Um nó que ficou com uma única entrada terminal é substituído por ela
+        if nova is not None and len(nova.entradas) == 1 and type(nova.entradas[0]) is not _No:
+            nova = nova.entradas[0]
+    else:
+        if entrada.hash != hash_chave:
+            return no
+        pares = tuple(par for par in entrada.pares if par[0] != chave)
+        if len(pares) == len(entrada.pares):
+            return no
+        nova = (hash_chave,) + pares[0] if len(pares) == 1 else _Colisao(hash_chave, pares)
+    entradas = no.entradas.copy()
+    if nova is None:
+        if no.mapa_bits == bit:
+            return None
+        del entradas[posicao]
+        return _No(no.mapa_bits & ~bit, entradas)
+    entradas[posicao] = nova
+    return _No(no.mapa_bits, entradas)
+
+def _iguais(a, b):
+    if a is b:
+        return True
+    if type(a) is not type(b):
+        return False
+    if type(a) is tuple:
+        return a[0] == b[0] and a[1] == b[1] and mesmo_valor(a[2], b[2])
+    if type(a) is _No:
+        return a.mapa_bits == b.mapa_bits and all(map(_iguais, a.entradas, b.entradas))
+    if a.hash != b.hash or len(a.pares) != len(b.pares):
+        return False
+    pares_b = dict(b.pares)
+    return all(chave in pares_b and mesmo_valor(valor, pares_b[chave]) for chave, valor in a.pares)
+
+def _percorrer(no):
+    for entrada in no.entradas:
+        if type(entrada) is tuple:
+            yield entrada[1], entrada[2]
+        elif type(entrada) is _No:
+            yield from _percorrer(entrada)
+        else:
+            yield from entrada.pares
+
+class MapaPersistente:
+    """
+    Mapa imutável com compartilhamento estrutural (HAMT).
+
+    `associar` e `remover` retornam um novo mapa em O(log n), sem alterar o original, que
+    continua válido e compartilha com o novo tudo o que não mudou. A igualdade é estrutural e
+    estrita (ver `mesmo_valor`), e pula as subárvores compartilhadas entre os dois mapas.
+
+    Args:
+        itens (Iterable[tuple], optional): Pares (chave, valor) iniciais.
+    """
+    __slots__ = ("_raiz", "_tamanho")
+
+    def __init__(self, itens=()):
+        self._raiz = _RAIZ_VAZIA
+        self._tamanho = 0
+        dono = object()
+        for chave, valor in itens:
+            self._raiz, efeito = _associar(self._raiz, 0, _hash(chave), chave, valor, dono)
+            self._tamanho += efeito == _ADICIONADA
+
+    @classmethod
+    def _de_raiz(cls, raiz, tamanho):
+        mapa = cls.__new__(cls)
+        mapa._raiz = raiz
+        mapa._tamanho = tamanho
+        return mapa
+
+    def __len__(self):
+        return self._tamanho
+
+    def obter(self, chave, padrao=None):
+        """
+        Obtém o valor de uma chave.
+
+        Args:
+            chave: A chave procurada.
+            padrao (optional): O valor retornado se a chave não existir.
+
+        Returns:
+            O valor da chave, ou `padrao`.
+        """
+        hash_chave = hash(chave) & _MASCARA_HASH
+        fatia = hash_chave
+        no = self._raiz
+        while True:
+            mapa_bits = no.mapa_bits
+            bit = 1 << (fatia & _MASCARA)
+            if not mapa_bits & bit:
+                return padrao
+            entrada = no.entradas[(mapa_bits & (bit - 1)).bit_count()]
+            if type(entrada) is tuple:
+                return entrada[2] if entrada[0] == hash_chave and entrada[1] == chave else padrao
+            if type(entrada) is _Colisao:
+                if entrada.hash == hash_chave:
+                    for chave_par, valor in entrada.pares:
+                        if chave_par == chave:
+                            return valor
+                return padrao
+            no = entrada
+            fatia >>= _BITS
+
+    get = obter
+
+    def __contains__(self, chave):
+        return self.obter(chave, _AUSENTE) is not _AUSENTE
+
+    def __getitem__(self, chave):
+        valor = self.obter(chave, _AUSENTE)
+        if valor is _AUSENTE:
+            raise KeyError(chave)
+        return valor
+
+    def associar(self, chave, valor, dono=None):
+        """
+        Cria um mapa com a chave associada ao valor.
+
+        Args:
+            chave: A chave.
+            valor: O valor.
+            dono (object, optional): Se informado, os nós criados por associações com o mesmo
+                dono são reaproveitados no lugar. O mapa original deixa de ser válido se tiver
+                nós desse dono, e por isso só deve ser guardado quem não usa mais o dono.
+
+        Returns:
+            MapaPersistente: O novo mapa (o próprio, se a chave já tiver exatamente esse valor).
+        """
+        raiz, efeito = _associar(self._raiz, 0, _hash(chave), chave, valor, dono)
+        if efeito == _NADA:
+            return self
+        return MapaPersistente._de_raiz(raiz, self._tamanho + (efeito == _ADICIONADA))
+
+    def remover(self, chave):
+        """
+        Cria um mapa sem a chave.
+
+        Args:
+            chave: A chave a ser removida.
+
+        Returns:
+            MapaPersistente: O novo mapa (o próprio, se a chave não existir).
+        """
+        raiz = _remover(self._raiz, 0, _hash(chave), chave)
+        if raiz is self._raiz:
+            return self
+        return MapaPersistente._de_raiz(raiz or _RAIZ_VAZIA, self._tamanho - 1)
+
+    def itens(self):
+        """
+        Percorre os pares do mapa, na ordem da árvore (não na ordem de inserção).
+
+        Yields:
+            tuple: (chave, valor)
+        """
+        return _percorrer(self._raiz)
+
+    def __iter__(self):
+        return (chave for chave, _ in _percorrer(self._raiz))
+
+    def __eq__(self, outro):
+        if not isinstance(outro, MapaPersistente):
+            return NotImplemented
+        return self._tamanho == outro._tamanho and _iguais(self._raiz, outro._raiz)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"MapaPersistente({dict(self.itens())!r})"
+
+_AUSENTE = object()
+
+MAPA_VAZIO = MapaPersistente()
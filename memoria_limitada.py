@@ -0,0 +1,352 @@
+import contextlib
+import marshal
+import os
+import sqlite3
+import tempfile
+import weakref
+from collections import OrderedDict
+
+from main import AnalisadorSemantico, TabelaSimbolos
+from rastreamento import Rastreador
+from saida import Saida
+
+# Execução com memória limitada: quando as tabelas de símbolos em memória passam do orçamento,
+# as menos acessadas recentemente são despejadas em um banco sqlite em disco e substituídas na
+# pilha de escopos por uma TabelaDespejada, que lê e altera os símbolos pelo banco, com um cache
+# LRU dos símbolos usados há pouco na frente dele. Em programas com escopos externos largos e
+# blocos internos que usam poucas variáveis deles, quase todas as consultas acertam o cache.
+#
+# O índice de resolução (AnalisadorSemantico._vinculos) continua em memória: ele guarda só as
+# profundidades de cada lexema, e sem ele cada consulta teria de procurar em todas as tabelas.
+
+# Fração do orçamento reservada ao cache dos símbolos despejados (1/FRACAO_CACHE)
+FRACAO_CACHE = 4
+# Ao passar do orçamento, as tabelas são despejadas até sobrar esta fração dele (em quartos)
+QUARTOS_APOS_DESPEJO = 3
+# Quando o cache enche, esta fração dele é retirada de uma vez e gravada em um único lote
+FRACAO_LOTE_CACHE = 8
+
+_AUSENTE = object()
+
+class ArmazemSimbolos:
+    """
+    Símbolos das tabelas despejadas, em um banco sqlite em disco, com um cache LRU na frente.
+
+    Cada símbolo é identificado pelo número do escopo e pelo lexema, e guarda a ordem em que
+    foi declarado, o tipo e o valor (codificado com marshal). As alterações ficam no cache e
+    só são gravadas no banco quando o símbolo sai dele. O arquivo do banco só é criado no
+    primeiro despejo, e é apagado por `fechar` ou, se a execução for interrompida, na saída do Python.
+
+    Args:
+        tamanho_cache (int): Número de símbolos mantidos no cache.
+        diretorio (str, optional): Onde criar o arquivo do banco. Padrão: o diretório temporário do sistema.
+
+    Attributes:
+        estatisticas (dict): "tabelas_despejadas" e "simbolos_despejados" (tabelas e símbolos
+            escritos no banco ao despejar uma tabela), "acertos" e "faltas" (consultas atendidas
+            pelo cache e pelo banco) e "gravacoes" (símbolos alterados gravados ao sair do cache).
+    """
+    def __init__(self, tamanho_cache, diretorio=None):
+        self.tamanho_cache = max(1, tamanho_cache)
+        self.estatisticas = {"tabelas_despejadas": 0, "simbolos_despejados": 0, "acertos": 0, "faltas": 0, "gravacoes": 0}
+        self.diretorio = diretorio
+        self.caminho = None
+        self._banco = None
+        self._fechar = None
+        # (escopo, lexema) -> [ordem, tipo, valor, alterado], ou _AUSENTE para um lexema que não está no escopo
+        self._cache = OrderedDict()
+        self._removidos = set()
+        self._proximo_escopo = 0
+
+    def _abrir(self):
+        descritor, self.caminho = tempfile.mkstemp(prefix="escopos-", suffix=".sqlite", dir=self.diretorio)
+        os.close(descritor)
+        self._banco = sqlite3.connect(self.caminho)
+        self._fechar = weakref.finalize(self, _apagar_banco, self._banco, self.caminho)
+        # O banco é descartável: sem diário nem sincronização, e com um cache de páginas pequeno
+        self._banco.executescript("""
+            PRAGMA journal_mode = OFF;
+            PRAGMA synchronous = OFF;
+            PRAGMA cache_size = -2048;
+            CREATE TABLE simbolos (
+                escopo INTEGER, lexema TEXT, ordem INTEGER, tipo TEXT, valor BLOB,
+                PRIMARY KEY (escopo, lexema)
+            ) WITHOUT ROWID;
+        """)
+
+    def despejar(self, tabela):
+        """
+        Grava no banco todos os símbolos de uma tabela.
+
+        Args:
+            tabela (TabelaSimbolos): A tabela despejada.
+
+        Returns:
+            int: O número do escopo com que os símbolos foram gravados.
+
+        Raises:
+            OSError: Se não for possível criar o arquivo do banco.
+            sqlite3.Error: Se não for possível gravar no banco (por exemplo, com o disco cheio).
+        """
+        if self._banco is None:
+            self._abrir()
+        escopo = self._proximo_escopo
+        self._proximo_escopo += 1
+        linhas = [(escopo, lexema, ordem, tipo, marshal.dumps(valor)) for ordem, (lexema, tipo, valor) in enumerate(tabela.itens())]
+        self._banco.executemany("INSERT INTO simbolos VALUES (?, ?, ?, ?, ?)", linhas)
+        self.estatisticas["tabelas_despejadas"] += 1
+        self.estatisticas["simbolos_despejados"] += len(linhas)
+        return escopo
+
+    def obter(self, escopo, lexema):
+        """
+        Obtém um símbolo de uma tabela despejada.
+
+        Returns:
+            list or None: [ordem, tipo, valor, alterado], que pode ser alterado no lugar, ou None se não houver o símbolo.
+        """
+        chave = (escopo, lexema)
+        entrada = self._cache.get(chave)
+        if entrada is not None:
+            self._cache.move_to_end(chave)
+            self.estatisticas["acertos"] += 1
+        else:
+            self.estatisticas["faltas"] += 1
+            linha = self._banco.execute("SELECT ordem, tipo, valor FROM simbolos WHERE escopo = ? AND lexema = ?", chave).fetchone()
+            entrada = [linha[0], linha[1], marshal.loads(linha[2]), False] if linha is not None else _AUSENTE
+            self._guardar(chave, entrada)
+        return None if entrada is _AUSENTE else entrada
+
+    def inserir(self, escopo, lexema, ordem, tipo, valor):
+        """
+        Acrescenta um símbolo a uma tabela despejada, gravado quando sair do cache.
+        """
+        chave = (escopo, lexema)
+        self._cache.pop(chave, None)
+        self._guardar(chave, [ordem, tipo, valor, True])
+
+    def _guardar(self, chave, entrada):
+        cache = self._cache
+        cache[chave] = entrada
+        if len(cache) > self.tamanho_cache:
+            alterados = []
+            for _ in range(max(1, self.tamanho_cache // FRACAO_LOTE_CACHE)):
+                (escopo, lexema), antiga = cache.popitem(last=False)
+                if antiga is not _AUSENTE and antiga[3] and escopo not in self._removidos:
+                    alterados.append((escopo, lexema, antiga[0], antiga[1], marshal.dumps(antiga[2])))
+            if alterados:
+                self._banco.executemany("INSERT OR REPLACE INTO simbolos VALUES (?, ?, ?, ?, ?)", alterados)
+                self.estatisticas["gravacoes"] += len(alterados)
+
+    def itens(self, escopo):
+        """
+        Percorre os símbolos de uma tabela despejada, na ordem em que foram declarados.
+
+        Yields:
+            tuple[str, str, any]: (lexema, tipo, valor) de cada símbolo.
+        """
+        # O cache tem a versão mais recente de cada símbolo que está nele
+        simbolos = {
+            lexema: (ordem, tipo, marshal.loads(valor))
+            for lexema, ordem, tipo, valor in self._banco.execute("SELECT lexema, ordem, tipo, valor FROM simbolos WHERE escopo = ?", (escopo,))
+        }
+        for (escopo_cache, lexema), entrada in self._cache.items():
+            if escopo_cache == escopo and entrada is not _AUSENTE:
+                simbolos[lexema] = (entrada[0], entrada[1], entrada[2])
+        for lexema, (_, tipo, valor) in sorted(simbolos.items(), key=lambda item: item[1][0]):
+            yield lexema, tipo, valor
+
+    def remover(self, escopo):
+        """
+        Descarta os símbolos de uma tabela despejada cujo escopo foi fechado.
+        """
+        self._banco.execute("DELETE FROM simbolos WHERE escopo = ?", (escopo,))
+        # As entradas dele no cache saem com o tempo, sem ser gravadas
+        self._removidos.add(escopo)
+
+    def fechar(self):
+        """
+        Fecha e apaga o banco.
+        """
+        if self._fechar is not None:
+            self._fechar()
+
+def _apagar_banco(banco, caminho):
+    banco.close()
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(caminho)
+
+class TabelaDespejada:
+    """
+    Tabela de símbolos guardada em um ArmazemSimbolos, com a mesma interface da TabelaSimbolos.
+
+    Se um lexema está na tabela é decidido pelo índice de resolução do analisador, sem consultar
+    o armazém: assim, declarar um lexema novo em uma tabela despejada não custa uma leitura do banco.
+
+    Args:
+        armazem (ArmazemSimbolos): Onde os símbolos estão.
+        escopo (int): O número do escopo no armazém.
+        tamanho (int): O número de símbolos da tabela.
+        vinculos (dict[str, list[int]]): O índice de resolução do analisador (ver AnalisadorSemantico._vinculos).
+        profundidade (int): A posição da tabela na pilha de escopos.
+    """
+    __slots__ = ("_armazem", "escopo", "_tamanho", "_vinculos", "_profundidade")
+
+    def __init__(self, armazem, escopo, tamanho, vinculos, profundidade):
+        self._armazem = armazem
+        self.escopo = escopo
+        self._tamanho = tamanho
+        self._vinculos = vinculos
+        self._profundidade = profundidade
+
+    def __len__(self):
+        return self._tamanho
+
+    def adicionar(self, lexema, tipo, valor=None):
+        if self.tem_simbolo(lexema):
+            return
+        self._armazem.inserir(self.escopo, lexema, self._tamanho, tipo, valor)
+        self._tamanho += 1
+
+    def obter_tipo(self, lexema):
+        entrada = self._armazem.obter(self.escopo, lexema)
+        return entrada[1] if entrada is not None else None
+
+    def obter_valor(self, lexema):
+        entrada = self._armazem.obter(self.escopo, lexema)
+        return entrada[2] if entrada is not None else None
+
+    def atualizar_valor(self, lexema, novo_valor):
+        entrada = self._armazem.obter(self.escopo, lexema)
+        if entrada is not None:
+            entrada[2] = novo_valor
+            entrada[3] = True
+
+    def tem_simbolo(self, lexema):
+        profundidades = self._vinculos.get(lexema)
+        return profundidades is not None and self._profundidade in profundidades
+
+    def itens(self):
+        return self._armazem.itens(self.escopo)
+
+class AnalisadorMemoriaLimitada(AnalisadorSemantico):
+    """
+    AnalisadorSemantico que mantém no máximo cerca de `orcamento` símbolos em memória.
+
+    As tabelas em memória ocupam até 3/4 do orçamento, e o cache do armazém o restante. Quando
+    uma declaração faz as tabelas passarem da sua parte, as tabelas acessadas há mais tempo
+    (em geral as dos escopos externos) são despejadas no armazém até sobrar 3/4 dela; a
+    tabela do escopo atual só é despejada se for a única. A execução é a mesma, com os
+    mesmos PRINTs, erros e eventos; só muda onde os símbolos ficam guardados.
+
+    Args:
+        rastreador (Rastreador, optional): O rastreador que recebe os eventos.
+        saida (Saida, optional): O destino dos PRINTs.
+        orcamento (int, optional): Número de símbolos mantidos em memória.
+        diretorio (str, optional): Onde criar o banco dos símbolos despejados.
+
+    Attributes:
+        armazem (ArmazemSimbolos): O armazém das tabelas despejadas, com as estatísticas.
+        pico_residentes (int): O maior número de símbolos em tabelas em memória durante a execução.
+    """
+    def __init__(self, rastreador:Rastreador=None, saida:Saida=None, orcamento=1_000_000, diretorio=None):
+        super().__init__(rastreador, saida)
+        self.armazem = ArmazemSimbolos(orcamento // FRACAO_CACHE, diretorio)
+        self._limite_tabelas = max(1, orcamento - self.armazem.tamanho_cache)
+        self._residentes = 0
+        self.pico_residentes = 0
+        # Para cada tabela da pilha, quando ela foi acessada pela última vez (contador de acessos)
+        self._acessos:list[int] = []
+        self._relogio = 0
+
+    def abrir_escopo(self, nome_bloco=""):
+        super().abrir_escopo(nome_bloco)
+        self._acessos.append(self._relogio)
+
+    def fechar_escopo(self, nome_bloco=""):
+        pilha = self.pilha_escopo
+        tamanho = len(pilha)
+        tabela = pilha[-1] if pilha else None
+        super().fechar_escopo(nome_bloco)
+        if len(pilha) < tamanho:
+            self._acessos.pop()
+            if isinstance(tabela, TabelaDespejada):
+                self.armazem.remover(tabela.escopo)
+            else:
+                self._residentes -= len(tabela)
+
+    def _resolver(self, lexema):
+        profundidades = self._vinculos.get(lexema)
+        if not profundidades:
+            return None
+        posicao = profundidades[-1]
+        self._relogio += 1
+        self._acessos[posicao] = self._relogio
+        return posicao
+
+    def obter_valor(self, lexema):
+        profundidades = self._vinculos.get(lexema)
+        if profundidades:
+            self._relogio += 1
+            self._acessos[profundidades[-1]] = self._relogio
+        return super().obter_valor(lexema)
+
+    def _vincular(self, lexema):
+        super()._vincular(lexema)
+        self._relogio += 1
+        self._acessos[-1] = self._relogio
+        if isinstance(self.pilha_escopo[-1], TabelaSimbolos):
+            self._residentes += 1
+            if self._residentes > self.pico_residentes:
+                self.pico_residentes = self._residentes
+            if self._residentes > self._limite_tabelas:
+                # Aqui a declaração já terminou, e a tabela do escopo atual pode ser trocada na pilha
+                self._despejar()
+
+    def _despejar(self):
+        """
+        Despeja as tabelas em memória acessadas há mais tempo até sobrar 3/4 do limite das tabelas.
+        """
+        pilha, acessos = self.pilha_escopo, self._acessos
+        alvo = self._limite_tabelas * QUARTOS_APOS_DESPEJO // 4
+        candidatas = sorted(
+            (posicao for posicao, tabela in enumerate(pilha) if isinstance(tabela, TabelaSimbolos) and len(tabela)),
+            key=acessos.__getitem__,
+        )
+        # A tabela do escopo atual, a mais acessada, fica por último
+        topo = len(pilha) - 1
+        if topo in candidatas:
+            candidatas.remove(topo)
+            candidatas.append(topo)
+        for posicao in candidatas:
+            if self._residentes <= alvo:
+                break
+            tabela = pilha[posicao]
+            pilha[posicao] = TabelaDespejada(self.armazem, self.armazem.despejar(tabela), len(tabela), self._vinculos, posicao)
+            self._residentes -= len(tabela)
+
+    def fechar(self):
+        """
+        Fecha e apaga o banco dos símbolos despejados.
+        """
+        self.armazem.fechar()
+
+def formatar_estatisticas(analisador):
+    """
+    Resume o despejo e o cache de uma execução com memória limitada, em uma linha.
+
+    Args:
+        analisador (AnalisadorMemoriaLimitada): O analisador, após a execução.
+
+    Returns:
+        str: O resumo, terminado em quebra de linha.
+    """
+    estatisticas = analisador.armazem.estatisticas
+    consultas = estatisticas["acertos"] + estatisticas["faltas"]
+    acertos = f"{100 * estatisticas['acertos'] / consultas:.1f}%" if consultas else "-"
+    return (
+        f"Memória limitada: {estatisticas['tabelas_despejadas']} tabela(s) despejada(s) em disco "
+        f"({estatisticas['simbolos_despejados']} símbolo(s)); cache: {estatisticas['acertos']} acerto(s), "
+        f"{estatisticas['faltas']} falta(s) ({acertos} de acertos), {estatisticas['gravacoes']} gravação(ões); "
+        f"pico de {analisador.pico_residentes} símbolo(s) em tabelas em memória.\n"
+    )
@@ -0,0 +1,262 @@
+import contextlib
+import functools
+import json
+import logging
+import time
+import tracemalloc
+from collections import Counter
+
+import rastreamento
+from rastreamento import Coletor
+
+# Métodos do analisador cronometrados pelo perfilador, agrupados por componente
+COMPONENTES = {
+    "consultas": ("verificar_tipo", "obter_valor", "verificar_declaracao", "atualizar_valor"),
+    "conversao": ("_tratar_valor",),
+}
+
+class Perfilador(Coletor):
+    """
+    Coletor que reúne estatísticas de desempenho de uma execução (modo --profile).
+
+    Recebe apenas os eventos de que precisa (consultas, declarações, atribuições e
+    abertura/fechamento de escopo); o tempo de cada instrução é informado pelo
+    analisador via `registrar_instrucao` e o tempo de cada componente é medido
+    envolvendo os métodos do analisador em `acompanhar`. Sem o perfilador, nada
+    disso é executado.
+
+    Args:
+        memoria (bool, optional): Se True, mede a memória de cada fase com tracemalloc.
+    """
+    tipos_eventos = frozenset((
+        rastreamento.ESCOPO_ABERTO, rastreamento.ESCOPO_FECHADO, rastreamento.DECLARACAO,
+        rastreamento.ATRIBUICAO, rastreamento.CONSULTA, rastreamento.VERIFICACAO,
+    ))
+
+    def __init__(self, memoria=True):
+        super().__init__(logging.DEBUG)
+        self.memoria = memoria
+        # nome da instrução -> [quantidade, tempo total (ns), histograma log2 do tempo]
+        self.instrucoes:dict[str, list] = {}
+        # operação de busca -> Counter(distância em escopos, None se não encontrado)
+        self.distancias:dict[str, Counter] = {}
+        self.lexemas = Counter()
+        self.profundidade_maxima = 0
+        self.tamanhos_tabela = Counter()
+        # componente -> [chamadas, tempo total (ns)]
+        self.componentes:dict[str, list] = {}
+        self.fases:dict[str, dict] = {}
+        # Estatísticas da passagem de inferência (ProgramaInferido.estatisticas), se houve
+        self.inferencia = None
+        self._analisador = None
+
+    def acompanhar(self, analisador):
+        """
+        Passa a acompanhar um analisador: guarda sua pilha de escopos e cronometra seus componentes.
+
+        Args:
+            analisador (AnalisadorSemantico): O analisador a ser acompanhado.
+        """
+        self._analisador = analisador
+        for componente, metodos in COMPONENTES.items():
+            for metodo in metodos:
+                setattr(analisador, metodo, self._cronometrar(componente, getattr(analisador, metodo)))
+        analisador.saida.escrever = self._cronometrar("saida", analisador.saida.escrever)
+
+    def _cronometrar(self, componente, funcao):
+        contador = self.componentes.setdefault(componente, [0, 0])
+        relogio = time.perf_counter_ns
+
+        @functools.wraps(funcao)
+        def cronometrada(*args):
+            inicio = relogio()
+            try:
+                return funcao(*args)
+            finally:
+                contador[0] += 1
+                contador[1] += relogio() - inicio
+        return cronometrada
+
+    @contextlib.contextmanager
+    def fase(self, nome):
+        """
+        Mede o tempo e, se habilitado, a memória alocada e o pico de memória de uma fase.
+
+        Args:
+            nome (str): O nome da fase.
+        """
+        if self.memoria:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            antes, _ = tracemalloc.get_traced_memory()
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            resultado = {"tempo": time.perf_counter() - inicio}
+            if self.memoria:
+                atual, pico = tracemalloc.get_traced_memory()
+                resultado.update(memoria_retida=atual - antes, memoria_pico=pico - antes)
+            self.fases[nome] = resultado
+
+    def registrar_instrucao(self, nome, nanossegundos):
+        """
+        Contabiliza a execução de uma instrução.
+
+        Args:
+            nome (str): O nome da instrução (BLOCO, FIM, PRINT...).
+            nanossegundos (int): O tempo gasto na instrução.
+        """
+        estatistica = self.instrucoes.get(nome)
+        if estatistica is None:
+            estatistica = self.instrucoes[nome] = [0, 0, [0] * 64]
+        estatistica[0] += 1
+        estatistica[1] += nanossegundos
+        # O balde i contém os tempos em [2**(i-1), 2**i) ns
+        estatistica[2][min(nanossegundos.bit_length(), 63)] += 1
+
+    def registrar(self, evento, campos):
+        if evento == rastreamento.CONSULTA:
+            self.distancias.setdefault(campos[0], Counter())[campos[3]] += 1
+            self.lexemas[campos[1]] += 1
+        elif evento == rastreamento.VERIFICACAO:
+            self.distancias.setdefault("declaracao", Counter())[campos[2]] += 1
+            self.lexemas[campos[0]] += 1
+        elif evento in (rastreamento.DECLARACAO, rastreamento.ATRIBUICAO):
+            self.lexemas[campos[0]] += 1
+        elif self._analisador is not None:
+            pilha = self._analisador.pilha_escopo
+            if evento == rastreamento.ESCOPO_ABERTO:
+                # O evento é emitido antes de a nova tabela ser empilhada
+                self.profundidade_maxima = max(self.profundidade_maxima, len(pilha) + 1)
+            elif pilha:
+                self.tamanhos_tabela[len(pilha[-1])] += 1
+
+    def relatorio(self, mais_frequentes=10):
+        """
+        Monta o relatório do perfil.
+
+        Args:
+            mais_frequentes (int, optional): Quantos lexemas mais usados são listados.
+
+        Returns:
+            dict: As estatísticas reunidas, serializáveis em JSON.
+        """
+        instrucoes = {}
+        for nome, (quantidade, total, histograma) in sorted(self.instrucoes.items()):
+            instrucoes[nome] = {
+                "quantidade": quantidade,
+                "tempo_total": total / 1e9,
+                "media_ns": total / quantidade,
+                "p50_ns": _percentil(histograma, quantidade, 0.5),
+                "p99_ns": _percentil(histograma, quantidade, 0.99),
+                "histograma_log2_ns": {f"<{2 ** i}": n for i, n in enumerate(histograma) if n},
+            }
+        tamanhos = self.tamanhos_tabela
+        quantidade_tabelas = sum(tamanhos.values())
+        return {
+            "fases": self.fases,
+            "instrucoes": instrucoes,
+            "componentes": {
+                nome: {"chamadas": chamadas, "tempo_total": total / 1e9}
+                for nome, (chamadas, total) in self.componentes.items()
+            },
+            "distancias": {
+                operacao: {"nao_encontrado" if distancia is None else str(distancia): n
+                           for distancia, n in sorted(contagem.items(), key=lambda item: (item[0] is None, item[0] or 0))}
+                for operacao, contagem in sorted(self.distancias.items())
+            },
+            "lexemas_mais_usados": self.lexemas.most_common(mais_frequentes),
+            "profundidade_maxima": self.profundidade_maxima,
+            "inferencia": self.inferencia,
+            "tabelas": {
+                "quantidade": quantidade_tabelas,
+                "maior": max(tamanhos, default=0),
+                "media": sum(tamanho * n for tamanho, n in tamanhos.items()) / quantidade_tabelas if quantidade_tabelas else 0,
+            },
+        }
+
+    def gravar_json(self, arquivo):
+        """
+        Grava o relatório em um arquivo JSON.
+
+        Args:
+            arquivo (str): O caminho do arquivo.
+        """
+        with open(arquivo, 'w', encoding='utf-8') as destino:
+            json.dump(self.relatorio(), destino, indent=2, ensure_ascii=False)
+
+    def fechar(self):
+        if self.memoria and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+def _percentil(histograma, quantidade, fracao):
+    """
+    Estima um percentil a partir de um histograma log2, pelo limite superior do balde.
+
+    Args:
+        histograma (list[int]): As contagens por balde.
+        quantidade (int): O total de amostras.
+        fracao (float): O percentil desejado, entre 0 e 1.
+
+    Returns:
+        int: O limite superior (em ns) do balde que contém o percentil.
+    """
+    alvo = fracao * quantidade
+    acumulado = 0
+    for indice, contagem in enumerate(histograma):
+        acumulado += contagem
+        if acumulado >= alvo:
+            return 2 ** indice
+    return 2 ** (len(histograma) - 1)
+
+def formatar_relatorio(relatorio):
+    """
+    Formata o relatório do perfil como tabelas de texto.
+
+    Args:
+        relatorio (dict): O relatório retornado por Perfilador.relatorio.
+
+    Returns:
+        str: O relatório em texto.
+    """
+    linhas = ["=" * 60, "Perfil da execução", "=" * 60]
+    linhas.append(f"{'fase':<26} {'tempo (s)':>10} {'retida':>10} {'pico':>10}")
+    for nome, fase in relatorio["fases"].items():
+        memoria = ""
+        if "memoria_pico" in fase:
+            memoria = f" {fase['memoria_retida'] / 2**20:>8.2f}MB {fase['memoria_pico'] / 2**20:>8.2f}MB"
+        linhas.append(f"{nome:<26} {fase['tempo']:>10.4f}{memoria}")
+
+    linhas.append("")
+    linhas.append(f"{'instrução':<12} {'quantidade':>10} {'total (s)':>10} {'média (µs)':>11} {'p50 (µs)':>9} {'p99 (µs)':>9}")
+    for nome, estatistica in relatorio["instrucoes"].items():
+        linhas.append(
+            f"{nome:<12} {estatistica['quantidade']:>10} {estatistica['tempo_total']:>10.4f} "
+            f"{estatistica['media_ns'] / 1000:>11.2f} {estatistica['p50_ns'] / 1000:>9.2f} {estatistica['p99_ns'] / 1000:>9.2f}"
+        )
+
+    linhas.append("")
+    linhas.append(f"{'componente (inclusivo)':<26} {'chamadas':>10} {'total (s)':>10}")
+    for nome, componente in relatorio["componentes"].items():
+        linhas.append(f"{nome:<26} {componente['chamadas']:>10} {componente['tempo_total']:>10.4f}")
+
+    linhas.append("")
+    linhas.append("Distância das buscas (escopos acima do atual):")
+    for operacao, distancias in relatorio["distancias"].items():
+        linhas.append(f"  {operacao:<12} " + ", ".join(f"{distancia}: {n}" for distancia, n in distancias.items()))
+
+    linhas.append("")
+    linhas.append("Lexemas mais usados: " + ", ".join(f"{lexema} ({n})" for lexema, n in relatorio["lexemas_mais_usados"]))
+    tabelas = relatorio["tabelas"]
+    linhas.append(f"Profundidade máxima de escopos: {relatorio['profundidade_maxima']}")
+    linhas.append(f"Tabelas fechadas: {tabelas['quantidade']} (maior: {tabelas['maior']} símbolos, média: {tabelas['media']:.1f})")
+    inferencia = relatorio.get("inferencia")
+    if inferencia:
+        linhas.append(
+            f"Inferência de tipos: {inferencia['literais']} literais convertidos uma vez ({inferencia['conversoes_removidas']} conversões removidas), "
+            f"{inferencia['verificacoes_removidas']} de {inferencia['verificacoes']} verificações de tipo removidas"
+        )
+    linhas.append("=" * 60)
+    return "\n".join(linhas) + "\n"
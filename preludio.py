@@ -0,0 +1,208 @@
+import rastreamento
+from main import AnalisadorSemantico, ProcessadorSemantico, TabelaSimbolos
+from rastreamento import Rastreador
+from saida import Saida
+
+# Prelúdio: um programa executado uma única vez, cujo estado final (pilha de escopos, nomes dos
+# blocos e índice de resolução) é congelado e serve de ponto de partida para outros programas.
+# Cada programa parte de um AnalisadorPreludio, que compartilha as tabelas e o índice do
+# prelúdio e só copia o que altera: as tabelas do prelúdio recebem as alterações em tabelas
+# próprias na frente delas, e as entradas do índice são copiadas na primeira vez que o programa
+# as altera. Criar o analisador custa só a profundidade da pilha, e não o tamanho do prelúdio.
+#
+# A execução é a mesma da do prelúdio seguido do programa em um único arquivo.
+
+_INALTERADO = object()
+
+class TabelaCompartilhada:
+    """
+    Tabela de símbolos do prelúdio vista por um programa, com a mesma interface da TabelaSimbolos.
+
+    A tabela do prelúdio não é alterada: os novos valores dos seus símbolos e os símbolos
+    declarados pelo programa ficam à parte, e são consultados antes dela.
+
+    Args:
+        base (TabelaSimbolos): A tabela congelada do prelúdio.
+    """
+    __slots__ = ("base", "_alterados", "_novos")
+
+    def __init__(self, base):
+        self.base = base
+        self._alterados = {}
+        self._novos = TabelaSimbolos()
+
+    def __len__(self):
+        return len(self.base) + len(self._novos)
+
+    def adicionar(self, lexema, tipo, valor=None):
+        if not self.base.tem_simbolo(lexema):
+            self._novos.adicionar(lexema, tipo, valor)
+
+    def obter_tipo(self, lexema):
+        tipo = self.base.obter_tipo(lexema)
+        return tipo if tipo is not None else self._novos.obter_tipo(lexema)
+
+    def obter_valor(self, lexema):
+        valor = self._alterados.get(lexema, _INALTERADO)
+        if valor is not _INALTERADO:
+            return valor
+        if self.base.tem_simbolo(lexema):
+            return self.base.obter_valor(lexema)
+        return self._novos.obter_valor(lexema)
+
+    def atualizar_valor(self, lexema, novo_valor):
+        if self.base.tem_simbolo(lexema):
+            self._alterados[lexema] = novo_valor
+        else:
+            self._novos.atualizar_valor(lexema, novo_valor)
+
+    def tem_simbolo(self, lexema):
+        return self.base.tem_simbolo(lexema) or self._novos.tem_simbolo(lexema)
+
+    def itens(self):
+        alterados = self._alterados
+        for lexema, tipo, valor in self.base.itens():
+            yield lexema, tipo, alterados.get(lexema, valor)
+        yield from self._novos.itens()
+
+class Preludio:
+    """
+    O estado dos escopos ao final de um prelúdio, congelado e compartilhado pelos programas
+    que partem dele (ver AnalisadorPreludio).
+
+    Os PRINTs, erros e eventos do prelúdio são emitidos uma única vez, na sua execução.
+
+    Args:
+        analisador (AnalisadorSemantico): O analisador que executou o prelúdio. Ele passa a
+            pertencer ao Preludio e não deve mais ser usado.
+
+    Attributes:
+        nome_blocos (tuple[str]): Os nomes dos blocos abertos ao final do prelúdio.
+        tabelas (tuple[TabelaSimbolos]): As tabelas da pilha de escopos, da mais externa para a mais interna.
+        vinculos (dict[str, list[int]]): O índice de resolução ao final do prelúdio.
+    """
+    def __init__(self, analisador:AnalisadorSemantico):
+        self.nome_blocos = tuple(analisador.nome_blocos)
+        self.tabelas = tuple(analisador.pilha_escopo)
+        self.vinculos = analisador._vinculos
+
+    @classmethod
+    def executar(cls, programa, rastreador:Rastreador=None, saida:Saida=None):
+        """
+        Executa um prelúdio já processado e congela o estado final dele.
+
+        Args:
+            programa (ProgramaCompacto): O prelúdio.
+            rastreador (Rastreador, optional): O rastreador que recebe os eventos do prelúdio.
+            saida (Saida, optional): O destino dos PRINTs do prelúdio.
+
+        Returns:
+            Preludio: O estado congelado.
+        """
+        analisador = AnalisadorSemantico(rastreador, saida)
+        analisador.executar_programa(programa)
+        return cls(analisador)
+
+    @classmethod
+    def do_arquivo(cls, nome_arquivo, rastreador:Rastreador=None, saida:Saida=None):
+        """
+        Processa e executa um arquivo .cic como prelúdio.
+
+        Args:
+            nome_arquivo (str): O caminho do prelúdio.
+            rastreador (Rastreador, optional): O rastreador que recebe os eventos do prelúdio.
+            saida (Saida, optional): O destino dos PRINTs do prelúdio.
+
+        Returns:
+            Preludio: O estado congelado.
+
+        Raises:
+            FileNotFoundError: Se o arquivo não existir.
+        """
+        rastreador = rastreador if rastreador is not None else Rastreador.do_logging()
+        programa = ProcessadorSemantico(rastreador).compilar_arquivo(nome_arquivo)
+        return cls.executar(programa, rastreador, saida)
+
+    def analisador(self, rastreador:Rastreador=None, saida:Saida=None):
+        """
+        Cria um analisador que parte do estado do prelúdio.
+
+        Args:
+            rastreador (Rastreador, optional): O rastreador que recebe os eventos do programa.
+            saida (Saida, optional): O destino dos PRINTs do programa.
+
+        Returns:
+            AnalisadorPreludio: O analisador, independente dos demais criados a partir deste prelúdio.
+        """
+        return AnalisadorPreludio(self, rastreador, saida)
+
+class AnalisadorPreludio(AnalisadorSemantico):
+    """
+    AnalisadorSemantico que parte do estado de um Preludio, sem copiá-lo.
+
+    As tabelas do prelúdio entram na pilha como TabelaCompartilhada. O índice de resolução
+    começa vazio: as consultas leem também o do prelúdio, e a entrada de um lexema do
+    prelúdio só é copiada para ele quando o programa a altera. Se o programa fechar um escopo do prelúdio, o restante do índice é copiado
+    de uma vez e os lexemas daquele escopo saem dele, como em um AnalisadorSemantico.
+
+    Os programas não devem passar pela inferência de tipos (inferencia.inferir_tipos), que
+    supõe escopos vazios no início e não conhece as declarações do prelúdio.
+
+    Args:
+        preludio (Preludio): O estado de partida.
+        rastreador (Rastreador, optional): O rastreador que recebe os eventos.
+        saida (Saida, optional): O destino dos PRINTs.
+    """
+    def __init__(self, preludio:Preludio, rastreador:Rastreador=None, saida:Saida=None):
+        super().__init__(rastreador, saida)
+        self.nome_blocos = list(preludio.nome_blocos)
+        self.pilha_escopo = [TabelaCompartilhada(tabela) for tabela in preludio.tabelas]
+        # Os lexemas do prelúdio não estão aqui; fechar_escopo os obtém da tabela compartilhada
+        self._desfazer = [[] for _ in preludio.tabelas]
+        self._vinculos_preludio = preludio.vinculos
+
+    def fechar_escopo(self, nome_bloco=""):
+        pilha = self.pilha_escopo
+        tabela = pilha[-1] if pilha else None
+        if type(tabela) is TabelaCompartilhada and len(pilha) > 1:
+            # Daqui em diante as profundidades do prelúdio deixam de valer: o índice inteiro é
+            # copiado uma vez, e o analisador segue como um AnalisadorSemantico comum
+            vinculos = self._vinculos
+            for lexema, profundidades in self._vinculos_preludio.items():
+                if lexema not in vinculos:
+                    vinculos[lexema] = profundidades[:]
+            self._vinculos_preludio = {}
+            self._desfazer[-1].extend(lexema for lexema, _, _ in tabela.base.itens())
+        super().fechar_escopo(nome_bloco)
+
+    def _vincular(self, lexema):
+        vinculos = self._vinculos
+        profundidades = vinculos.get(lexema)
+        if profundidades is None:
+            do_preludio = self._vinculos_preludio.get(lexema)
+            profundidades = vinculos[lexema] = do_preludio[:] if do_preludio is not None else []
+        profundidade = len(self.pilha_escopo) - 1
+        if not profundidades or profundidades[-1] != profundidade:
+            profundidades.append(profundidade)
+            self._desfazer[-1].append(lexema)
+
+    def _resolver(self, lexema):
+        profundidades = self._vinculos.get(lexema)
+        if profundidades is None:
+            profundidades = self._vinculos_preludio.get(lexema)
+        return profundidades[-1] if profundidades else None
+
+    def obter_valor(self, lexema):
+        profundidades = self._vinculos.get(lexema)
+        if profundidades is None:
+            profundidades = self._vinculos_preludio.get(lexema, ())
+        valor = posicao = None
+        for i in range(len(profundidades) - 1, -1, -1):
+            valor = self.pilha_escopo[profundidades[i]].obter_valor(lexema)
+            if valor is not None:
+                posicao = profundidades[i]
+                break
+        if self.rastreador.consulta:
+            topo = len(self.pilha_escopo) - 1
+            self.rastreador.emitir(rastreamento.CONSULTA, "valor", lexema, posicao == topo, None if posicao is None else topo - posicao)
+        return valor
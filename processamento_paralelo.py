@@ -0,0 +1,140 @@
+import io
+import mmap
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import rastreamento
+from main import ProcessadorSemantico
+from programa_compacto import ProgramaCompacto, traducao_identica, traduzir_indices
+from rastreamento import ColetorMemoria, Rastreador
+
+# O processamento de uma linha não depende das demais, então o arquivo pode ser dividido em
+# trechos terminados em quebra de linha e cada trecho processado em um processo à parte. Os
+# trechos compactados voltam na ordem do arquivo e são concatenados em um único programa.
+#
+# Trechos menores que este tamanho não compensam o custo de enviá-los a outro processo
+TAMANHO_MINIMO_TRECHO = 1 << 20
+# Trechos por processo: com mais trechos que processos, um processo que termina antes pega outro
+TRECHOS_POR_PROCESSO = 4
+# Em arquivos de vários GB os trechos são limitados a este tamanho, que cada processo decodifica de uma vez
+TAMANHO_MAXIMO_TRECHO = 1 << 26
+
+def cpus_disponiveis():
+    """
+    Returns:
+        int: O número de CPUs que este processo pode usar (que pode ser menor que o da máquina).
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def dividir_trechos(mapa, quantidade):
+    """
+    Divide um arquivo em trechos de tamanho parecido, cada um terminado em uma quebra de linha.
+
+    Args:
+        mapa (mmap.mmap or bytes): O conteúdo do arquivo.
+        quantidade (int): O número desejado de trechos.
+
+    Returns:
+        list[tuple[int, int]]: (início, fim) de cada trecho, em bytes, cobrindo todo o arquivo.
+    """
+    tamanho = len(mapa)
+    limites = [0]
+    for parte in range(1, quantidade):
+        quebra = mapa.find(b"\n", max(tamanho * parte // quantidade, limites[-1]))
+        if quebra < 0 or quebra + 1 >= tamanho:
+            break
+        if quebra + 1 > limites[-1]:
+            limites.append(quebra + 1)
+    limites.append(tamanho)
+    return list(zip(limites, limites[1:]))
+
+def processar_trecho(nome_arquivo, inicio, fim, eventos=()):
+    """
+    Processa um trecho de um arquivo para a representação compacta.
+
+    Args:
+        nome_arquivo (str): O caminho do arquivo .cic.
+        inicio (int): A posição, em bytes, do início do trecho (o início de uma linha).
+        fim (int): A posição, em bytes, do fim do trecho (logo após uma quebra de linha, ou o fim do arquivo).
+        eventos (Iterable[int], optional): Os tipos de evento do processamento a guardar.
+
+    Returns:
+        tuple: As colunas do trecho (lexemas, opcodes, operandos, tipos, valores) e a lista
+            de eventos (evento, campos) emitidos, na ordem.
+    """
+    with open(nome_arquivo, 'rb') as arquivo, mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+        texto = mapa[inicio:fim].decode('utf-8')
+    coletor = ColetorMemoria()
+    coletor.tipos_eventos = frozenset(eventos)
+    processador = ProcessadorSemantico(Rastreador([coletor]))
+    # Lido como um arquivo de texto, inclusive na tradução de fins de linha
+    programa = ProgramaCompacto.de_instrucoes(processador.gerar_instrucoes(io.StringIO(texto, newline=None)))
+    return programa.lexemas, programa.opcodes, programa.operandos, programa.tipos, programa.valores, coletor.eventos
+
+def _processar_trecho(argumentos):
+    return processar_trecho(*argumentos)
+
+def _traduzir_colunas(colunas, traducao):
+    return tuple(traduzir_indices(coluna, traducao) for coluna in colunas)
+
+def compilar_arquivo_paralelo(nome_arquivo, rastreador=None, workers=None):
+    """
+    Processa um arquivo para a representação compacta, dividindo-o entre vários processos.
+
+    O resultado e os eventos emitidos são os mesmos de ProcessadorSemantico.compilar_arquivo:
+    os erros de formato de cada trecho são guardados pelo processo que o processou e
+    reemitidos na ordem do arquivo. Se algum coletor recebe os eventos de cada linha
+    (-w, -id, -d ou um arquivo de rastro), se o arquivo for pequeno demais para ser
+    dividido ou se houver uma só CPU disponível, o processamento é feito neste processo.
+
+    A parte feita neste processo (unir as tabelas de lexemas e receber os trechos) custa
+    cerca de 10% do processamento sequencial, e só é compensada com processos rodando de
+    fato ao mesmo tempo: com mais processos que CPUs, o pool só acrescenta esse custo.
+
+    Args:
+        nome_arquivo (str): O caminho do arquivo .cic.
+        rastreador (Rastreador, optional): O rastreador que recebe os eventos do processamento.
+        workers (int, optional): Número de processos, limitado às CPUs disponíveis. Padrão: número de CPUs.
+
+    Returns:
+        ProgramaCompacto: O programa compactado.
+    """
+    rastreador = rastreador if rastreador is not None else Rastreador.do_logging()
+    cpus = cpus_disponiveis()
+    workers = min(workers or cpus, cpus)
+    with open(nome_arquivo, 'rb') as arquivo:
+        tamanho = os.fstat(arquivo.fileno()).st_size
+        quantidade = min(max(workers * TRECHOS_POR_PROCESSO, -(-tamanho // TAMANHO_MAXIMO_TRECHO)), tamanho // TAMANHO_MINIMO_TRECHO)
+        if workers == 1 or quantidade < 2 or rastreador.linha:
+            trechos = None
+        else:
+            with mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+                trechos = dividir_trechos(mapa, quantidade)
+    if not trechos or len(trechos) < 2:
+        return ProcessadorSemantico(rastreador).compilar_arquivo(nome_arquivo)
+
+    # O ProcessadorSemantico só emite LINHA (tratado acima) e ERRO durante o processamento
+    eventos = (rastreamento.ERRO,) if rastreador.erro else ()
+    programa = ProgramaCompacto()
+    with ProcessPoolExecutor(min(workers, len(trechos))) as executor:
+        tarefas = [(nome_arquivo, inicio, fim, eventos) for inicio, fim in trechos]
+        traduzidos = []
+        for lexemas, opcodes, *indices, eventos_trecho in executor.map(_processar_trecho, tarefas):
+            for evento, campos in eventos_trecho:
+                rastreador.emitir(evento, *campos)
+            # Só a tabela de lexemas é unificada aqui, em ordem; os índices de cada trecho são
+            # traduzidos para ela nos processos do pool, e não neste, que seria o gargalo
+            traducao = programa.internar_lexemas(lexemas)
+            if traducao_identica(traducao):
+                traduzido = Future()
+                traduzido.set_result(indices)
+            else:
+                traduzido = executor.submit(_traduzir_colunas, indices, traducao)
+            traduzidos.append((opcodes, traduzido))
+        for opcodes, traduzido in traduzidos:
+            programa.estender_colunas(opcodes, *traduzido.result())
+    if programa and rastreador.processado:
+        rastreador.emitir(rastreamento.PROCESSADO, len(programa))
+    return programa
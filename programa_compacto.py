@@ -0,0 +1,194 @@
+from array import array
+
+# Códigos de operação das instruções. A ordem define a posição de cada
+# instrução na tabela de despacho do AnalisadorSemantico.
+BLOCO, FIM, PRINT, ATRIBUICAO, DECLARACAO, INVALIDA = range(6)
+
+NOMES_OPCODES = ("BLOCO", "FIM", "PRINT", "ATRIBUICAO", "DECLARACAO", "INVALIDA")
+OPCODES = {nome: opcode for opcode, nome in enumerate(NOMES_OPCODES)}
+
+def operandos(instrucao):
+    """
+    Extrai os operandos de uma instrução no formato de dicionário.
+
+    Args:
+        instrucao (dict): A instrução produzida pelo ProcessadorSemantico.
+
+    Returns:
+        tuple: (lexema ou nome do bloco, tipo, valor), com None nos operandos ausentes.
+    """
+    return (
+        instrucao.get("nome_bloco", instrucao.get("lexema")),
+        instrucao.get("tipo_declarado", instrucao.get("tipo")),
+        instrucao.get("valor"),
+    )
+
+def traduzir_indices(coluna, traducao):
+    """
+    Traduz uma coluna de índices de uma tabela de lexemas para outra.
+
+    Args:
+        coluna (Iterable[int]): Os índices na tabela original.
+        traducao (list[int]): O índice na nova tabela de cada posição da original
+            (ver ProgramaCompacto.internar_lexemas).
+
+    Returns:
+        array: Os índices na nova tabela.
+    """
+    return array('I', map(traducao.__getitem__, coluna))
+
+def traducao_identica(traducao):
+    """
+    Indica se uma tradução de índices mantém todas as posições.
+
+    Args:
+        traducao (list[int]): A tradução (ver ProgramaCompacto.internar_lexemas).
+
+    Returns:
+        bool: True se cada posição for traduzida para ela mesma.
+    """
+    return traducao == list(range(len(traducao)))
+
+class ProgramaCompacto:
+    """
+    Representação compacta de uma sequência de instruções.
+
+    Cada instrução ocupa uma posição em colunas paralelas: o código de operação
+    em um array de bytes e os três operandos como índices para uma tabela única
+    de lexemas. O índice 0 da tabela é reservado para operandos ausentes (None).
+    """
+    def __init__(self):
+        self.lexemas:list = [None]
+        self.opcodes = array('B')
+        self.operandos = array('I')
+        self.tipos = array('I')
+        self.valores = array('I')
+        self._indices = {}
+
+    @classmethod
+    def de_instrucoes(cls, instrucoes):
+        """
+        Constrói um programa compacto a partir de instruções no formato de dicionário.
+
+        Args:
+            instrucoes (Iterable[dict]): As instruções a serem compactadas.
+
+        Returns:
+            ProgramaCompacto: O programa compactado.
+        """
+        programa = cls()
+        for instrucao in instrucoes:
+            programa.adicionar(instrucao)
+        return programa
+
+    @classmethod
+    def de_colunas(cls, lexemas, opcodes, operandos, tipos, valores):
+        """
+        Constrói um programa compacto a partir de colunas já existentes, sem copiá-las.
+
+        As colunas podem ser arrays ou quaisquer sequências indexáveis de inteiros,
+        como memoryviews sobre um arquivo mapeado em memória.
+
+        Args:
+            lexemas (list): A tabela de lexemas, com None no índice 0.
+            opcodes: Os códigos de operação.
+            operandos: Os índices do primeiro operando de cada instrução.
+            tipos: Os índices do tipo de cada instrução.
+            valores: Os índices do valor de cada instrução.
+
+        Returns:
+            ProgramaCompacto: O programa construído.
+        """
+        programa = cls()
+        programa.lexemas = lexemas
+        programa.opcodes, programa.operandos, programa.tipos, programa.valores = opcodes, operandos, tipos, valores
+        programa._indices = {lexema: indice for indice, lexema in enumerate(lexemas) if indice}
+        return programa
+
+    def _internar(self, texto):
+        """
+        Obtém o índice de um texto na tabela de lexemas, adicionando-o se necessário.
+
+        Args:
+            texto (str or None): O texto a ser internado.
+
+        Returns:
+            int: O índice do texto na tabela de lexemas.
+        """
+        if texto is None:
+            return 0
+        indice = self._indices.get(texto)
+        if indice is None:
+            indice = self._indices[texto] = len(self.lexemas)
+            self.lexemas.append(texto)
+        return indice
+
+    def adicionar(self, instrucao):
+        """
+        Adiciona uma instrução no formato de dicionário ao final do programa.
+
+        Args:
+            instrucao (dict): A instrução a ser adicionada.
+        """
+        operando, tipo, valor = operandos(instrucao)
+        self.opcodes.append(OPCODES.get(instrucao["instrucao"], INVALIDA))
+        self.operandos.append(self._internar(operando))
+        self.tipos.append(self._internar(tipo))
+        self.valores.append(self._internar(valor))
+
+    def internar_lexemas(self, lexemas):
+        """
+        Acrescenta à tabela de lexemas os textos de outra tabela que ainda não estão nela.
+
+        Args:
+            lexemas (list): A outra tabela, com None no índice 0.
+
+        Returns:
+            list[int]: O índice nesta tabela de cada posição da outra.
+        """
+        return list(map(self._internar, lexemas))
+
+    def estender_colunas(self, opcodes, operandos, tipos, valores):
+        """
+        Acrescenta ao final do programa instruções em colunas que já usam a tabela de lexemas dele.
+
+        Args:
+            opcodes: Os códigos de operação.
+            operandos: Os índices do primeiro operando de cada instrução.
+            tipos: Os índices do tipo de cada instrução.
+            valores: Os índices do valor de cada instrução.
+        """
+        self.opcodes.extend(opcodes)
+        self.operandos.extend(operandos)
+        self.tipos.extend(tipos)
+        self.valores.extend(valores)
+
+    def __getstate__(self):
+        # Colunas sobre um arquivo mapeado (ver cache_compilado.carregar) não podem ser enviadas a
+        # outro processo, como nos pools iniciados com "spawn": são copiadas para arrays
+        estado = self.__dict__.copy()
+        estado.pop("mapa", None)
+        for nome, codigo in (("opcodes", 'B'), ("operandos", 'I'), ("tipos", 'I'), ("valores", 'I')):
+            if isinstance(estado[nome], memoryview):
+                coluna = estado[nome] = array(codigo)
+                coluna.frombytes(self.__dict__[nome].cast('B'))
+        return estado
+
+    def __len__(self):
+        return len(self.opcodes)
+
+    def __iter__(self):
+        """
+        Percorre o programa reconstruindo cada instrução no formato de dicionário.
+        """
+        lexemas = self.lexemas
+        for opcode, operando, tipo, valor in zip(self.opcodes, self.operandos, self.tipos, self.valores):
+            nome = NOMES_OPCODES[opcode]
+            if opcode in (BLOCO, FIM):
+                yield {"instrucao": nome, "nome_bloco": lexemas[operando]}
+            elif opcode == ATRIBUICAO:
+                yield {"instrucao": nome, "lexema": lexemas[operando], "tipo_declarado": lexemas[tipo], "valor": lexemas[valor]}
+            elif opcode == DECLARACAO:
+                yield {"instrucao": nome, "lexema": lexemas[operando], "tipo": lexemas[tipo]}
+            else:
+                yield {"instrucao": nome, "lexema": lexemas[operando]}
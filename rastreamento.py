@@ -0,0 +1,388 @@
+import struct
+
+# Tipos de evento. Cada evento carrega uma tupla de campos posicionais, descritos em CAMPOS.
+(LINHA, PROCESSADO, INSTRUCAO, ESCOPO_ABERTO, ESCOPO_FECHADO, TABELA,
+ DECLARACAO, ATRIBUICAO, CONSULTA, VERIFICACAO, PRINT, ERRO, CACHE) = range(13)
+
+NOMES_EVENTOS = (
+    "linha", "processado", "instrucao", "escopo_aberto", "escopo_fechado", "tabela",
+    "declaracao", "atribuicao", "consulta", "verificacao", "print", "erro", "cache",
+)
+
+CAMPOS = (
+    ("texto",),
+    ("total",),
+    ("nome", "operandos", "bloco"),
+    ("bloco",),
+    ("bloco",),
+    ("bloco", "simbolos"),
+    ("lexema", "tipo", "valor"),
+    ("lexema", "valor", "local"),
+    ("operacao", "lexema", "local", "distancia"),
+    ("lexema", "local", "distancia"),
+    ("lexema", "bloco"),
+    ("codigo", "lexema"),
+    ("situacao", "arquivo", "detalhe"),
+)
+
+# Os níveis do logging (DEBUG, ...), repetidos aqui para que importar este módulo não
+# importe o logging, que só é carregado quando algum evento vai para ele (ver ColetorConsole)
+DEBUG, INFO, WARNING, ERROR = 10, 20, 30, 40
+
+# Nível de logging a partir do qual cada evento é emitido (equivalente às flags -d/-id/-w)
+NIVEIS = (
+    WARNING, WARNING, WARNING, DEBUG, DEBUG, DEBUG,
+    DEBUG, DEBUG, INFO, DEBUG, INFO, ERROR,
+    WARNING,
+)
+
+MENSAGENS_ERRO = {
+    "instrucao_invalida": "ERRO: Instrução inválida.",
+    "formato_bloco": "ERRO: Formato inválido para BLOCO.",
+    "formato_fim": "ERRO: Formato inválido para FIM.",
+    "formato_print": "ERRO: Formato inválido para PRINT.",
+    "formato_atribuicao": "ERRO: Formato inválido para declaração ou atribuição.",
+    "redeclaracao": "ERRO SEMÂNTICO: Variável '{lexema}' já declarada neste escopo.",
+    "valor_invalido": "ERRO SEMÂNTICO: Tentativa de atribuir um valor inválido à variável '{lexema}'.",
+    "modificacao_tipo": "ERRO SEMÂNTICO: Tentativa de modificar o tipo da variável '{lexema}'.",
+    "nao_declarada": "ERRO SEMÂNTICO: Variável '{lexema}' não declarada.",
+    # Só reportados pela verificação (--check): na execução, interrompem o programa
+    "fim_sem_bloco": "ERRO: FIM sem BLOCO correspondente.",
+    "fora_de_bloco": "ERRO: Declaração da variável '{lexema}' fora de qualquer BLOCO.",
+}
+
+def mensagem_erro(codigo, lexema):
+    """
+    Obtém a mensagem legível de um erro.
+
+    Args:
+        codigo (str): O código do erro (chave de MENSAGENS_ERRO).
+        lexema (str or None): O lexema envolvido no erro, se houver.
+
+    Returns:
+        str: A mensagem do erro, sem códigos de cor.
+    """
+    return MENSAGENS_ERRO[codigo].format(lexema=lexema)
+
+class Rastreador:
+    """
+    Distribui eventos tipados do processamento para os coletores configurados.
+
+    Para cada tipo de evento há um atributo booleano (por exemplo, `rastreador.consulta`)
+    que indica se algum coletor o recebe. Os pontos de emissão testam esse atributo
+    antes de chamar `emitir`, de modo que um evento desativado não custa nada além
+    do teste: nenhuma string é montada e nenhum logging é chamado.
+    """
+    def __init__(self, coletores=()):
+        self.coletores = list(coletores)
+        self._destinos = tuple(
+            tuple(coletor for coletor in self.coletores if coletor.aceita(evento)) for evento in range(len(NIVEIS))
+        )
+        for evento, nome in enumerate(NOMES_EVENTOS):
+            setattr(self, nome, bool(self._destinos[evento]))
+
+    @classmethod
+    def do_logging(cls):
+        """
+        Cria um rastreador que envia ao console os eventos do nível atual do logging.
+
+        Returns:
+            Rastreador: O rastreador configurado.
+        """
+        import logging
+        return cls([ColetorConsole(logging.getLogger().getEffectiveLevel())])
+
+    def emitir(self, evento, *campos):
+        """
+        Envia um evento aos coletores interessados.
+
+        Args:
+            evento (int): O tipo do evento.
+            *campos: Os campos do evento, na ordem de CAMPOS[evento].
+        """
+        for coletor in self._destinos[evento]:
+            coletor.registrar(evento, campos)
+
+    def fechar(self):
+        """
+        Descarrega e fecha todos os coletores.
+        """
+        for coletor in self.coletores:
+            coletor.fechar()
+
+class Coletor:
+    """
+    Base dos coletores de eventos.
+
+    Args:
+        nivel (int): O nível de logging mínimo dos eventos recebidos.
+    """
+    # Se definido, restringe os tipos de evento recebidos, independentemente do nível
+    tipos_eventos = None
+
+    def __init__(self, nivel=DEBUG):
+        self.nivel = nivel
+
+    def aceita(self, evento):
+        """
+        Indica se o coletor recebe eventos do tipo informado.
+
+        Args:
+            evento (int): O tipo do evento.
+
+        Returns:
+            bool: True se o coletor recebe o evento.
+        """
+        return NIVEIS[evento] >= self.nivel and (self.tipos_eventos is None or evento in self.tipos_eventos)
+
+    def registrar(self, evento, campos):
+        raise NotImplementedError
+
+    def fechar(self):
+        pass
+
+class ColetorConsole(Coletor):
+    """
+    Coletor que formata os eventos como as mensagens coloridas do log e as envia ao logging.
+    """
+    def __init__(self, nivel=DEBUG):
+        super().__init__(nivel)
+        import logging
+        self._log = logging.log
+
+    def registrar(self, evento, campos):
+        for nivel, texto in formatar_evento(evento, campos):
+            self._log(nivel, texto)
+
+class ColetorFluxo(Coletor):
+    """
+    Coletor que formata os eventos como as mensagens coloridas do log e as escreve direto em um
+    fluxo de texto, sem o logging. Só as mensagens a partir do nível do coletor são escritas,
+    como faria o logging configurado nesse nível.
+
+    Args:
+        fluxo (TextIO): O destino das mensagens.
+        nivel (int): O nível de logging mínimo dos eventos recebidos.
+        formato (str): O formato de cada mensagem, com {} no lugar do texto dela.
+    """
+    def __init__(self, fluxo, nivel=DEBUG, formato="{}\n"):
+        super().__init__(nivel)
+        self._fluxo = fluxo
+        self._formato = formato
+
+    def registrar(self, evento, campos):
+        for nivel, texto in formatar_evento(evento, campos):
+            if nivel >= self.nivel:
+                self._fluxo.write(self._formato.format(texto))
+
+class ColetorMemoria(Coletor):
+    """
+    Coletor que guarda os eventos em uma lista, útil para embutir o analisador em outros programas.
+    """
+    def __init__(self, nivel=DEBUG):
+        super().__init__(nivel)
+        self.eventos:list[tuple] = []
+
+    def registrar(self, evento, campos):
+        self.eventos.append((evento, campos))
+
+class ColetorJSONL(Coletor):
+    """
+    Coletor que grava cada evento como um objeto JSON por linha.
+
+    Args:
+        arquivo (str): O caminho do arquivo de saída.
+        nivel (int): O nível de logging mínimo dos eventos recebidos.
+    """
+    def __init__(self, arquivo, nivel=DEBUG):
+        super().__init__(nivel)
+        import json
+        self._serializar = json.dumps
+        self._arquivo = open(arquivo, 'w', encoding='utf-8')
+
+    def registrar(self, evento, campos):
+        registro = {"evento": NOMES_EVENTOS[evento]}
+        registro.update(zip(CAMPOS[evento], campos))
+        if evento == ERRO:
+            registro["mensagem"] = mensagem_erro(*campos)
+        self._arquivo.write(self._serializar(registro, ensure_ascii=False) + "\n")
+
+    def fechar(self):
+        self._arquivo.close()
+
+# Formato binário: MAGICA_BINARIA, seguida de registros (evento: B, número de campos: B, campos).
+# Cada campo é um byte de tipo seguido do valor.
+MAGICA_BINARIA = b"CICT\x01"
+_NULO, _FALSO, _VERDADEIRO, _INTEIRO, _REAL, _TEXTO, _TUPLA = range(7)
+_CABECALHO_REGISTRO = struct.Struct("<BB")
+_INTEIRO_BIN = struct.Struct("<q")
+_REAL_BIN = struct.Struct("<d")
+_TAMANHO_BIN = struct.Struct("<I")
+
+def _codificar(valor, partes):
+    """
+    Codifica um campo de evento no formato binário.
+
+    Args:
+        valor: O valor do campo.
+        partes (list[bytes]): A lista onde os bytes codificados são acrescentados.
+    """
+    if valor is None:
+        partes.append(bytes((_NULO,)))
+    elif valor is True or valor is False:
+        partes.append(bytes((_VERDADEIRO if valor else _FALSO,)))
+    elif isinstance(valor, int) and -2**63 <= valor < 2**63:
+        partes.append(bytes((_INTEIRO,)) + _INTEIRO_BIN.pack(valor))
+    elif isinstance(valor, float):
+        partes.append(bytes((_REAL,)) + _REAL_BIN.pack(valor))
+    elif isinstance(valor, (tuple, list)):
+        partes.append(bytes((_TUPLA,)) + _TAMANHO_BIN.pack(len(valor)))
+        for item in valor:
+            _codificar(item, partes)
+    else:
+        texto = str(valor).encode('utf-8')
+        partes.append(bytes((_TEXTO,)) + _TAMANHO_BIN.pack(len(texto)) + texto)
+
+def _decodificar(dados, posicao):
+    """
+    Decodifica um campo do formato binário.
+
+    Args:
+        dados (bytes): Os dados do arquivo.
+        posicao (int): A posição do byte de tipo do campo.
+
+    Returns:
+        tuple: (valor decodificado, posição seguinte ao campo)
+    """
+    tipo = dados[posicao]
+    posicao += 1
+    if tipo == _NULO:
+        return None, posicao
+    if tipo in (_FALSO, _VERDADEIRO):
+        return tipo == _VERDADEIRO, posicao
+    if tipo == _INTEIRO:
+        return _INTEIRO_BIN.unpack_from(dados, posicao)[0], posicao + 8
+    if tipo == _REAL:
+        return _REAL_BIN.unpack_from(dados, posicao)[0], posicao + 8
+    (tamanho,) = _TAMANHO_BIN.unpack_from(dados, posicao)
+    posicao += 4
+    if tipo == _TEXTO:
+        return dados[posicao:posicao + tamanho].decode('utf-8'), posicao + tamanho
+    itens = []
+    for _ in range(tamanho):
+        item, posicao = _decodificar(dados, posicao)
+        itens.append(item)
+    return tuple(itens), posicao
+
+class ColetorBinario(Coletor):
+    """
+    Coletor que grava os eventos em um formato binário compacto (ver ler_binario).
+
+    Args:
+        arquivo (str): O caminho do arquivo de saída.
+        nivel (int): O nível de logging mínimo dos eventos recebidos.
+    """
+    def __init__(self, arquivo, nivel=DEBUG):
+        super().__init__(nivel)
+        self._arquivo = open(arquivo, 'wb')
+        self._arquivo.write(MAGICA_BINARIA)
+
+    def registrar(self, evento, campos):
+        partes = [_CABECALHO_REGISTRO.pack(evento, len(campos))]
+        for campo in campos:
+            _codificar(campo, partes)
+        self._arquivo.write(b"".join(partes))
+
+    def fechar(self):
+        self._arquivo.close()
+
+def ler_binario(arquivo):
+    """
+    Lê os eventos gravados por um ColetorBinario.
+
+    Args:
+        arquivo (str): O caminho do arquivo binário.
+
+    Yields:
+        tuple: (nome do evento, dict com os campos do evento)
+    """
+    with open(arquivo, 'rb') as entrada:
+        dados = entrada.read()
+    if not dados.startswith(MAGICA_BINARIA):
+        raise ValueError(f"'{arquivo}' não é um arquivo de rastro binário")
+    posicao = len(MAGICA_BINARIA)
+    while posicao < len(dados):
+        evento, quantidade = _CABECALHO_REGISTRO.unpack_from(dados, posicao)
+        posicao += _CABECALHO_REGISTRO.size
+        campos = []
+        for _ in range(quantidade):
+            campo, posicao = _decodificar(dados, posicao)
+            campos.append(campo)
+        yield NOMES_EVENTOS[evento], dict(zip(CAMPOS[evento], campos))
+
+def formatar_evento(evento, campos):
+    """
+    Formata um evento como as mensagens coloridas do log.
+
+    Args:
+        evento (int): O tipo do evento.
+        campos (tuple): Os campos do evento.
+
+    Returns:
+        list[tuple[int, str]]: Pares (nível de logging, mensagem) a serem registrados.
+    """
+    if evento == LINHA:
+        return [(WARNING, f"\033[95mProcessando linha: {campos[0]}\033[0m")]
+    if evento == PROCESSADO:
+        return [(WARNING, "\033[92mInstruções processadas com sucesso\033[0m")]
+    if evento == INSTRUCAO:
+        nome, operandos, bloco = campos
+        instrucao_formatada = f"{nome}: " + ', '.join(f"{valor}" for valor in operandos if valor)
+        if instrucao_formatada.startswith("PRINT"):
+            instrucao_formatada = f"{instrucao_formatada} no bloco {bloco}"
+        return [(WARNING, f"\033[95mExecutando instrução: {instrucao_formatada}\033[0m")]
+    if evento == ESCOPO_ABERTO:
+        return [(DEBUG, f"Abrindo bloco: {campos[0]}")]
+    if evento == ESCOPO_FECHADO:
+        return [(DEBUG, f"Fechando bloco: {campos[0]}")]
+    if evento == TABELA:
+        mensagens = [(INFO, "\033[90mImprimindo tabela de símbolos do bloco que está sendo fechado\033[0m")]
+        for lexema, tipo, valor in campos[1]:
+            mensagens.append((INFO, f"\033[90mLexema: {lexema}, Tipo: {tipo}, Valor: {valor}\033[0m"))
+        return mensagens
+    if evento == DECLARACAO:
+        lexema, tipo, valor = campos
+        return [(DEBUG, f"Adicionando variável '{lexema}' ao escopo atual com tipo '{tipo}' e valor '{valor}'")]
+    if evento == ATRIBUICAO:
+        lexema, valor, local = campos
+        onde = "no escopo atual" if local else "em escopos anteriores"
+        return [
+            (DEBUG, f"Atualizando valor do símbolo '{lexema}' {onde}"),
+            (DEBUG, f"Atualizando valor do símbolo '{lexema}' para '{valor}'"),
+        ]
+    if evento in (CONSULTA, VERIFICACAO):
+        if evento == CONSULTA:
+            operacao, lexema, local, _ = campos
+            nivel = INFO
+            acao = "Verificando tipo" if operacao == "tipo" else "Obtendo valor"
+        else:
+            lexema, local, _ = campos
+            nivel = DEBUG
+            acao = "Verificando declaração"
+        mensagens = [(nivel, f"\033[90m{acao} do símbolo '{lexema}' no escopo atual\033[0m")]
+        if not local:
+            mensagens.append((nivel, f"\033[90m{acao} do símbolo '{lexema}' em escopos anteriores\033[0m"))
+        return mensagens
+    if evento == PRINT:
+        lexema, bloco = campos
+        return [(INFO, f"\033[90mProcessando instrução de impressão: {lexema} no bloco {bloco}\033[0m")]
+    if evento == ERRO:
+        return [(ERROR, f"\033[91m{mensagem_erro(*campos)}\033[0m")]
+    if evento == CACHE:
+        situacao, arquivo, detalhe = campos
+        if situacao == "carregado":
+            return [(WARNING, f"\033[92mCarregado do cache '{arquivo}'\033[0m")]
+        if situacao == "invalido":
+            return [(WARNING, f"\033[93mCache '{arquivo}' inválido ({detalhe}), processando o arquivo novamente\033[0m")]
+        return [(WARNING, f"\033[93mNão foi possível gravar o cache '{arquivo}': {detalhe}\033[0m")]
+    return []
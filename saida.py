@@ -0,0 +1,168 @@
+import io
+import sys
+
+FORMATOS = ("bonito", "compacto", "jsonl", "csv")
+CAMPOS_CSV = ("lexema", "tipo", "valor", "bloco")
+
+def _formatar_bonito(lexema, tipo, valor, bloco):
+    linha_separadora = "-" * 50
+    return (
+        f"{linha_separadora}\n"
+        f"\033[92mPRINT <{lexema}>:\033[0m\n"
+        f"   \033[94mTipo:\033[0m  {tipo}\n"
+        f"   \033[94mValor:\033[0m {valor}\n"
+        f"{linha_separadora}\n"
+    )
+
+def _formatar_compacto(lexema, tipo, valor, bloco):
+    return f"{lexema} {tipo} {valor}\n"
+
+# json e csv só são importados quando o formato é usado, o que encurta a partida nos demais
+def _formatar_jsonl(lexema, tipo, valor, bloco):
+    import json
+    return json.dumps({"lexema": lexema, "tipo": tipo, "valor": valor, "bloco": bloco}, ensure_ascii=False) + "\n"
+
+def _formatar_csv(lexema, tipo, valor, bloco):
+    import csv
+    linha = io.StringIO()
+    csv.writer(linha, lineterminator="\n").writerow((lexema, tipo, valor, bloco))
+    return linha.getvalue()
+
+_FORMATADORES = {
+    "bonito": _formatar_bonito,
+    "compacto": _formatar_compacto,
+    "jsonl": _formatar_jsonl,
+    "csv": _formatar_csv,
+}
+
+def formatar(formato, lexema, tipo, valor, bloco):
+    """
+    Formata o resultado de um PRINT.
+
+    Args:
+        formato (str): Um dos FORMATOS.
+        lexema (str): O nome da variável impressa.
+        tipo (str): O tipo da variável.
+        valor: O valor da variável.
+        bloco (str): O nome do bloco em que o PRINT foi executado.
+
+    Returns:
+        str: O texto formatado, terminado em quebra de linha.
+    """
+    return _FORMATADORES[formato](lexema, tipo, valor, bloco)
+
+def cabecalho(formato):
+    """
+    Obtém o texto que abre uma saída no formato informado (a linha de cabeçalho, no caso do CSV).
+
+    Args:
+        formato (str): Um dos FORMATOS.
+
+    Returns:
+        str: O cabeçalho, possivelmente vazio.
+    """
+    return ",".join(CAMPOS_CSV) + "\n" if formato == "csv" else ""
+
+class Saida:
+    """
+    Base dos destinos da saída do PRINT.
+    """
+    def escrever(self, lexema, tipo, valor, bloco):
+        raise NotImplementedError
+
+    def descarregar(self):
+        pass
+
+    def fechar(self):
+        self.descarregar()
+
+class SaidaTexto(Saida):
+    """
+    Destino que formata cada PRINT e o escreve em um fluxo de texto, acumulando em buffer.
+
+    O texto acumulado só é escrito no fluxo quando passa de `tamanho_buffer` caracteres
+    ou quando `descarregar` é chamado, de modo que muitos PRINTs viram poucas escritas.
+
+    Args:
+        formato (str): Um dos FORMATOS.
+        destino (TextIO, optional): O fluxo de saída. Se omitido, usa o sys.stdout do momento da escrita.
+        tamanho_buffer (int, optional): Quantidade de caracteres acumulados antes de escrever. 0 escreve a cada PRINT.
+    """
+    def __init__(self, formato="bonito", destino=None, tamanho_buffer=0):
+        self._formatador = _FORMATADORES[formato]
+        self._destino = destino
+        self.tamanho_buffer = tamanho_buffer
+        self._partes:list[str] = []
+        self._tamanho = 0
+        self._fechar_destino = False
+        inicio = cabecalho(formato)
+        if inicio:
+            self._acumular(inicio)
+
+    @classmethod
+    def para_arquivo(cls, nome_arquivo, formato="bonito", tamanho_buffer=1 << 16):
+        """
+        Cria um destino que escreve em um arquivo, fechado junto com a saída.
+
+        Args:
+            nome_arquivo (str): O caminho do arquivo.
+            formato (str): Um dos FORMATOS.
+            tamanho_buffer (int): Quantidade de caracteres acumulados antes de escrever.
+
+        Returns:
+            SaidaTexto: O destino criado.
+        """
+        saida = cls(formato, open(nome_arquivo, 'w', encoding='utf-8', newline=''), tamanho_buffer)
+        saida._fechar_destino = True
+        return saida
+
+    def _acumular(self, texto):
+        self._partes.append(texto)
+        self._tamanho += len(texto)
+        if self._tamanho > self.tamanho_buffer:
+            self._escrever_acumulado()
+
+    def escrever(self, lexema, tipo, valor, bloco):
+        self._acumular(self._formatador(lexema, tipo, valor, bloco))
+
+    def _escrever_acumulado(self):
+        destino = self._destino if self._destino is not None else sys.stdout
+        if self._partes:
+            destino.write("".join(self._partes))
+            self._partes.clear()
+            self._tamanho = 0
+        return destino
+
+    def descarregar(self):
+        """
+        Escreve no fluxo todo o texto acumulado e descarrega o próprio fluxo.
+        """
+        self._escrever_acumulado().flush()
+
+    def fechar(self):
+        self.descarregar()
+        if self._fechar_destino:
+            self._destino.close()
+
+class ColetorSaida(Saida):
+    """
+    Destino que guarda os PRINTs em memória, para embutir o analisador em outros programas.
+    """
+    def __init__(self):
+        self.registros:list[tuple] = []
+
+    def escrever(self, lexema, tipo, valor, bloco):
+        self.registros.append((lexema, tipo, valor, bloco))
+
+    def texto(self, formato="bonito"):
+        """
+        Formata todos os PRINTs coletados.
+
+        Args:
+            formato (str): Um dos FORMATOS.
+
+        Returns:
+            str: A saída completa, como seria escrita por uma SaidaTexto.
+        """
+        formatador = _FORMATADORES[formato]
+        return cabecalho(formato) + "".join(formatador(*registro) for registro in self.registros)
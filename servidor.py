@@ -0,0 +1,312 @@
+import asyncio
+import io
+import json
+import logging
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import rastreamento
+from main import AnalisadorSemantico, ProcessadorSemantico
+from programa_compacto import ProgramaCompacto
+from rastreamento import ColetorMemoria, Rastreador
+from saida import FORMATOS, ColetorSaida
+from verificacao import VerificadorSemantico
+
+# Protocolo: cada requisição é um objeto JSON em uma linha, e cada resposta também. As
+# respostas saem na ordem em que as análises terminam, com o mesmo "id" da requisição.
+#
+#   requisição: {"id": ..., "programa": "texto do código", "formato": "bonito",
+#                "verificar": false, "nome": null, "max_erros": null}
+#   resposta:   {"id": ..., "instrucoes": N, "saida": "...", "diagnosticos": [...],
+#                "falha": null, "tempo": segundos}
+#   com "verificar": {"id": ..., "diagnosticos": [...], "interrompido": false, "falha": null,
+#                     "tempo": segundos}
+#   requisição inválida ou erro no servidor: {"id": ..., "erro": "mensagem"}
+
+# Tamanho máximo de uma linha de requisição em um socket
+LIMITE_REQUISICAO = 1 << 26
+
+class RequisicaoInvalida(Exception):
+    pass
+
+def analisar_texto(texto, formato="bonito", verificar=False, nome=None, max_erros=None):
+    """
+    Processa e executa (ou apenas verifica) o código de um programa, com objetos próprios.
+
+    Args:
+        texto (str): O código do programa.
+        formato (str, optional): O formato da saída dos PRINTs.
+        verificar (bool, optional): Se True, só verifica o programa, como --check.
+        nome (str, optional): O nome do arquivo informado nos diagnósticos da verificação.
+        max_erros (int, optional): Com verificar, interrompe após esse número de erros distintos.
+
+    Returns:
+        dict: Executando, "instrucoes", "saida", "diagnosticos" (código, lexema e mensagem de
+            cada erro semântico, na ordem em que ocorreram), "falha" (descrição de uma falha
+            que interrompeu a execução, ou None) e "tempo" (em segundos). Verificando,
+            "diagnosticos" (ver verificacao.Diagnostico.como_dict), "interrompido", "falha"
+            (com os diagnósticos encontrados até ela) e "tempo".
+    """
+    inicio = time.perf_counter()
+    # Lido como um arquivo de texto, inclusive na tradução de fins de linha
+    linhas = io.StringIO(texto, newline=None)
+    if verificar:
+        verificador = VerificadorSemantico(max_erros)
+        falha = None
+        try:
+            verificador.verificar_linhas(linhas, nome)
+        except Exception as erro:
+            falha = f"{type(erro).__name__}: {erro}"
+        return {
+            "diagnosticos": [diagnostico.como_dict() for diagnostico in verificador.diagnosticos],
+            "interrompido": verificador.interrompido,
+            "falha": falha,
+            "tempo": time.perf_counter() - inicio,
+        }
+    coletor_erros = ColetorMemoria(logging.ERROR)
+    rastreador = Rastreador([coletor_erros])
+    saida = ColetorSaida()
+    instrucoes = 0
+    falha = None
+    try:
+        programa = ProgramaCompacto.de_instrucoes(ProcessadorSemantico(rastreador).gerar_instrucoes(linhas))
+        instrucoes = len(programa)
+        AnalisadorSemantico(rastreador, saida).executar_programa(programa)
+    except Exception as erro:
+        falha = f"{type(erro).__name__}: {erro}"
+    return {
+        "instrucoes": instrucoes,
+        "saida": saida.texto(formato),
+        "diagnosticos": [
+            {"codigo": codigo, "lexema": lexema, "mensagem": rastreamento.mensagem_erro(codigo, lexema)}
+            for _, (codigo, lexema) in coletor_erros.eventos
+        ],
+        "falha": falha,
+        "tempo": time.perf_counter() - inicio,
+    }
+
+def _argumentos(requisicao):
+    """Valida uma requisição e retorna os argumentos de analisar_texto."""
+    if not isinstance(requisicao, dict):
+        raise RequisicaoInvalida("a requisição deve ser um objeto JSON.")
+    texto = requisicao.get("programa")
+    if not isinstance(texto, str):
+        raise RequisicaoInvalida("'programa' deve ser o texto do código.")
+    formato = requisicao.get("formato", "bonito")
+    if formato not in FORMATOS:
+        raise RequisicaoInvalida(f"'formato' deve ser um de {', '.join(FORMATOS)}.")
+    verificar = requisicao.get("verificar", False)
+    if not isinstance(verificar, bool):
+        raise RequisicaoInvalida("'verificar' deve ser true ou false.")
+    nome = requisicao.get("nome")
+    if nome is not None and not isinstance(nome, str):
+        raise RequisicaoInvalida("'nome' deve ser uma cadeia.")
+    max_erros = requisicao.get("max_erros")
+    if max_erros is not None and (type(max_erros) is not int or max_erros < 1):
+        raise RequisicaoInvalida("'max_erros' deve ser um inteiro positivo.")
+    return texto, formato, verificar, nome, max_erros
+
+def _ignorar_interrupcao():
+    # O Ctrl+C chega a todo o grupo de processos; quem encerra os processos do pool é o servidor
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def _aquecer():
+    return os.getpid()
+
+class ServidorAnalise:
+    """
+    Servidor asyncio que recebe programas em JSON, um por linha, e responde com o resultado de cada um.
+
+    Cada requisição é analisada em um processo de um pool mantido aberto, com um par
+    ProcessadorSemantico/AnalisadorSemantico próprio, de modo que o custo de iniciar o
+    Python e importar o analisador é pago uma única vez. As requisições de uma conexão são
+    atendidas em paralelo; quando há `pendentes` delas em andamento, a conexão deixa de ser
+    lida até que alguma termine.
+
+    Args:
+        workers (int, optional): Número de processos do pool. Padrão: número de CPUs.
+        pendentes (int, optional): Requisições em andamento por conexão. Padrão: o dobro de workers.
+    """
+    def __init__(self, workers=None, pendentes=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.pendentes = pendentes or 2 * self.workers
+        self.estatisticas = {"conexoes": 0, "requisicoes": 0, "erros": 0, "falhas": 0}
+        self._pool = self._criar_pool()
+
+    def _criar_pool(self):
+        pool = ProcessPoolExecutor(self.workers, initializer=_ignorar_interrupcao)
+        # Inicia todos os processos agora, antes do laço de eventos e da primeira requisição
+        for futuro in [pool.submit(_aquecer) for _ in range(self.workers)]:
+            futuro.result()
+        return pool
+
+    async def _analisar(self, requisicao):
+        pool = self._pool
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, analisar_texto, *_argumentos(requisicao))
+        except BrokenProcessPool:
+            # Um processo morreu (por exemplo, sem memória): o pool inteiro fica inutilizável e é recriado
+            if self._pool is pool:
+                self._pool = self._criar_pool()
+                pool.shutdown(wait=False)
+            return {"erro": "o processo que analisava o programa terminou inesperadamente."}
+
+    async def _responder(self, linha, enviar):
+        self.estatisticas["requisicoes"] += 1
+        identificador = None
+        try:
+            requisicao = json.loads(linha)
+        except ValueError as erro:
+            resposta = {"erro": f"JSON inválido: {erro}"}
+        else:
+            if isinstance(requisicao, dict):
+                identificador = requisicao.get("id")
+            try:
+                resposta = await self._analisar(requisicao)
+            except RequisicaoInvalida as erro:
+                resposta = {"erro": str(erro)}
+            except Exception as erro:
+                # Toda requisição recebe uma resposta, mesmo que a análise falhe de forma inesperada
+                resposta = {"erro": f"falha no servidor: {type(erro).__name__}: {erro}"}
+        if "erro" in resposta:
+            self.estatisticas["erros"] += 1
+        elif resposta.get("falha"):
+            self.estatisticas["falhas"] += 1
+        await enviar((json.dumps({"id": identificador, **resposta}, ensure_ascii=False) + "\n").encode("utf-8"))
+
+    async def atender(self, ler_linha, enviar):
+        """
+        Atende uma conexão até o fim da entrada, e espera as respostas pendentes.
+
+        Args:
+            ler_linha (Callable): Corrotina que retorna a próxima linha (bytes), ou b"" no fim.
+            enviar (Callable): Corrotina que envia uma resposta (bytes).
+        """
+        self.estatisticas["conexoes"] += 1
+        vagas = asyncio.Semaphore(self.pendentes)
+        tarefas = set()
+
+        def concluir(tarefa):
+            tarefas.discard(tarefa)
+            vagas.release()
+
+        try:
+            while linha := await ler_linha():
+                if not linha.strip():
+                    continue
+                await vagas.acquire()
+                tarefa = asyncio.create_task(self._responder(linha, enviar))
+                tarefas.add(tarefa)
+                tarefa.add_done_callback(concluir)
+        except ValueError:
+            # Linha maior que LIMITE_REQUISICAO: a conexão é encerrada depois das respostas pendentes
+            await enviar(json.dumps({"id": None, "erro": "requisição grande demais."}, ensure_ascii=False).encode("utf-8") + b"\n")
+        if tarefas:
+            await asyncio.gather(*tarefas, return_exceptions=True)
+
+    async def _atender_socket(self, leitor, escritor):
+        async def enviar(dados):
+            escritor.write(dados)
+            await escritor.drain()
+
+        try:
+            await self.atender(leitor.readline, enviar)
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+
+    async def servir_socket(self, caminho):
+        """
+        Escuta no socket Unix `caminho` até receber SIGINT ou SIGTERM.
+
+        Args:
+            caminho (str): O caminho do socket. Um socket abandonado por outro servidor é removido.
+
+        Raises:
+            OSError: Se já houver um servidor escutando no caminho.
+        """
+        _remover_socket_abandonado(caminho)
+        servidor = await asyncio.start_unix_server(self._atender_socket, path=caminho, limit=LIMITE_REQUISICAO)
+        parar = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sinal in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sinal, parar.set)
+        sys.stderr.write(f"Servidor escutando em {caminho} ({self.workers} processo(s)). Ctrl+C encerra.\n")
+        try:
+            async with servidor:
+                await parar.wait()
+        finally:
+            for sinal in (signal.SIGINT, signal.SIGTERM):
+                loop.remove_signal_handler(sinal)
+            if os.path.exists(caminho):
+                os.unlink(caminho)
+
+    async def servir_stdio(self):
+        """
+        Atende as requisições da entrada padrão e escreve as respostas na saída padrão, até o fim da entrada.
+        """
+        loop = asyncio.get_running_loop()
+        entrada, destino = sys.stdin.buffer, sys.stdout.buffer
+        linhas = asyncio.Queue()
+
+        # A entrada pode ser um arquivo comum, que o laço de eventos não acompanha: é lida por
+        # uma thread à parte, que não impede o processo de terminar com um Ctrl+C
+        def ler():
+            try:
+                for linha in entrada:
+                    loop.call_soon_threadsafe(linhas.put_nowait, linha)
+                loop.call_soon_threadsafe(linhas.put_nowait, b"")
+            except RuntimeError:
+                # O laço de eventos já foi encerrado
+                pass
+
+        async def enviar(dados):
+            destino.write(dados)
+            destino.flush()
+
+        threading.Thread(target=ler, daemon=True).start()
+        await self.atender(linhas.get, enviar)
+
+    def fechar(self):
+        self._pool.shutdown()
+
+def _remover_socket_abandonado(caminho):
+    if not os.path.exists(caminho):
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as teste:
+        try:
+            teste.connect(caminho)
+        except ConnectionRefusedError:
+            os.unlink(caminho)
+            return
+    raise OSError(f"já há um servidor escutando em {caminho}")
+
+def servir(caminho_socket=None, workers=None):
+    """
+    Inicia o servidor de análise e o mantém até o fim da entrada padrão, ou até Ctrl+C com um socket.
+
+    Args:
+        caminho_socket (str, optional): Escuta nesse socket Unix em vez da entrada padrão.
+        workers (int, optional): Número de processos do pool. Padrão: número de CPUs.
+
+    Returns:
+        dict: As estatísticas do servidor (conexoes, requisicoes, erros, falhas).
+    """
+    servidor = ServidorAnalise(workers)
+    try:
+        if caminho_socket:
+            asyncio.run(servidor.servir_socket(caminho_socket))
+        else:
+            asyncio.run(servidor.servir_stdio())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.fechar()
+    return servidor.estatisticas
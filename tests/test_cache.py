@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import cache_compilado
+import rastreamento
+import traducao
+from main import ProcessadorSemantico
+from rastreamento import ColetorMemoria, Rastreador
+
+PROGRAMA = 'BLOCO _a_\nNUMERO a = 1\nCADEIA s = "x"\nPRINT a\nFIM _a_\n'
+
+def compilar(nome_arquivo):
+    return ProcessadorSemantico(Rastreador()).compilar_arquivo(nome_arquivo)
+
+class _TestCache:
+    """Testes comuns aos caches .cicc (cache_compilado) e .cicx (traducao)."""
+    modulo = None
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.fonte = os.path.join(self.diretorio, "programa.cic")
+        with open(self.fonte, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(PROGRAMA)
+        self.coletor = ColetorMemoria()
+        self.rastreador = Rastreador([self.coletor])
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio)
+
+    def carregar(self):
+        return self.modulo.carregar_ou_compilar(self.fonte, compilar, self.rastreador)
+
+    def situacoes(self):
+        return [campos[0] for evento, campos in self.coletor.eventos if evento == rastreamento.CACHE]
+
+    def test_eventos(self):
+        self.carregar()
+        self.carregar()
+        with open(self.fonte, 'a', encoding='utf-8') as arquivo:
+            arquivo.write("PRINT s\n")
+        self.carregar()
+        self.assertEqual(self.situacoes(), ["carregado", "invalido"])
+
+    def test_sem_rastreador_nao_usa_o_logging(self):
+        self.modulo.carregar_ou_compilar(self.fonte, compilar)
+        with mock.patch("logging.warning") as aviso, mock.patch("logging.log") as log:
+            self.modulo.carregar_ou_compilar(self.fonte, compilar)
+        aviso.assert_not_called()
+        log.assert_not_called()
+
+    def test_mtime_alterado_regrava_o_cabecalho(self):
+        self.carregar()
+        info = os.stat(self.fonte)
+        os.utime(self.fonte, ns=(info.st_atime_ns, info.st_mtime_ns + 10**9))
+        with mock.patch("cache_compilado.hash_arquivo", wraps=cache_compilado.hash_arquivo) as resumo:
+            for _ in range(3):
+                self.carregar()
+        # Só a primeira carga depois da mudança recalcula o resumo
+        self.assertEqual(resumo.call_count, 1)
+        self.assertEqual(self.situacoes(), ["carregado"] * 3)
+
+    def test_falha_ao_gravar(self):
+        with mock.patch.object(self.modulo, "salvar", side_effect=PermissionError("somente leitura")):
+            self.carregar()
+        self.assertEqual(self.situacoes(), ["gravacao"])
+
+class TestCacheCompilado(_TestCache, unittest.TestCase):
+    modulo = cache_compilado
+
+class TestCacheTraducao(_TestCache, unittest.TestCase):
+    modulo = traducao
+
+if __name__ == "__main__":
+    unittest.main()
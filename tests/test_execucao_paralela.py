@@ -0,0 +1,67 @@
+import os
+import pickle
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import cache_compilado
+from main import ProcessadorSemantico
+from rastreamento import Rastreador
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Executa main.py com os pools iniciados com "spawn", em que o programa é enviado aos processos por pickle
+EXECUTAR_COM_SPAWN = (
+    "import multiprocessing, sys\n"
+    "multiprocessing.set_start_method('spawn')\n"
+    "import main\n"
+    "sys.argv[0] = 'main.py'\n"
+    "main.main()\n"
+)
+
+def gerar_programa():
+    # Blocos internos grandes o bastante para serem enviados a outro processo (ver TAMANHO_MINIMO_BLOCO)
+    linhas = ["BLOCO _a_", "NUMERO x = 1"]
+    for bloco in range(3):
+        linhas.append(f"BLOCO _b{bloco}_")
+        for indice in range(1200):
+            linhas += [f"NUMERO v{indice} = {indice}", "PRINT x"]
+        linhas += ["PRINT y", f"FIM _b{bloco}_"]
+    linhas += ["PRINT x", "FIM _a_"]
+    return "\n".join(linhas) + "\n"
+
+class TestExecucaoParalelaComCache(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.fonte = os.path.join(self.diretorio, "programa.cic")
+        with open(self.fonte, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(gerar_programa())
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio)
+
+    def executar(self, *argumentos, codigo=None):
+        comando = [sys.executable, "-c", codigo] if codigo else [sys.executable, os.path.join(RAIZ, "main.py")]
+        resultado = subprocess.run(comando + ["-i", self.fonte, *argumentos], capture_output=True, text=True, cwd=RAIZ)
+        self.assertNotIn("Traceback", resultado.stderr)
+        return resultado.stdout
+
+    def test_programa_mapeado_e_serializavel(self):
+        cache_compilado.carregar_ou_compilar(self.fonte, lambda nome: ProcessadorSemantico(Rastreador()).compilar_arquivo(nome))
+        programa = cache_compilado.carregar(cache_compilado.caminho_cache(self.fonte), self.fonte)
+        self.assertIsInstance(programa.operandos, memoryview)
+        copia = pickle.loads(pickle.dumps(programa))
+        self.assertFalse(hasattr(copia, "mapa"))
+        self.assertEqual(list(copia), list(programa))
+
+    def test_cache_e_blocos_paralelos_com_spawn(self):
+        esperado = self.executar()
+        # A primeira execução grava o cache; a segunda executa o programa mapeado em memória
+        for _ in range(2):
+            self.assertEqual(self.executar("--cache", "--parallel-blocks", "-j", "2", codigo=EXECUTAR_COM_SPAWN), esperado)
+        self.assertTrue(os.path.exists(cache_compilado.caminho_cache(self.fonte)))
+
+if __name__ == "__main__":
+    unittest.main()
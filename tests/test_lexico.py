@@ -0,0 +1,99 @@
+import io
+import os
+import tempfile
+import unittest
+
+import lexico
+import rastreamento
+from main import ProcessadorSemantico
+from rastreamento import ColetorMemoria, Rastreador
+
+def processar(texto, newline=None):
+    """
+    Processa um texto como um arquivo e retorna as instruções (sem posições) e os códigos dos erros.
+    """
+    coletor = ColetorMemoria()
+    instrucoes = list(ProcessadorSemantico(Rastreador([coletor])).gerar_instrucoes(io.StringIO(texto, newline=newline)))
+    erros = [campos[0] for evento, campos in coletor.eventos if evento == rastreamento.ERRO]
+    return instrucoes, erros
+
+def atribuicao(lexema, valor, tipo=None):
+    return {"instrucao": "ATRIBUICAO", "lexema": lexema, "tipo_declarado": tipo, "valor": valor}
+
+class TestPalavrasChave(unittest.TestCase):
+    def test_prefixo_de_palavra_chave_e_lexema(self):
+        for linha, lexema in (("BLOCOx = 1", "BLOCOx"), ("FIMx = 1", "FIMx"), ("PRINTER = 1", "PRINTER"),
+                              ("PRINTa = 1", "PRINTa"), ("NUMEROS = 1", "NUMEROS"), ("CADEIAS = 1", "CADEIAS")):
+            with self.subTest(linha=linha):
+                self.assertEqual(processar(linha + "\n"), ([atribuicao(lexema, "1")], []))
+
+    def test_prefixo_sozinho_nao_e_instrucao(self):
+        self.assertEqual(processar("BLOCOx\n"), ([], []))
+
+    def test_palavra_chave_nao_vira_lexema(self):
+        # Reconhecida a palavra-chave, uma linha malformada é um erro de formato, e não uma atribuição a ela
+        for linha, codigo in (("PRINT", "formato_print"), ("PRINT ,x", "formato_print"), ("PRINT x y", "formato_print"),
+                              ("BLOCO", "formato_bloco"), ("NUMERO", "formato_atribuicao")):
+            with self.subTest(linha=linha):
+                self.assertEqual(processar(linha + "\n"), ([], [codigo]))
+
+    def test_virgula_e_aspas_logo_apos_palavra_chave(self):
+        for linha in ("PRINT,x", "NUMERO,a", "NUMERO, a", "FIM,", 'PRINT"x"', 'CADEIA"a"', 'CADEIA "a"'):
+            with self.subTest(linha=linha):
+                self.assertEqual(processar(linha + "\n"), ([], ["formato_atribuicao"]))
+
+    def test_palavra_chave_seguida_de_igual_e_atribuicao(self):
+        # Sem espaço, "NUMERO=" não é uma palavra-chave seguida de um item
+        instrucoes, erros = processar("NUMERO= 1\n")
+        self.assertEqual(erros, ["formato_atribuicao"])
+        self.assertEqual(instrucoes, [])
+
+class TestItens(unittest.TestCase):
+    def test_cadeia_com_virgula_e_igual_e_um_token(self):
+        self.assertEqual(processar('CADEIA s = "a, b = c"\n'), ([atribuicao("s", '"a, b = c"', "CADEIA")], []))
+
+    def test_lista_de_declaracoes_e_atribuicoes(self):
+        self.assertEqual(
+            processar("NUMERO a = 1, b\n"),
+            ([atribuicao("a", "1", "NUMERO"), atribuicao("b", None, "NUMERO")], []),
+        )
+        self.assertEqual(
+            processar("NUMERO a,b\n"),
+            ([{"instrucao": "DECLARACAO", "lexema": "a", "tipo": "NUMERO"}, {"instrucao": "DECLARACAO", "lexema": "b", "tipo": "NUMERO"}], []),
+        )
+
+    def test_valor_com_dois_tokens_e_erro(self):
+        self.assertEqual(processar("x = 1 2\n"), ([], ["formato_atribuicao"]))
+
+    def test_colunas(self):
+        coletor = ColetorMemoria()
+        processador = ProcessadorSemantico(Rastreador([coletor]), posicoes=True)
+        instrucoes = list(processador.gerar_instrucoes(io.StringIO("BLOCO _a_\n  NUMERO a = 1, b = 2\n")))
+        self.assertEqual([(i["linha"], i["coluna"]) for i in instrucoes], [(1, 7), (2, 10), (2, 17)])
+
+class TestFinsDeLinha(unittest.TestCase):
+    PROGRAMA = 'BLOCO _a_\nNUMERO a = 1, b\nCADEIA s = "x, y"\nPRINT a\nPRINT s\nFIM _a_\n'
+
+    def test_crlf_sem_traducao_igual_a_lf(self):
+        # Mesmo sem a tradução de fins de linha, o "\r" final é só espaço em branco
+        self.assertEqual(processar(self.PROGRAMA.replace("\n", "\r\n"), newline=""), processar(self.PROGRAMA))
+
+    def test_arquivo_crlf_igual_a_lf(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            programas = []
+            for nome, fim in (("lf.cic", b"\n"), ("crlf.cic", b"\r\n")):
+                caminho = os.path.join(diretorio, nome)
+                with open(caminho, 'wb') as arquivo:
+                    arquivo.write(self.PROGRAMA.encode('utf-8').replace(b"\n", fim))
+                programas.append(list(ProcessadorSemantico(Rastreador()).compilar_arquivo(caminho)))
+        self.assertEqual(programas[0], programas[1])
+
+class TestExpressao(unittest.TestCase):
+    def test_sem_sintaxe_possessiva(self):
+        # Grupos possessivos e atômicos só existem a partir do Python 3.11
+        for padrao in (lexico.INSTRUCAO.pattern, lexico.ITEM.pattern):
+            self.assertNotIn(")?+", padrao)
+            self.assertNotIn("(?>", padrao)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import io
+import unittest
+
+from inferencia import ATUALIZACAO_PROVADA, inferir_tipos
+from main import ProcessadorSemantico
+from memoria_limitada import AnalisadorMemoriaLimitada
+from programa_compacto import ProgramaCompacto
+from rastreamento import Rastreador
+from saida import ColetorSaida
+
+def compilar(texto):
+    return ProgramaCompacto.de_instrucoes(ProcessadorSemantico(Rastreador()).gerar_instrucoes(io.StringIO(texto)))
+
+class TestRelogioDeAcessos(unittest.TestCase):
+    # Os blocos ficam abertos, para que as tabelas ainda estejam na pilha ao final
+    TEXTO = "BLOCO _a_\nNUMERO x = 1\nBLOCO _b_\nNUMERO y = 1\nx = 2\n"
+
+    def executar(self, programa):
+        analisador = AnalisadorMemoriaLimitada(Rastreador(), ColetorSaida(), orcamento=1000)
+        analisador.executar_programa(programa)
+        return analisador
+
+    def test_atualizacao_marca_a_tabela_externa(self):
+        for nome, programa in (("comum", compilar(self.TEXTO)), ("inferido", inferir_tipos(compilar(self.TEXTO)))):
+            with self.subTest(programa=nome):
+                analisador = self.executar(programa)
+                # A atualização de x, a última instrução, torna a tabela de _a_ a acessada mais recentemente
+                self.assertGreater(analisador._acessos[0], analisador._acessos[1])
+                self.assertEqual(analisador.obter_valor("x"), 2)
+
+    def test_atualizacao_provada(self):
+        self.assertEqual(inferir_tipos(compilar(self.TEXTO)).opcodes[-1], ATUALIZACAO_PROVADA)
+
+if __name__ == "__main__":
+    unittest.main()
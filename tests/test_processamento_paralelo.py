@@ -0,0 +1,51 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import processamento_paralelo
+from main import ProcessadorSemantico
+from processamento_paralelo import compilar_arquivo_paralelo
+from rastreamento import Rastreador
+
+PROGRAMA = 'BLOCO _a_\nNUMERO a = 1, b\nCADEIA s = "x"\nPRINT a\nx = 2\nPRINT x\nFIM _a_\n' * 200
+
+class TestProcessamentoParalelo(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.fonte = os.path.join(self.diretorio, "programa.cic")
+        with open(self.fonte, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(PROGRAMA)
+        # Trechos pequenos, para que o arquivo de teste seja dividido
+        trecho = mock.patch.object(processamento_paralelo, "TAMANHO_MINIMO_TRECHO", 1024)
+        trecho.start()
+        self.addCleanup(trecho.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio)
+
+    def compilar(self, cpus, workers):
+        with mock.patch.object(processamento_paralelo, "cpus_disponiveis", return_value=cpus), \
+                mock.patch.object(processamento_paralelo, "ProcessPoolExecutor",
+                                  wraps=processamento_paralelo.ProcessPoolExecutor) as pool:
+            programa = compilar_arquivo_paralelo(self.fonte, Rastreador(), workers)
+        return programa, pool
+
+    def test_igual_ao_sequencial(self):
+        sequencial = ProcessadorSemantico(Rastreador()).compilar_arquivo(self.fonte)
+        programa, pool = self.compilar(2, 2)
+        pool.assert_called_once_with(2)
+        self.assertEqual(list(programa), list(sequencial))
+
+    def test_uma_cpu_nao_usa_o_pool(self):
+        # Com uma só CPU, o pool só acrescentaria o custo de unir os trechos
+        _, pool = self.compilar(1, 4)
+        pool.assert_not_called()
+
+    def test_workers_limitados_as_cpus(self):
+        _, pool = self.compilar(2, 8)
+        pool.assert_called_once_with(2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import glob
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from collections import Counter
+
+import rastreamento
+from main import AnalisadorSemantico, ProcessadorSemantico
+from rastreamento import ColetorMemoria, Rastreador
+from saida import ColetorSaida
+from verificacao import VerificadorSemantico
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXEMPLOS = sorted(glob.glob(os.path.join(RAIZ, "exemplos", "*.cic"))) + [os.path.join(RAIZ, "programa.cic")]
+
+def erros_execucao(texto):
+    """
+    Executa um programa e conta os seus erros por (código, lexema).
+
+    Returns:
+        tuple[Counter, str or None]: Os erros e o nome da exceção que interrompeu a execução, se houver.
+    """
+    coletor = ColetorMemoria(rastreamento.ERROR)
+    rastreador = Rastreador([coletor])
+    falha = None
+    try:
+        instrucoes = ProcessadorSemantico(rastreador).gerar_instrucoes(io.StringIO(texto))
+        AnalisadorSemantico(rastreador, ColetorSaida()).executar_instrucoes(instrucoes)
+    except IndexError as erro:
+        falha = type(erro).__name__
+    return Counter(campos for _, campos in coletor.eventos), falha
+
+def diagnosticos_verificacao(texto):
+    """Verifica um programa e conta os seus diagnósticos por (código, lexema)."""
+    diagnosticos = VerificadorSemantico().verificar_linhas(io.StringIO(texto))
+    return Counter({(d.codigo, d.lexema): d.ocorrencias for d in diagnosticos}), diagnosticos
+
+class TestParidade(unittest.TestCase):
+    def test_exemplos(self):
+        for arquivo in EXEMPLOS:
+            with self.subTest(arquivo=os.path.basename(arquivo)):
+                with open(arquivo, encoding='utf-8') as fonte:
+                    texto = fonte.read()
+                erros, falha = erros_execucao(texto)
+                self.assertIsNone(falha)
+                self.assertEqual(diagnosticos_verificacao(texto)[0], erros)
+
+    def test_erros_de_cada_tipo(self):
+        texto = (
+            "BLOCO _a_\n"
+            "NUMERO a = 1, a = 2\n"
+            'NUMERO b = "x"\n'
+            'a = "y"\n'
+            "PRINT c\n"
+            "NUMERO = 3\n"
+            "PRINT\n"
+            "BLOCO _b_\n"
+            "a = 5\n"
+            "CADEIA a\n"
+            "a = 1\n"
+            "FIM _b_\n"
+            "FIM _a_\n"
+        )
+        erros, falha = erros_execucao(texto)
+        self.assertIsNone(falha)
+        self.assertEqual(len(erros), 6)
+        self.assertEqual(diagnosticos_verificacao(texto)[0], erros)
+
+    def test_declaracao_depois_do_fim(self):
+        # A tabela mais externa nunca é descartada: depois do último FIM, as declarações continuam valendo
+        texto = "BLOCO _a_\nNUMERO a = 1\nFIM _a_\nNUMERO b = 2\nNUMERO b = 3\nPRINT b\nPRINT a\n"
+        erros, falha = erros_execucao(texto)
+        self.assertIsNone(falha)
+        self.assertEqual(erros, Counter({("redeclaracao", "b"): 1}))
+        self.assertEqual(diagnosticos_verificacao(texto)[0], erros)
+
+class TestInstrucoesFora(unittest.TestCase):
+    def assert_interrompe(self, texto, codigo, lexema, linha):
+        # A execução para na instrução; a verificação reporta os mesmos erros até ela e a própria instrução
+        erros, falha = erros_execucao(texto)
+        self.assertEqual(falha, "IndexError")
+        contagem, diagnosticos = diagnosticos_verificacao(texto)
+        ate_falha = Counter({chave: n for chave, n in contagem.items() if chave != (codigo, lexema)})
+        primeiro = next(d for d in diagnosticos if d.codigo == codigo)
+        self.assertEqual((primeiro.lexema, primeiro.linha), (lexema, linha))
+        self.assertEqual(ate_falha, erros)
+
+    def test_fim_sem_bloco(self):
+        self.assert_interrompe("BLOCO _a_\nPRINT x\nFIM _a_\nFIM _b_\n", "fim_sem_bloco", None, 4)
+
+    def test_fim_antes_de_qualquer_bloco(self):
+        self.assert_interrompe("FIM _a_\nBLOCO _a_\nFIM _a_\n", "fim_sem_bloco", None, 1)
+
+    def test_declaracao_fora_de_bloco(self):
+        self.assert_interrompe("NUMERO a = 1\nBLOCO _a_\nFIM _a_\n", "fora_de_bloco", "a", 1)
+
+    def test_verificacao_continua_e_conta_ocorrencias(self):
+        _, diagnosticos = diagnosticos_verificacao("FIM _a_\nNUMERO a = 1\nFIM _b_\nBLOCO _c_\nPRINT z\nFIM _c_\n")
+        self.assertEqual(
+            [(d.codigo, d.lexema, d.linha, d.ocorrencias) for d in diagnosticos],
+            [("fim_sem_bloco", None, 1, 2), ("fora_de_bloco", "a", 2, 1), ("nao_declarada", "z", 5, 1)],
+        )
+
+    def test_max_erros(self):
+        verificador = VerificadorSemantico(max_erros=1)
+        diagnosticos = verificador.verificar_linhas(io.StringIO("FIM _a_\nNUMERO a = 1\n"))
+        self.assertEqual([d.codigo for d in diagnosticos], ["fim_sem_bloco"])
+        self.assertTrue(verificador.interrompido)
+
+class TestLinhaDeComando(unittest.TestCase):
+    def test_check_sem_traceback(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            arquivo = os.path.join(diretorio, "fora.cic")
+            with open(arquivo, 'w', encoding='utf-8') as fonte:
+                fonte.write("NUMERO a = 1\nFIM _a_\n")
+            resultado = subprocess.run(
+                [sys.executable, os.path.join(RAIZ, "main.py"), "-i", arquivo, "--check"],
+                capture_output=True, text=True, cwd=RAIZ,
+            )
+        self.assertEqual(resultado.returncode, 1)
+        self.assertNotIn("Traceback", resultado.stderr)
+        self.assertEqual(resultado.stdout.splitlines(), [
+            f"{arquivo}:1:8: ERRO: Declaração da variável 'a' fora de qualquer BLOCO.",
+            f"{arquivo}:2:5: ERRO: FIM sem BLOCO correspondente.",
+        ])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,324 @@
+import marshal
+import math
+import os
+import struct
+import sys
+import zlib
+
+import rastreamento
+from cache_compilado import CacheInvalido, carregar_ou_gerar, conferir_fonte, hash_arquivo
+from inferencia import TIPOS_VALIDOS, converter_literal, NAO_LITERAL
+from programa_compacto import ProgramaCompacto, BLOCO, FIM, PRINT, ATRIBUICAO, DECLARACAO
+
+# Eventos que só o AnalisadorSemantico emite (além dos erros). O código traduzido não os
+# produz; com qualquer um deles habilitado, o programa precisa ser interpretado.
+EVENTOS_INTERPRETADOS = (
+    "instrucao", "escopo_aberto", "escopo_fechado", "tabela", "declaracao",
+    "atribuicao", "consulta", "verificacao", "print",
+)
+
+# Formato do arquivo .cicx (ordem de bytes nativa):
+#   cabeçalho | código (marshal)
+# O formato do marshal muda entre versões do Python, que por isso fazem parte do cabeçalho.
+MAGICA = b"CICX"
+VERSAO = 1
+CABECALHO = struct.Struct("=4sH16sqq32sQI")
+# Posição da data de modificação do fonte no cabeçalho (ver cache_compilado.conferir_fonte)
+POSICAO_MTIME = struct.calcsize("=4sH16s")
+EXTENSAO = ".cicx"
+
+def suporta(rastreador):
+    """
+    Indica se um programa pode ser executado traduzido com o rastreador dado.
+
+    Args:
+        rastreador (Rastreador): O rastreador da execução.
+
+    Returns:
+        bool: True se nenhum evento além dos erros e do processamento estiver habilitado.
+    """
+    return not any(getattr(rastreador, nome) for nome in EVENTOS_INTERPRETADOS)
+
+class _Tradutor:
+    """
+    Gera o código Python de um programa, simulando os escopos do AnalisadorSemantico.
+
+    Como a linguagem não tem desvios, cada lexema é resolvido em tempo de tradução para a
+    declaração que o define, e cada declaração vira uma variável local (um slot) da função
+    gerada. O tipo e a presença de valor de cada declaração também são conhecidos, de modo
+    que as verificações de tipo e os erros semânticos são decididos na tradução: o código
+    gerado só atribui slots, chama `escrever` para cada PRINT e `erro` para cada erro.
+    Slots de escopos fechados são reaproveitados.
+    """
+    def __init__(self):
+        self.linhas:list[str] = []
+        self.nome_blocos:list[str] = []
+        self.profundidade = 0
+        # Para cada lexema, as declarações visíveis [profundidade, tipo, slot, tem_valor], da mais externa para a mais interna
+        self.vinculos:dict[str, list[list]] = {}
+        self.desfazer:list[list[str]] = []
+        self.slots_livres:list[str] = []
+        self.total_slots = 0
+
+    def traduzir(self, programa:ProgramaCompacto):
+        lexemas = programa.lexemas
+        for opcode, operando, tipo, valor in zip(programa.opcodes, programa.operandos, programa.tipos, programa.valores):
+            operando, tipo, valor = lexemas[operando], lexemas[tipo], lexemas[valor]
+            if opcode == BLOCO:
+                self.nome_blocos.append(operando)
+                self.profundidade += 1
+                self.desfazer.append([])
+            elif opcode == FIM:
+                if not self.nome_blocos:
+                    # Como em self.nome_blocos.pop() no AnalisadorSemantico
+                    self.linhas.append("raise IndexError('pop from empty list')")
+                    break
+                self._fechar_escopo()
+            elif opcode == PRINT:
+                self._print(operando)
+            elif opcode in (ATRIBUICAO, DECLARACAO):
+                if not self.profundidade:
+                    # Como em self.pilha_escopo[-1] no AnalisadorSemantico
+                    self.linhas.append("raise IndexError('list index out of range')")
+                    break
+                if not self._atribuir(operando, tipo, valor if opcode == ATRIBUICAO else None):
+                    break
+            else:
+                self._erro("instrucao_invalida")
+        return self.linhas
+
+    def _erro(self, codigo, lexema=None):
+        self.linhas.append(f"erro({codigo!r}, {lexema!r})")
+
+    def _fechar_escopo(self):
+        self.nome_blocos.pop()
+        # Como no AnalisadorSemantico, a tabela mais externa nunca é descartada
+        if self.profundidade > 1:
+            self.profundidade -= 1
+            for lexema in self.desfazer.pop():
+                declaracoes = self.vinculos[lexema]
+                self.slots_livres.append(declaracoes.pop()[2])
+                if not declaracoes:
+                    del self.vinculos[lexema]
+
+    def _valor_atual(self, lexema):
+        """
+        Resolve o valor de um lexema como AnalisadorSemantico.obter_valor.
+
+        Returns:
+            tuple: (expressão Python do valor, tipo), ou ("None", None) se nenhuma declaração tiver valor.
+        """
+        for declaracao in reversed(self.vinculos.get(lexema, ())):
+            if declaracao[3]:
+                return declaracao[2], declaracao[1]
+        return "None", None
+
+    def _print(self, lexema):
+        declaracoes = self.vinculos.get(lexema)
+        if not declaracoes:
+            self._erro("nao_declarada", lexema)
+            return
+        expressao, _ = self._valor_atual(lexema)
+        bloco = self.nome_blocos[-1] if self.nome_blocos else ""
+        self.linhas.append(f"escrever({lexema!r}, {declaracoes[-1][1]!r}, {expressao}, {bloco!r})")
+
+    def _atribuir(self, lexema, tipo, valor):
+        """
+        Traduz uma atribuição ou declaração como AnalisadorSemantico.adicionar_variavel.
+
+        Returns:
+            bool: False se a conversão do valor falhar, o que interrompe a execução.
+        """
+        if valor:
+            try:
+                convertido = converter_literal(valor)
+            except ValueError:
+                # A conversão falha em tempo de execução, com a mesma exceção
+                self.linhas.append(f"converter_literal({valor!r})")
+                return False
+            if convertido is NAO_LITERAL:
+                expressao, tipo_valor = self._valor_atual(valor)
+            else:
+                expressao, tipo_valor = _literal(convertido), "CADEIA" if isinstance(convertido, str) else "NUMERO"
+        elif valor is None:
+            expressao, tipo_valor = "None", None
+        else:
+            # Um valor vazio não é tratado e continua sendo uma cadeia
+            expressao, tipo_valor = "''", "CADEIA"
+
+        declaracoes = self.vinculos.get(lexema)
+        if tipo is None:
+            if declaracoes:
+                declaracao = declaracoes[-1]
+                if tipo_valor is not None and declaracao[1] == tipo_valor:
+                    declaracao[3] = True
+                    self.linhas.append(f"{declaracao[2]} = {expressao}")
+                else:
+                    self._erro("modificacao_tipo", lexema)
+                return True
+            tipo = "CADEIA" if tipo_valor == "CADEIA" else "NUMERO"
+
+        if declaracoes and declaracoes[-1][0] == self.profundidade:
+            self._erro("redeclaracao", lexema)
+        elif tipo not in TIPOS_VALIDOS or tipo_valor is not None and tipo_valor != tipo:
+            self._erro("valor_invalido", lexema)
+        else:
+            slot = self._novo_slot()
+            self.vinculos.setdefault(lexema, []).append([self.profundidade, tipo, slot, tipo_valor is not None])
+            self.desfazer[-1].append(lexema)
+            if tipo_valor is not None:
+                self.linhas.append(f"{slot} = {expressao}")
+        return True
+
+    def _novo_slot(self):
+        if self.slots_livres:
+            return self.slots_livres.pop()
+        self.total_slots += 1
+        return f"s{self.total_slots - 1}"
+
+def _literal(valor):
+    # repr não produz um literal válido para reais infinitos
+    if isinstance(valor, float) and not math.isfinite(valor):
+        return f"float({repr(valor)!r})"
+    return repr(valor)
+
+def traduzir(programa:ProgramaCompacto):
+    """
+    Traduz um programa compacto para código-fonte Python.
+
+    O código define e chama uma função `_programa(escrever, erro, converter_literal)`, em que
+    os escopos do programa são variáveis locais. Executado, ele escreve os mesmos PRINTs e
+    emite os mesmos erros semânticos que o AnalisadorSemantico, na mesma ordem, e falha com
+    a mesma exceção onde a execução interpretada falharia.
+
+    Args:
+        programa (ProgramaCompacto): O programa a ser traduzido.
+
+    Returns:
+        str: O código-fonte Python.
+    """
+    corpo = _Tradutor().traduzir(programa)
+    linhas = ["def _programa(escrever, erro, converter_literal):"]
+    linhas += [f"    {linha}" for linha in corpo]
+    linhas.append("    pass")
+    linhas.append("_programa(escrever, erro, converter_literal)")
+    return "\n".join(linhas) + "\n"
+
+def compilar(programa:ProgramaCompacto, nome_arquivo="<cic>"):
+    """
+    Traduz um programa compacto e compila o código gerado.
+
+    Args:
+        programa (ProgramaCompacto): O programa a ser traduzido.
+        nome_arquivo (str, optional): O nome mostrado nos tracebacks do código gerado.
+
+    Returns:
+        types.CodeType: O código compilado, executável com `executar`.
+    """
+    return compile(traduzir(programa), nome_arquivo, "exec")
+
+def executar(codigo, saida, rastreador):
+    """
+    Executa um programa traduzido.
+
+    Args:
+        codigo (types.CodeType): O código retornado por `compilar`.
+        saida (Saida): O destino dos PRINTs.
+        rastreador (Rastreador): O rastreador que recebe os erros semânticos.
+    """
+    if rastreador.erro:
+        def erro(codigo_erro, lexema):
+            rastreador.emitir(rastreamento.ERRO, codigo_erro, lexema)
+    else:
+        def erro(codigo_erro, lexema):
+            pass
+    exec(codigo, {"escrever": saida.escrever, "erro": erro, "converter_literal": converter_literal})
+
+def caminho_cache(nome_arquivo):
+    """
+    Obtém o caminho do arquivo de cache do código traduzido de um arquivo fonte.
+
+    Args:
+        nome_arquivo (str): O caminho do arquivo .cic.
+
+    Returns:
+        str: O caminho do arquivo .cicx.
+    """
+    return os.path.splitext(nome_arquivo)[0] + EXTENSAO
+
+def _versao_python():
+    return sys.implementation.cache_tag.encode('ascii')[:16]
+
+def salvar(codigo, nome_cache, fonte):
+    """
+    Grava um código traduzido no formato .cicx, via marshal.
+
+    Args:
+        codigo (types.CodeType): O código compilado.
+        nome_cache (str): O caminho do arquivo .cicx.
+        fonte (str): O caminho do arquivo .cic que originou o código.
+    """
+    info = os.stat(fonte)
+    dados = marshal.dumps(codigo)
+    cabecalho = CABECALHO.pack(
+        MAGICA, VERSAO, _versao_python(), info.st_mtime_ns, info.st_size,
+        hash_arquivo(fonte), len(dados), zlib.crc32(dados),
+    )
+    temporario = f"{nome_cache}.{os.getpid()}.tmp"
+    with open(temporario, 'wb') as arquivo:
+        arquivo.write(cabecalho)
+        arquivo.write(dados)
+    os.replace(temporario, nome_cache)
+
+def carregar(nome_cache, fonte):
+    """
+    Carrega um código traduzido de um arquivo .cicx.
+
+    Args:
+        nome_cache (str): O caminho do arquivo .cicx.
+        fonte (str): O caminho do arquivo .cic correspondente.
+
+    Returns:
+        types.CodeType: O código compilado.
+
+    Raises:
+        CacheInvalido: Se o cache estiver corrompido, for de outra versão do Python ou estiver
+            desatualizado em relação ao fonte.
+    """
+    with open(nome_cache, 'rb') as arquivo:
+        conteudo = arquivo.read()
+    try:
+        magica, versao, versao_python, mtime, tamanho_fonte, resumo, tamanho, verificacao = CABECALHO.unpack_from(conteudo)
+    except struct.error:
+        raise CacheInvalido("cabeçalho incompleto")
+    if magica != MAGICA or versao != VERSAO:
+        raise CacheInvalido("formato desconhecido")
+    if versao_python.rstrip(b"\0") != _versao_python():
+        raise CacheInvalido("gerado por outra versão do Python")
+    conferir_fonte(nome_cache, POSICAO_MTIME, mtime, tamanho_fonte, resumo, fonte)
+    dados = memoryview(conteudo)[CABECALHO.size:]
+    if len(dados) != tamanho or zlib.crc32(dados) != verificacao:
+        raise CacheInvalido("soma de verificação inválida")
+    try:
+        return marshal.loads(dados)
+    except (EOFError, ValueError, TypeError) as erro:
+        raise CacheInvalido(str(erro))
+
+def carregar_ou_compilar(nome_arquivo, compilar_programa, rastreador=None):
+    """
+    Obtém o código traduzido de um arquivo .cic, usando o cache .cicx quando válido.
+
+    Args:
+        nome_arquivo (str): O caminho do arquivo .cic.
+        compilar_programa (Callable[[str], ProgramaCompacto]): Função que processa o arquivo fonte.
+        rastreador (Rastreador, optional): O rastreador que recebe os eventos CACHE.
+
+    Returns:
+        types.CodeType: O código compilado.
+
+    Raises:
+        FileNotFoundError: Se o arquivo fonte não existir.
+    """
+    def gerar(fonte):
+        return compilar(compilar_programa(fonte), fonte)
+    return carregar_ou_gerar(nome_arquivo, caminho_cache(nome_arquivo), carregar, gerar, salvar, rastreador)
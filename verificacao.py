@@ -0,0 +1,267 @@
+import json
+import logging
+
+import rastreamento
+from main import ProcessadorSemantico
+from rastreamento import Coletor, Rastreador
+
+class Diagnostico:
+    """
+    Um erro encontrado pela verificação, com a posição da sua primeira ocorrência.
+
+    Args:
+        arquivo (str or None): O arquivo verificado.
+        linha (int or None): A linha do erro, a partir de 1.
+        coluna (int or None): A coluna do erro, a partir de 1.
+        codigo (str): O código do erro (ver rastreamento.MENSAGENS_ERRO).
+        lexema (str, optional): O lexema envolvido no erro.
+    """
+    def __init__(self, arquivo, linha, coluna, codigo, lexema=None):
+        self.arquivo = arquivo
+        self.linha = linha
+        self.coluna = coluna
+        self.codigo = codigo
+        self.lexema = lexema
+        self.ocorrencias = 1
+
+    @property
+    def mensagem(self):
+        return rastreamento.mensagem_erro(self.codigo, self.lexema)
+
+    def como_dict(self):
+        """
+        Converte o diagnóstico em um dicionário serializável em JSON.
+
+        Returns:
+            dict: Os campos do diagnóstico e a sua mensagem.
+        """
+        return {
+            "arquivo": self.arquivo, "linha": self.linha, "coluna": self.coluna, "codigo": self.codigo,
+            "lexema": self.lexema, "mensagem": self.mensagem, "ocorrencias": self.ocorrencias,
+        }
+
+    def __str__(self):
+        texto = f"{self.arquivo}:{self.linha}:{self.coluna}: {self.mensagem}"
+        if self.ocorrencias > 1:
+            texto += f" ({self.ocorrencias} ocorrências)"
+        return texto
+
+class _LimiteErros(Exception):
+    pass
+
+def classificar_literal(valor):
+    """
+    Classifica o valor de uma atribuição como o AnalisadorSemantico._tratar_valor o converteria, sem convertê-lo.
+
+    Args:
+        valor (str): O valor, como escrito no código.
+
+    Returns:
+        str or None: "CADEIA" ou "NUMERO" para literais, None para o nome de uma variável.
+    """
+    if valor.startswith('"') and valor.endswith('"'):
+        return "CADEIA"
+    sem_sinal = valor.lstrip('-+')
+    if sem_sinal.isdigit() or '.' in valor or sem_sinal.replace('.', '', 1).isdigit():
+        return "NUMERO"
+    return None
+
+class VerificadorSemantico(Coletor):
+    """
+    Verifica um programa sem executá-lo, reportando os mesmos erros que o AnalisadorSemantico.
+
+    Em vez da tabela de símbolos completa, cada declaração guarda apenas seu tipo e se já
+    recebeu um valor, o que basta para decidir os erros: os valores não são convertidos,
+    armazenados nem impressos. Os erros de formato do ProcessadorSemantico chegam pelo
+    rastreador, já que o verificador também é um coletor.
+
+    Erros repetidos (mesmo código e mesmo lexema) são agrupados no primeiro diagnóstico,
+    que conta as ocorrências. Um FIM sem BLOCO ou uma declaração fora de qualquer bloco, que
+    interromperiam a execução, são reportados como os demais erros, e a instrução é ignorada.
+
+    Args:
+        max_erros (int, optional): Interrompe a verificação ao atingir esse número de diagnósticos distintos.
+    """
+    tipos_eventos = frozenset((rastreamento.ERRO,))
+
+    def __init__(self, max_erros=None):
+        super().__init__(logging.ERROR)
+        self.max_erros = max_erros
+        self.diagnosticos:list[Diagnostico] = []
+        self.interrompido = False
+        self.arquivo = None
+        self._processador = None
+        self._por_chave:dict[tuple, Diagnostico] = {}
+        # Equivalentes a len(pilha_escopo) e len(nome_blocos) do AnalisadorSemantico
+        self._profundidade = 0
+        self._blocos = 0
+        # Para cada lexema, as declarações visíveis [profundidade, tipo, tem_valor], da mais externa para a mais interna
+        self._vinculos:dict[str, list[list]] = {}
+        self._desfazer:list[list[str]] = []
+        self._despacho = {
+            "BLOCO": self._verificar_bloco,
+            "FIM": self._verificar_fim,
+            "PRINT": self._verificar_print,
+            "ATRIBUICAO": self._verificar_atribuicao,
+            "DECLARACAO": self._verificar_declaracao,
+        }
+
+    def verificar_arquivo(self, nome_arquivo):
+        """
+        Processa e verifica um arquivo.
+
+        Args:
+            nome_arquivo (str): O caminho do arquivo .cic.
+
+        Returns:
+            list[Diagnostico]: Os diagnósticos encontrados, na ordem da primeira ocorrência.
+        """
+        with open(nome_arquivo, 'r', encoding='utf-8') as arquivo:
+            return self.verificar_linhas(arquivo, nome_arquivo)
+
+    def verificar_linhas(self, linhas, nome_arquivo=None):
+        """
+        Processa e verifica uma sequência de linhas de código.
+
+        Args:
+            linhas (Iterable[str]): As linhas de código (por exemplo, um arquivo aberto).
+            nome_arquivo (str, optional): O nome informado nos diagnósticos.
+
+        Returns:
+            list[Diagnostico]: Os diagnósticos encontrados, na ordem da primeira ocorrência.
+        """
+        self.arquivo = nome_arquivo
+        self._processador = ProcessadorSemantico(Rastreador([self]), posicoes=True)
+        return self.verificar_instrucoes(self._processador.gerar_instrucoes(linhas))
+
+    def verificar_instrucoes(self, instrucoes):
+        """
+        Verifica uma sequência de instruções.
+
+        Args:
+            instrucoes (Iterable[dict]): As instruções, de preferência com as chaves "linha" e "coluna".
+
+        Returns:
+            list[Diagnostico]: Os diagnósticos encontrados, na ordem da primeira ocorrência.
+        """
+        despacho = self._despacho
+        try:
+            for instrucao in instrucoes:
+                verificar = despacho.get(instrucao["instrucao"])
+                if verificar is None:
+                    self._diagnosticar(instrucao, "instrucao_invalida")
+                else:
+                    verificar(instrucao)
+        except _LimiteErros:
+            self.interrompido = True
+        return self.diagnosticos
+
+    def registrar(self, evento, campos):
+        # Erros de formato emitidos pelo processador durante a leitura da linha atual
+        processador = self._processador
+        posicao = {"linha": processador.numero_linha, "coluna": processador.recuo + 1} if processador else {}
+        self._diagnosticar(posicao, *campos)
+
+    def _diagnosticar(self, instrucao, codigo, lexema=None):
+        chave = (codigo, lexema)
+        diagnostico = self._por_chave.get(chave)
+        if diagnostico is not None:
+            diagnostico.ocorrencias += 1
+            return
+        diagnostico = Diagnostico(self.arquivo, instrucao.get("linha"), instrucao.get("coluna"), codigo, lexema)
+        self._por_chave[chave] = diagnostico
+        self.diagnosticos.append(diagnostico)
+        if self.max_erros and len(self.diagnosticos) >= self.max_erros:
+            raise _LimiteErros()
+
+    def _verificar_bloco(self, instrucao):
+        self._blocos += 1
+        self._profundidade += 1
+        self._desfazer.append([])
+
+    def _verificar_fim(self, instrucao):
+        if not self._blocos:
+            self._diagnosticar(instrucao, "fim_sem_bloco")
+            return
+        self._blocos -= 1
+        # Como no AnalisadorSemantico, a tabela mais externa nunca é descartada
+        if self._profundidade > 1:
+            self._profundidade -= 1
+            for lexema in self._desfazer.pop():
+                vinculos = self._vinculos[lexema]
+                vinculos.pop()
+                if not vinculos:
+                    del self._vinculos[lexema]
+
+    def _verificar_print(self, instrucao):
+        if instrucao["lexema"] not in self._vinculos:
+            self._diagnosticar(instrucao, "nao_declarada", instrucao["lexema"])
+
+    def _verificar_declaracao(self, instrucao):
+        self._declarar(instrucao, instrucao["lexema"], instrucao["tipo"], None)
+
+    def _verificar_atribuicao(self, instrucao):
+        lexema = instrucao["lexema"]
+        tipo_valor = self._tipo_valor(instrucao["valor"])
+        tipo = instrucao["tipo_declarado"]
+        if tipo is None:
+            vinculos = self._vinculos.get(lexema)
+            if vinculos:
+                declaracao = vinculos[-1]
+                if declaracao[1] == tipo_valor:
+                    declaracao[2] = True
+                else:
+                    self._diagnosticar(instrucao, "modificacao_tipo", lexema)
+                return
+            tipo = "CADEIA" if tipo_valor == "CADEIA" else "NUMERO"
+        self._declarar(instrucao, lexema, tipo, tipo_valor)
+
+    def _declarar(self, instrucao, lexema, tipo, tipo_valor):
+        if not self._profundidade:
+            self._diagnosticar(instrucao, "fora_de_bloco", lexema)
+            return
+        vinculos = self._vinculos.get(lexema)
+        if vinculos and vinculos[-1][0] == self._profundidade:
+            self._diagnosticar(instrucao, "redeclaracao", lexema)
+        elif tipo_valor is not None and tipo_valor != tipo:
+            self._diagnosticar(instrucao, "valor_invalido", lexema)
+        else:
+            self._vinculos.setdefault(lexema, []).append([self._profundidade, tipo, tipo_valor is not None])
+            self._desfazer[-1].append(lexema)
+
+    def _tipo_valor(self, valor):
+        """
+        Obtém o tipo que o valor de uma atribuição teria depois de tratado.
+
+        Args:
+            valor (str or None): O valor, como escrito no código.
+
+        Returns:
+            str or None: "CADEIA", "NUMERO" ou None se o valor for ausente (ou uma variável sem valor).
+        """
+        if not valor:
+            # Um valor vazio não é tratado e continua sendo uma cadeia
+            return None if valor is None else "CADEIA"
+        tipo = classificar_literal(valor)
+        if tipo:
+            return tipo
+        # O nome de uma variável vale o valor da declaração mais interna que já tem valor
+        for declaracao in reversed(self._vinculos.get(valor, ())):
+            if declaracao[2]:
+                return declaracao[1]
+        return None
+
+def formatar_diagnosticos(diagnosticos, formato="texto"):
+    """
+    Formata os diagnósticos para exibição.
+
+    Args:
+        diagnosticos (list[Diagnostico]): Os diagnósticos.
+        formato (str, optional): "texto" (arquivo:linha:coluna: mensagem) ou "jsonl" (um objeto JSON por linha).
+
+    Returns:
+        str: Os diagnósticos formatados, um por linha.
+    """
+    if formato == "jsonl":
+        return "".join(json.dumps(diagnostico.como_dict(), ensure_ascii=False) + "\n" for diagnostico in diagnosticos)
+    return "".join(f"{diagnostico}\n" for diagnostico in diagnosticos)